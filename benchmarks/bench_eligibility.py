@@ -0,0 +1,134 @@
+"""Micro-benchmark of computing on-sale fixtures for many profiles.
+
+Compares filtering each fixture's categories per profile
+(OnsaleFixtureData.from_processed_fixture_data) with building an
+EligibilityIndex once and querying it per profile, and, if NumPy is
+installed, with the vectorized engine.
+
+Usage: python benchmarks/bench_eligibility.py [--profiles N] [--number N]
+"""
+
+import argparse
+import json
+import random
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from brentford_calendar.eligibility import EligibilityIndex
+from brentford_calendar.models import (
+    MembershipType,
+    OnsaleFixtureData,
+    ProcessedFixtureData,
+)
+
+CATEGORISED_PATH = (
+    Path(__file__).parent.parent
+    / "tests"
+    / "data"
+    / "expected-fixtures-categorised.json"
+)
+
+Profile = tuple[MembershipType, int]
+
+
+def per_profile(
+    fixtures: list[ProcessedFixtureData], profiles: list[Profile]
+) -> list[list[OnsaleFixtureData]]:
+    """Filter every fixture separately for each profile."""
+    results = []
+    for membership, taps in profiles:
+        onsale_fixtures = []
+        for processed in fixtures:
+            onsale = OnsaleFixtureData.from_processed_fixture_data(
+                processed, membership, taps
+            )
+            if onsale is not None:
+                onsale_fixtures.append(onsale)
+        results.append(onsale_fixtures)
+    return results
+
+
+def indexed(
+    fixtures: list[ProcessedFixtureData], profiles: list[Profile]
+) -> list[list[OnsaleFixtureData]]:
+    """Build the index once and query it for each profile."""
+    index = EligibilityIndex(fixtures)
+    return [index.onsale_fixtures(membership, taps) for membership, taps in profiles]
+
+
+def vectorized(
+    fixtures: list[ProcessedFixtureData], profiles: list[Profile]
+) -> list[list[OnsaleFixtureData]]:
+    """Evaluate every profile at once with the NumPy engine."""
+    from brentford_calendar.vectorized import VectorizedEligibility
+
+    return VectorizedEligibility(fixtures).onsale_fixtures(profiles)
+
+
+def main() -> None:
+    """Time both approaches over the fixtures in the test data."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=1000, help="Profiles")
+    parser.add_argument("--number", type=int, default=10, help="Calls per run")
+    args = parser.parse_args()
+
+    fixtures = [
+        ProcessedFixtureData.model_validate(item)
+        for item in json.loads(CATEGORISED_PATH.read_text())
+    ]
+    rng = random.Random(0)
+    profiles = [
+        (rng.choice(list(MembershipType)), rng.randrange(0, 2000))
+        for _ in range(args.profiles)
+    ]
+    engines: list[tuple[str, Callable[..., list[list[OnsaleFixtureData]]]]] = [
+        ("per-profile", per_profile),
+        ("indexed", indexed),
+    ]
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("NumPy not installed, skipping the vectorized engine")
+    else:
+        engines.append(("vectorized", vectorized))
+    expected = per_profile(fixtures, profiles)
+    for _, func in engines:
+        assert func(fixtures, profiles) == expected
+
+    print(
+        f"{len(fixtures)} fixtures, {len(profiles)} profiles, "
+        f"best of 5 runs of {args.number} calls"
+    )
+    for name, func in engines:
+        best = min(
+            timeit.repeat(
+                lambda f=func: f(fixtures, profiles), number=args.number, repeat=5
+            )
+        )
+        print(f"{name:>12}: {best / args.number * 1e3:8.2f} ms/call")
+
+    # Most of the time above goes on building the OnsaleFixtureData results;
+    # time the eligibility computation alone for the index and the engine
+    index = EligibilityIndex(fixtures)
+    lookups: list[tuple[str, Callable[[], object]]] = [
+        (
+            "indexed",
+            lambda: [
+                [f.earliest_window(m, t) for f in index.fixtures] for m, t in profiles
+            ],
+        )
+    ]
+    if ("vectorized", vectorized) in engines:
+        from brentford_calendar.vectorized import VectorizedEligibility
+
+        engine = VectorizedEligibility(fixtures)
+        lookups.append(("vectorized", lambda: engine.earliest_slots(profiles)))
+    print("Lookups only:")
+    for name, lookup in lookups:
+        best = min(timeit.repeat(lookup, number=args.number, repeat=5))
+        print(f"{name:>12}: {best / args.number * 1e3:8.2f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
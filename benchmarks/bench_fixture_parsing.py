@@ -0,0 +1,53 @@
+"""Micro-benchmark of decoding fixture data-props into FixtureData.
+
+Compares the per-fixture path (unescape, json.loads, model_validate) with the
+single-pass path that validates every fixture's JSON in one call.
+
+Usage: python benchmarks/bench_fixture_parsing.py [--number N]
+"""
+
+import argparse
+import html
+import json
+import timeit
+from pathlib import Path
+
+from brentford_calendar.models import FixtureData
+from brentford_calendar.scraper import _parse_all_fixture_props, _scan_fixture_props
+
+FIXTURE_HTML_PATH = (
+    Path(__file__).parent.parent / "tests" / "data" / "ticket-information.html"
+)
+
+
+def parse_per_fixture(fixture_props: list[str]) -> list[FixtureData]:
+    """Parse props the original way, via an intermediate dict per fixture."""
+    return [
+        FixtureData.model_validate(json.loads(html.unescape(raw_props)))
+        for raw_props in fixture_props
+        if raw_props
+    ]
+
+
+def main() -> None:
+    """Time both paths over the fixtures in the test page."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Calls per run")
+    args = parser.parse_args()
+
+    fixture_props = _scan_fixture_props(FIXTURE_HTML_PATH.read_text())
+    assert parse_per_fixture(fixture_props) == _parse_all_fixture_props(fixture_props)
+
+    print(f"{len(fixture_props)} fixtures, best of 5 runs of {args.number} calls")
+    for name, func in [
+        ("per-fixture", parse_per_fixture),
+        ("single-pass", _parse_all_fixture_props),
+    ]:
+        best = min(
+            timeit.repeat(lambda f=func: f(fixture_props), number=args.number, repeat=5)
+        )
+        print(f"{name:>12}: {best / args.number * 1e6:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Benchmark of the calendar sync strategies against the fake Calendar server.
+
+Syncs the same events with each strategy the CLI offers (sequential lookups,
+--prefetch, --batch, --state-file and --workers) twice, into an empty calendar
+and then again with nothing changed, against a local FakeCalendarServer that
+adds simulated network latency to every request.
+
+Usage: python benchmarks/bench_sync_strategies.py [--events N] [--latency S]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from google.auth.credentials import AnonymousCredentials
+
+from brentford_calendar.calendar_client import (
+    CalendarClient,
+    UpsertOutcome,
+    build_service,
+)
+from brentford_calendar.config import GoogleCalendarConfig
+from brentford_calendar.fake_calendar import FakeCalendarServer
+from brentford_calendar.models import CalendarEventData
+from brentford_calendar.state import SyncStateStore
+from brentford_calendar.sync import ConcurrentSyncEngine, upsert_sequentially
+
+CALENDAR_ID = "benchmark@example.com"
+
+# Strategies take the client, the events and the server's URL
+Strategy = Callable[[CalendarClient, list[CalendarEventData], str], list[UpsertOutcome]]
+
+
+def sequential(
+    client: CalendarClient, events: list[CalendarEventData], endpoint: str
+) -> list[UpsertOutcome]:
+    """Look up and write each event with its own requests."""
+    return upsert_sequentially(client, events)
+
+
+def prefetch(
+    client: CalendarClient, events: list[CalendarEventData], endpoint: str
+) -> list[UpsertOutcome]:
+    """List the calendar once, then write each changed event."""
+    client.prefetch_events()
+    return upsert_sequentially(client, events)
+
+
+def batch(
+    client: CalendarClient, events: list[CalendarEventData], endpoint: str
+) -> list[UpsertOutcome]:
+    """List the calendar once, then write the changed events in batches."""
+    client.prefetch_events()
+    return client.upsert_events(events)
+
+
+def state_store(
+    client: CalendarClient, events: list[CalendarEventData], endpoint: str
+) -> list[UpsertOutcome]:
+    """Bring the state store up to date, then write the changed events."""
+    client.reconcile_state()
+    return upsert_sequentially(client, events)
+
+
+def workers(
+    client: CalendarClient, events: list[CalendarEventData], endpoint: str
+) -> list[UpsertOutcome]:
+    """List the calendar once, then write from a pool of eight worker threads."""
+    client.prefetch_events()
+    engine = ConcurrentSyncEngine(
+        client, lambda: build_service(AnonymousCredentials(), endpoint), 8
+    )
+    return engine.upsert_events(events)
+
+
+STRATEGIES: list[tuple[str, Strategy]] = [
+    ("sequential", sequential),
+    ("prefetch", prefetch),
+    ("batch", batch),
+    ("state-store", state_store),
+    ("workers", workers),
+]
+
+
+def make_events(count: int) -> list[CalendarEventData]:
+    """Create events with distinct source IDs."""
+    start = datetime(2025, 9, 10, 13, 0, tzinfo=UTC)
+    return [
+        CalendarEventData(
+            summary=f"Brentford vs Opponent {i}",
+            description="Tickets on sale",
+            start=start + timedelta(days=i),
+            end=start + timedelta(days=i, hours=1),
+            source_id=f"fixture-{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def run(
+    server: FakeCalendarServer,
+    strategy: Strategy,
+    events: list[CalendarEventData],
+    store: SyncStateStore | None,
+) -> tuple[float, int]:
+    """Sync the events once with a fresh client.
+
+    Returns:
+        Seconds taken and number of requests the server received
+    """
+    config = GoogleCalendarConfig(
+        service_account_info={}, calendar_id=CALENDAR_ID, api_endpoint=server.url
+    )
+    client = CalendarClient.from_config(config, state_store=store)
+    requests_before = server.requests.total()
+    start = time.perf_counter()
+    outcomes = strategy(client, events, server.url)
+    elapsed = time.perf_counter() - start
+    assert UpsertOutcome.FAILED not in outcomes
+    return elapsed, server.requests.total() - requests_before
+
+
+def main() -> None:
+    """Time each strategy's first and unchanged runs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50, help="Events to sync")
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Seconds added per request"
+    )
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    print(f"{len(events)} events, {args.latency * 1e3:.0f} ms latency per request")
+    print(f"{'':>12}  {'first run':>20}  {'unchanged run':>20}")
+    for name, strategy in STRATEGIES:
+        store = SyncStateStore(":memory:") if strategy is state_store else None
+        with FakeCalendarServer(latency=args.latency) as server:
+            first = run(server, strategy, events, store)
+            unchanged = run(server, strategy, events, store)
+        print(
+            f"{name:>12}: "
+            + "  ".join(
+                f"{seconds:7.3f} s {requests:5d} req"
+                for seconds, requests in (first, unchanged)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
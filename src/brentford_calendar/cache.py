@@ -0,0 +1,168 @@
+"""On-disk caches that let repeated runs skip redundant work."""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+# Cached tokens closer than this to expiry are treated as expired
+TOKEN_MIN_LIFETIME = timedelta(minutes=5)
+
+
+def _read_json_object(path: Path) -> dict[str, Any]:
+    """Read a JSON object, treating a missing or corrupt file as empty."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_private(path: Path, content: str) -> None:
+    """Atomically write a file readable only by the current user."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(content)
+    tmp_path.replace(path)
+
+
+class TokenCache:
+    """On-disk cache of OAuth access tokens and their expiry times."""
+
+    def __init__(self, path: Path):
+        """Initialize the token cache.
+
+        Args:
+            path: Path to the JSON cache file
+        """
+        self.path = path
+
+    def load(self, key: str) -> tuple[str, datetime] | None:
+        """Load a cached token that is not close to expiring.
+
+        Args:
+            key: Identifies the credentials and scopes the token was issued for
+
+        Returns:
+            Tuple of (token, expiry as naive UTC datetime), or None
+        """
+        entry = _read_json_object(self.path).get(key)
+        if entry is None:
+            return None
+        try:
+            token = entry["token"]
+            expiry = datetime.fromisoformat(entry["expiry"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        now = datetime.now(UTC).replace(tzinfo=None)
+        if expiry - now < TOKEN_MIN_LIFETIME:
+            logger.debug("Cached access token is close to expiry")
+            return None
+        logger.debug(f"Using cached access token valid until {expiry}")
+        return token, expiry
+
+    def save(self, key: str, token: str, expiry: datetime) -> None:
+        """Cache a token.
+
+        Args:
+            key: Identifies the credentials and scopes the token was issued for
+            token: Access token
+            expiry: Expiry time as naive UTC datetime
+        """
+        data = _read_json_object(self.path)
+        data[key] = {"token": token, "expiry": expiry.isoformat()}
+        _write_private(self.path, json.dumps(data))
+        logger.debug(f"Cached access token valid until {expiry}")
+
+
+class CachedPage(BaseModel):
+    """A fetched page with the validators needed to fetch it conditionally."""
+
+    content: str
+    content_hash: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class PageCache:
+    """On-disk cache of fetched pages, one JSON file per URL."""
+
+    def __init__(self, directory: Path):
+        """Initialize the page cache.
+
+        Args:
+            directory: Directory holding the cached pages
+        """
+        self.directory = directory
+
+    def _path(self, url: str) -> Path:
+        """Get the cache file path for a URL."""
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def load(self, url: str) -> CachedPage | None:
+        """Load the cached copy of a page.
+
+        Args:
+            url: URL the page was fetched from
+
+        Returns:
+            CachedPage if cached, None if missing or corrupt
+        """
+        try:
+            return CachedPage.model_validate_json(self._path(url).read_text())
+        except (OSError, ValidationError):
+            return None
+
+    def save(self, url: str, page: CachedPage) -> None:
+        """Cache a page.
+
+        Args:
+            url: URL the page was fetched from
+            page: Page content and validators
+        """
+        _write_private(self._path(url), page.model_dump_json())
+
+
+class LastSyncCache:
+    """Records the page content hash each sync target was last synced from."""
+
+    def __init__(self, path: Path):
+        """Initialize the last-sync cache.
+
+        Args:
+            path: Path to the JSON cache file
+        """
+        self.path = path
+
+    def get(self, key: str) -> str | None:
+        """Get the content hash a target was last synced from.
+
+        Args:
+            key: Identifies the sync target and its settings
+
+        Returns:
+            Content hash, or None if the target has never been synced
+        """
+        content_hash = _read_json_object(self.path).get(key)
+        return content_hash if isinstance(content_hash, str) else None
+
+    def set(self, key: str, content_hash: str) -> None:
+        """Record a successful sync.
+
+        Args:
+            key: Identifies the sync target and its settings
+            content_hash: Hash of the page content that was synced
+        """
+        data = _read_json_object(self.path)
+        data[key] = content_hash
+        _write_private(self.path, json.dumps(data))
@@ -1,51 +1,700 @@
 """Google Calendar API client for managing ticket sale events."""
 
+import functools
+import hashlib
+import json
 import logging
+import time
+import uuid
+from collections.abc import Callable
 from datetime import timedelta
+from enum import Enum
 from typing import Any
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
+from brentford_calendar import metrics
+from brentford_calendar.cache import TokenCache
 from brentford_calendar.config import GoogleCalendarConfig
 from brentford_calendar.models import CalendarEventData
+from brentford_calendar.plan import PlanAction, PlannedChange, SyncPlan
+from brentford_calendar.ratelimit import TokenBucket
+from brentford_calendar.retry import RetryPolicy
+from brentford_calendar.state import EventState, SyncStateStore
+from brentford_calendar.usage import BATCH_METHOD, ApiUsage
 
 logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
+# Private extended property stamped on every event this tool writes, so that all
+# managed events can be listed in one query
+MANAGED_BY_KEY = "managed_by"
+MANAGED_BY_VALUE = "brentford-calendar"
+
+# Private extended property holding a fingerprint of the event content, used to
+# skip writes when the remote event is already up to date
+CONTENT_HASH_KEY = "content_hash"
+
+# Largest page size accepted by events().list
+LIST_PAGE_SIZE = 2500
+
+# Maximum number of requests Google accepts in a single batch
+MAX_BATCH_SIZE = 50
+
+# Statuses returned when writing to an event that no longer exists
+GONE_STATUSES = (404, 410)
+
+# Status returned when inserting an event whose ID is already taken
+DUPLICATE_STATUS = 409
+
+
+class UpsertOutcome(str, Enum):
+    """Result of upserting a single event."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+    FAILED = "failed"
+    DEFERRED = "deferred"
+
+
+def new_event_id() -> str:
+    """Generate an ID for a new event.
+
+    Inserts carry their own ID so that resending one whose response was lost
+    fails with a 409 rather than creating a duplicate event. Event IDs may only
+    use the base32hex characters 0-9 and a-v, which a UUID's hex form does.
+
+    Returns:
+        Random 32 character event ID
+    """
+    return uuid.uuid4().hex
+
+
+def is_duplicate(error: Exception) -> bool:
+    """Whether an insert failed because its event ID already exists."""
+    return isinstance(error, HttpError) and error.resp.status == DUPLICATE_STATUS
+
+
+def create_credentials(
+    config: GoogleCalendarConfig, token_cache: TokenCache | None = None
+) -> Any:
+    """Create service account credentials from configuration.
+
+    With a token cache, a cached access token is reused until it is close to
+    expiring; otherwise a fresh token is fetched up front and cached. A local
+    stand-in API endpoint is given anonymous credentials instead.
+
+    Args:
+        config: Google Calendar configuration
+        token_cache: Optional on-disk cache of access tokens
+
+    Returns:
+        Credentials for the Calendar API scopes
+    """
+    # Imported here as they are slow to import and unused on many runs
+    import google.auth.transport.requests
+    from google.auth.credentials import AnonymousCredentials
+    from google.oauth2 import service_account
+
+    if config.api_endpoint is not None:
+        return AnonymousCredentials()
+
+    credentials = service_account.Credentials.from_service_account_info(
+        config.service_account_info, scopes=SCOPES
+    )
+    if token_cache is None:
+        return credentials
+
+    cache_key = f"{credentials.service_account_email}:{' '.join(SCOPES)}"
+    cached = token_cache.load(cache_key)
+    if cached is not None:
+        credentials.token, credentials.expiry = cached
+    else:
+        logger.info("Fetching access token")
+        credentials.refresh(google.auth.transport.requests.Request())
+        token_cache.save(cache_key, credentials.token, credentials.expiry)
+    return credentials
+
+
+@functools.cache
+def _discovery_document(api_endpoint: str | None = None) -> str:
+    """Load the Calendar API discovery document bundled with the client library.
+
+    Args:
+        api_endpoint: Root URL to send requests (including batches) to instead
+            of Google's
+
+    Returns:
+        Discovery document JSON
+    """
+    from googleapiclient import discovery_cache
+
+    document: str | None = discovery_cache.get_static_doc("calendar", "v3")
+    if document is None:
+        raise RuntimeError("Calendar v3 discovery document not found")
+    if api_endpoint is None:
+        return document
+
+    # client_options only moves the base URL, but batches are sent to rootUrl
+    root_url = api_endpoint.rstrip("/") + "/"
+    description = json.loads(document)
+    description["rootUrl"] = root_url
+    description["mtlsRootUrl"] = root_url
+    description["baseUrl"] = root_url + description["servicePath"]
+    return json.dumps(description)
+
+
+def build_service(credentials: Any, api_endpoint: str | None = None) -> Any:
+    """Build a Google Calendar API service.
+
+    Uses the static discovery document bundled with the client library, loaded
+    once per process, so no discovery request is ever made.
+
+    Each service owns its own HTTP transport, which is not thread-safe, so
+    concurrent callers must build one service per thread.
+
+    Args:
+        credentials: Credentials to authorize requests with
+        api_endpoint: Root URL of a stand-in for the Google APIs, None for Google
+
+    Returns:
+        Google Calendar API service instance
+    """
+    from googleapiclient.discovery import (  # type: ignore[attr-defined]  # Missing from stubs
+        build_from_document,
+    )
+
+    return build_from_document(
+        _discovery_document(api_endpoint), credentials=credentials
+    )
+
+
+def _payload_bytes(request: Any) -> int:
+    """Get the size of an API request's body.
+
+    Args:
+        request: HttpRequest to measure
+
+    Returns:
+        Body size in bytes, 0 if it has none
+    """
+    body = getattr(request, "body", None)
+    if isinstance(body, str):
+        return len(body.encode())
+    return len(body) if isinstance(body, bytes) else 0
+
 
 class CalendarClient:
     """Client for interacting with Google Calendar API."""
 
-    def __init__(self, calendar_id: str, service: Any):
+    def __init__(
+        self,
+        calendar_id: str,
+        service: Any,
+        state_store: SyncStateStore | None = None,
+        rate_limiter: TokenBucket | None = None,
+        retry_policy: RetryPolicy | None = None,
+        api_usage: ApiUsage | None = None,
+        credentials: Any = None,
+    ):
         """Initialize the calendar client.
 
         Args:
             calendar_id: Target Google Calendar ID
             service: Google Calendar API service instance
+            state_store: Optional local store of previously written events
+            rate_limiter: Optional rate limiter applied to every API request
+            retry_policy: Optional policy for retrying failed API requests
+            api_usage: Optional count of API requests and their budget
+            credentials: Credentials the service was built with, if known, for
+                building more services for the same account
         """
         self.calendar_id = calendar_id
         self.service = service
+        self.credentials = credentials
+        self.state_store = state_store
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.api_usage = api_usage
+        self._event_index: dict[str, dict[str, Any]] | None = None
+        self._state_reconciled = False
         logger.info(f"Initialized CalendarClient for calendar {calendar_id}")
 
     @staticmethod
-    def from_config(config: GoogleCalendarConfig) -> "CalendarClient":
+    def from_config(
+        config: GoogleCalendarConfig,
+        state_store: SyncStateStore | None = None,
+        rate_limiter: TokenBucket | None = None,
+        retry_policy: RetryPolicy | None = None,
+        token_cache: TokenCache | None = None,
+        api_usage: ApiUsage | None = None,
+    ) -> "CalendarClient":
         """Create CalendarClient from configuration.
 
         This factory method handles credential creation and service building.
 
         Args:
             config: Google Calendar configuration
+            state_store: Optional local store of previously written events
+            rate_limiter: Optional rate limiter applied to every API request
+            retry_policy: Optional policy for retrying failed API requests
+            token_cache: Optional on-disk cache of access tokens
+            api_usage: Optional count of API requests and their budget
+
+        Returns:
+            CalendarClient instance
+        """
+        credentials = create_credentials(config, token_cache)
+        return CalendarClient(
+            calendar_id=config.calendar_id,
+            service=build_service(credentials, config.api_endpoint),
+            state_store=state_store,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            api_usage=api_usage,
+            credentials=credentials,
+        )
+
+    def with_service(self, service: Any) -> "CalendarClient":
+        """Create a client sharing this client's state but using another service.
+
+        The new client shares the prefetched index, state store, rate limiter,
+        retry policy and API usage, so it can be used from another thread with its
+        own service.
+
+        Args:
+            service: Google Calendar API service instance
+
+        Returns:
+            CalendarClient instance
+        """
+        client = CalendarClient(
+            calendar_id=self.calendar_id,
+            service=service,
+            state_store=self.state_store,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            api_usage=self.api_usage,
+            credentials=self.credentials,
+        )
+        client._event_index = self._event_index
+        client._state_reconciled = self._state_reconciled
+        return client
+
+    def for_calendar(self, calendar_id: str) -> "CalendarClient":
+        """Create a client for another calendar reusing this client's service.
+
+        The new client shares the service, credentials, state store, rate
+        limiter, retry policy and API usage, but has its own prefetched index
+        and reconciliation status.
+
+        Args:
+            calendar_id: Target Google Calendar ID
 
         Returns:
             CalendarClient instance
         """
-        credentials = service_account.Credentials.from_service_account_info(
-            config.service_account_info, scopes=SCOPES
+        return CalendarClient(
+            calendar_id=calendar_id,
+            service=self.service,
+            state_store=self.state_store,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            api_usage=self.api_usage,
+            credentials=self.credentials,
+        )
+
+    def _execute(self, request: Any, method: str, cost: int = 1) -> Any:
+        """Execute an API request, subject to the rate limiter and retry policy.
+
+        Each attempt is recorded in the run's metrics and API usage.
+
+        Args:
+            request: HttpRequest (or BatchHttpRequest) to execute
+            method: API method, such as "list" or "batch", for metrics
+            cost: Number of API requests this counts as against the quota
+
+        Returns:
+            The request's response
+        """
+
+        def attempt() -> Any:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(cost)
+            start = time.perf_counter()
+            try:
+                return request.execute()
+            finally:
+                seconds = time.perf_counter() - start
+                metrics.observe_api_call(method, seconds)
+                if self.api_usage is not None:
+                    self.api_usage.record(
+                        method,
+                        payload_bytes=(
+                            0 if method == BATCH_METHOD else _payload_bytes(request)
+                        ),
+                        seconds=seconds,
+                    )
+
+        if self.retry_policy is None:
+            return attempt()
+        return self.retry_policy.call(attempt)
+
+    def _list_events(self, **params: Any) -> tuple[list[dict[str, Any]], str | None]:
+        """Page through events().list with the given query parameters.
+
+        Args:
+            **params: Additional events().list parameters
+
+        Returns:
+            Tuple of (event dicts, nextSyncToken if one was returned)
+        """
+        events: list[dict[str, Any]] = []
+        page_token: str | None = None
+        while True:
+            events_result = self._execute(
+                self.service.events().list(
+                    calendarId=self.calendar_id,
+                    maxResults=LIST_PAGE_SIZE,
+                    pageToken=page_token,
+                    **params,
+                ),
+                "list",
+            )
+            events.extend(dict(event) for event in events_result.get("items", []))
+            page_token = events_result.get("nextPageToken")
+            if not page_token:
+                return events, events_result.get("nextSyncToken")
+
+    def list_managed_events(self) -> list[dict[str, Any]]:
+        """List every event in the calendar that carries the managed-by marker.
+
+        Pages through events().list filtered on the managed-by marker property.
+        Events written by earlier versions lack the marker, so they are found
+        by _find_event's lookup instead, and get the marker when next written.
+
+        Returns:
+            List of event dicts
+        """
+        logger.debug("Listing managed events")
+        events, _ = self._list_events(
+            privateExtendedProperty=f"{MANAGED_BY_KEY}={MANAGED_BY_VALUE}"
+        )
+        logger.debug(f"Found {len(events)} managed events")
+        return events
+
+    @staticmethod
+    def _managed_source_id(event: dict[str, Any]) -> str | None:
+        """Get the source_id of an event if it is managed by this tool.
+
+        Events written by earlier versions carry a source_id but not the
+        managed-by marker, and are managed all the same.
+
+        Args:
+            event: Event dict as returned by the API
+
+        Returns:
+            The event's source_id, or None if it is not a managed event
+        """
+        private = event.get("extendedProperties", {}).get("private", {})
+        source_id: str | None = private.get("source_id")
+        return source_id or None
+
+    @staticmethod
+    def _is_marked(event: dict[str, Any]) -> bool:
+        """Whether an event carries the managed-by marker.
+
+        Only marked events are known to have been written by this tool, so only
+        they may be deleted. Unmarked events with a source_id may have been
+        written by an earlier version, and are marked when next written.
+
+        Args:
+            event: Event dict as returned by the API
+
+        Returns:
+            True if the event carries the marker
+        """
+        private = event.get("extendedProperties", {}).get("private", {})
+        return bool(private.get(MANAGED_BY_KEY) == MANAGED_BY_VALUE)
+
+    @classmethod
+    def _index_by_source_id(
+        cls, events: list[dict[str, Any]]
+    ) -> dict[str, dict[str, Any]]:
+        """Index the managed events among a listing by source_id.
+
+        Args:
+            events: Event dicts as returned by the API
+
+        Returns:
+            Mapping of source_id to event dict
+        """
+        index = {}
+        for event in events:
+            if source_id := cls._managed_source_id(event):
+                index[source_id] = event
+        return index
+
+    def prefetch_events(self) -> int:
+        """Build an in-memory source_id index of all managed events.
+
+        Once prefetched, upserts are resolved against the index instead of
+        issuing a lookup request per event. Only events missing from the index,
+        which are new or were written before the managed-by marker, are
+        looked up.
+
+        Returns:
+            Number of events indexed
+        """
+        self._event_index = self._index_by_source_id(self.list_managed_events())
+        logger.info(f"Prefetched {len(self._event_index)} managed events")
+        return len(self._event_index)
+
+    def reconcile_state(self) -> int:
+        """Repair the local state store against the managed events in the calendar.
+
+        Uses the Calendar API's incremental sync: the first run lists every
+        event once and persists the nextSyncToken, later runs fetch only the
+        events changed since. Stored entries whose event was deleted are dropped
+        and entries whose event was modified outside this tool are refreshed.
+        Falls back to a full listing if the sync token has expired.
+
+        Returns:
+            Number of state entries repaired
+
+        Raises:
+            ValueError: If the client has no state store
+        """
+        if self.state_store is None:
+            raise ValueError("Cannot reconcile without a state store")
+
+        repaired: int | None = None
+        sync_token = self.state_store.get_sync_token(self.calendar_id)
+        if sync_token is not None:
+            try:
+                changed, next_sync_token = self._list_events(
+                    syncToken=sync_token, showDeleted=True
+                )
+                repaired = self._apply_changed_events(self.state_store, changed)
+            except HttpError as e:
+                if e.resp.status != 410:
+                    raise
+                logger.warning("Sync token expired, performing full resync")
+                self.state_store.delete_sync_token(self.calendar_id)
+
+        if repaired is None:
+            events, next_sync_token = self._list_events()
+            repaired = self._apply_full_listing(self.state_store, events)
+
+        if next_sync_token:
+            self.state_store.put_sync_token(self.calendar_id, next_sync_token)
+
+        # Every managed event is now in the store, so unknown events are new
+        self._state_reconciled = True
+        logger.info(f"Reconciled sync state, repaired {repaired} entries")
+        return repaired
+
+    def _apply_full_listing(
+        self, state_store: SyncStateStore, events: list[dict[str, Any]]
+    ) -> int:
+        """Rebuild the state store from a full listing of the calendar.
+
+        Args:
+            state_store: State store to repair
+            events: Every event in the calendar
+
+        Returns:
+            Number of state entries repaired
+        """
+        index = self._index_by_source_id(events)
+        self._event_index = index
+        stored = state_store.get_all(self.calendar_id)
+
+        repaired = 0
+        for source_id, state in stored.items():
+            remote = index.get(source_id)
+            if remote is None:
+                logger.info(f"Event {state.event_id} no longer exists, forgetting it")
+                state_store.delete(self.calendar_id, source_id)
+                repaired += 1
+            elif remote["id"] != state.event_id or remote.get("etag") != state.etag:
+                logger.info(f"Event {remote['id']} changed remotely, refreshing state")
+                self._record_event(source_id, remote)
+                repaired += 1
+
+        for source_id, event in index.items():
+            if source_id not in stored:
+                self._record_event(source_id, event)
+                repaired += 1
+
+        return repaired
+
+    def _apply_changed_events(
+        self, state_store: SyncStateStore, changed: list[dict[str, Any]]
+    ) -> int:
+        """Apply events changed since the last sync token to the state store.
+
+        Args:
+            state_store: State store to repair
+            changed: Events returned by an incremental listing, including
+                cancelled (deleted) events
+
+        Returns:
+            Number of state entries repaired
+        """
+        stored = state_store.get_all(self.calendar_id)
+        source_ids = {state.event_id: source_id for source_id, state in stored.items()}
+
+        repaired = 0
+        for event in changed:
+            if event.get("status") == "cancelled":
+                # Deleted events only carry their ID
+                source_id = source_ids.get(event["id"])
+                if source_id is not None:
+                    logger.info(f"Event {event['id']} was deleted, forgetting it")
+                    self._forget_event(source_id)
+                    repaired += 1
+                continue
+
+            source_id = self._managed_source_id(event)
+            if source_id is None:
+                continue
+            state = stored.get(source_id)
+            if (
+                state is None
+                or event["id"] != state.event_id
+                or event.get("etag") != state.etag
+            ):
+                logger.info(f"Event {event['id']} changed remotely, refreshing state")
+                self._record_event(source_id, event)
+                repaired += 1
+
+        return repaired
+
+    def _record_event(self, source_id: str, event: dict[str, Any]) -> None:
+        """Remember a known remote event in the index and state store.
+
+        Args:
+            source_id: Unique identifier for the event source
+            event: Event dict as returned by the API
+        """
+        if self._event_index is not None:
+            self._event_index[source_id] = event
+        if self.state_store is not None:
+            private = event.get("extendedProperties", {}).get("private", {})
+            self.state_store.put(
+                self.calendar_id,
+                source_id,
+                EventState(
+                    event_id=event["id"],
+                    etag=event.get("etag"),
+                    content_hash=private.get(CONTENT_HASH_KEY),
+                    managed=self._is_marked(event),
+                ),
+            )
+
+    def _forget_event(self, source_id: str) -> None:
+        """Drop a remote event that no longer exists from the index and store.
+
+        Args:
+            source_id: Unique identifier for the event source
+        """
+        if self._event_index is not None:
+            self._event_index.pop(source_id, None)
+        if self.state_store is not None:
+            self.state_store.delete(self.calendar_id, source_id)
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether the run's API request budget has been used up."""
+        return self.api_usage is not None and self.api_usage.exhausted
+
+    def _needs_lookup(self, source_id: str) -> bool:
+        """Check whether resolving an event would need an API request.
+
+        Args:
+            source_id: Unique identifier for the event source
+
+        Returns:
+            False if the prefetched index or the state store can resolve it
+        """
+        if self._state_reconciled:
+            return False
+        if (
+            self.state_store is not None
+            and self.state_store.get(self.calendar_id, source_id) is not None
+        ):
+            return False
+        return self._event_index is None or source_id not in self._event_index
+
+    def _resolve_event(
+        self, source_id: str, event_body: dict[str, Any]
+    ) -> tuple[str | None, bool]:
+        """Resolve the existing event for a source_id and compare its content.
+
+        The state store is consulted first, so known events need no API calls.
+        Once the store has been reconciled, unknown events are new and need no
+        lookup either.
+
+        Args:
+            source_id: Unique identifier for the event source
+            event_body: Event body that would be written
+
+        Returns:
+            Tuple of (existing event ID or None, whether content is unchanged)
+        """
+        new_hash = event_body["extendedProperties"]["private"][CONTENT_HASH_KEY]
+        if self.state_store is not None:
+            state = self.state_store.get(self.calendar_id, source_id)
+            if state is not None:
+                return state.event_id, state.content_hash == new_hash
+            if self._state_reconciled:
+                return None, False
+
+        return self._compare_existing(
+            source_id, self._find_event(source_id), event_body
         )
-        service = build("calendar", "v3", credentials=credentials)
-        return CalendarClient(calendar_id=config.calendar_id, service=service)
+
+    def _compare_existing(
+        self,
+        source_id: str,
+        existing: dict[str, Any] | None,
+        event_body: dict[str, Any],
+    ) -> tuple[str | None, bool]:
+        """Compare the content of an event found for a source_id.
+
+        Args:
+            source_id: Unique identifier for the event source
+            existing: Event dict found for the source_id, None if there is none
+            event_body: Event body that would be written
+
+        Returns:
+            Tuple of (existing event ID or None, whether content is unchanged)
+        """
+        if existing is None:
+            return None, False
+        unchanged = self._is_unchanged(existing, event_body)
+        if unchanged:
+            self._record_event(source_id, existing)
+        return existing["id"], unchanged
+
+    def _find_event(self, source_id: str) -> dict[str, Any] | None:
+        """Find an event by source_id, using the prefetched index if available.
+
+        Events missing from the index are looked up, as events written before
+        the managed-by marker are not listed with the managed events.
+
+        Args:
+            source_id: Unique identifier for the event source
+
+        Returns:
+            Event dict if found, None otherwise
+        """
+        if self._event_index is not None and source_id in self._event_index:
+            return self._event_index[source_id]
+        return self._get_event_by_source_id(source_id)
 
     def _get_event_by_source_id(self, source_id: str) -> dict[str, Any] | None:
         """Find an event by source_id in extendedProperties.
@@ -58,14 +707,13 @@ class CalendarClient:
         """
         logger.debug(f"Searching for event with source_id={source_id}")
 
-        events_result = (
-            self.service.events()
-            .list(
+        events_result = self._execute(
+            self.service.events().list(
                 calendarId=self.calendar_id,
                 privateExtendedProperty=f"source_id={source_id}",
                 maxResults=1,
-            )
-            .execute()
+            ),
+            "list",
         )
 
         events = events_result.get("items", [])
@@ -76,38 +724,94 @@ class CalendarClient:
         logger.debug("No existing event found")
         return None
 
-    def _create_event(self, event_data: CalendarEventData) -> None:
-        """Create a new calendar event.
+    @staticmethod
+    def _build_event_body(event_data: CalendarEventData) -> dict[str, Any]:
+        """Build the Google Calendar event body for the given event data.
 
         Args:
-            event_data: Event data to create
-        """
-        logger.info(f"Creating event: {event_data.summary}")
+            event_data: Event data to convert
 
+        Returns:
+            Event body dict
+        """
         start_dt = event_data.start
         end_dt = event_data.end or (start_dt + timedelta(hours=1))
 
-        event_body = {
+        event_body: dict[str, Any] = {
             "summary": event_data.summary,
             "description": event_data.description,
             "start": {"dateTime": start_dt.isoformat(), "timeZone": "UTC"},
             "end": {"dateTime": end_dt.isoformat(), "timeZone": "UTC"},
-            "extendedProperties": {"private": {"source_id": event_data.source_id}},
         }
 
         if event_data.url:
             event_body["source"] = {"url": event_data.url, "title": "Ticket Info"}
 
-        result = (
-            self.service.events()
-            .insert(
-                calendarId=self.calendar_id,
-                body=event_body,  # type: ignore[arg-type]  # Stubs expect strict TypedDict, API accepts partial dicts
+        event_body["extendedProperties"] = {
+            "private": {
+                "source_id": event_data.source_id,
+                MANAGED_BY_KEY: MANAGED_BY_VALUE,
+                CONTENT_HASH_KEY: CalendarClient._fingerprint(event_body),
+            }
+        }
+
+        return event_body
+
+    @staticmethod
+    def _fingerprint(event_body: dict[str, Any]) -> str:
+        """Compute a canonical fingerprint of an event body's content.
+
+        Args:
+            event_body: Event body without extendedProperties
+
+        Returns:
+            Hex digest identifying the event content
+        """
+        canonical = json.dumps(event_body, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @staticmethod
+    def _is_unchanged(existing: dict[str, Any], event_body: dict[str, Any]) -> bool:
+        """Check whether an existing event already holds the given content.
+
+        Args:
+            existing: Event dict as returned by the API
+            event_body: Event body that would be written
+
+        Returns:
+            True if the stored content fingerprint matches
+        """
+        private = existing.get("extendedProperties", {}).get("private", {})
+        stored_hash = private.get(CONTENT_HASH_KEY)
+        new_hash = event_body["extendedProperties"]["private"][CONTENT_HASH_KEY]
+        return stored_hash is not None and stored_hash == new_hash
+
+    def _create_event(self, event_data: CalendarEventData) -> None:
+        """Create a new calendar event.
+
+        Args:
+            event_data: Event data to create
+        """
+        logger.info(f"Creating event: {event_data.summary}")
+
+        event_body = {**self._build_event_body(event_data), "id": new_event_id()}
+
+        try:
+            result = self._execute(
+                self.service.events().insert(
+                    calendarId=self.calendar_id,
+                    body=event_body,  # type: ignore[arg-type]  # Stubs expect strict TypedDict, API accepts partial dicts
+                ),
+                "insert",
             )
-            .execute()
-        )
+        except HttpError as e:
+            if not is_duplicate(e):
+                raise
+            # An earlier attempt created the event but its response was lost
+            result = event_body
 
         logger.info(f"Created event {result['id']}")
+        self._record_event(event_data.source_id, dict(result))
 
     def _update_event(self, event_id: str, event_data: CalendarEventData) -> None:
         """Update an existing calendar event.
@@ -118,42 +822,509 @@ class CalendarClient:
         """
         logger.info(f"Updating event {event_id}: {event_data.summary}")
 
-        start_dt = event_data.start
-        end_dt = event_data.end or (start_dt + timedelta(hours=1))
-
-        event_body = {
-            "summary": event_data.summary,
-            "description": event_data.description,
-            "start": {"dateTime": start_dt.isoformat(), "timeZone": "UTC"},
-            "end": {"dateTime": end_dt.isoformat(), "timeZone": "UTC"},
-            "extendedProperties": {"private": {"source_id": event_data.source_id}},
-        }
-
-        if event_data.url:
-            event_body["source"] = {"url": event_data.url, "title": "Ticket Info"}
+        event_body = self._build_event_body(event_data)
 
-        self.service.events().update(
-            calendarId=self.calendar_id,
-            eventId=event_id,
-            body=event_body,  # type: ignore[arg-type]  # Stubs expect strict TypedDict, API accepts partial dicts
-        ).execute()
+        result = self._execute(
+            self.service.events().update(
+                calendarId=self.calendar_id,
+                eventId=event_id,
+                body=event_body,  # type: ignore[arg-type]  # Stubs expect strict TypedDict, API accepts partial dicts
+            ),
+            "update",
+        )
 
         logger.info(f"Updated event {event_id}")
+        self._record_event(event_data.source_id, dict(result))
 
-    def upsert_event(self, event_data: CalendarEventData) -> bool:
+    def upsert_event(self, event_data: CalendarEventData) -> UpsertOutcome:
         """Create or update an event based on source_id.
 
+        Updates are skipped when the existing event's content fingerprint
+        already matches. If an event known to the state store has been deleted,
+        it is recreated. Once the API budget is used up, events that could only
+        be resolved with a lookup request are deferred to the next run.
+
         Args:
             event_data: Event data to upsert
 
         Returns:
-            True if event was created, False if updated
+            Whether the event was created, updated, left unchanged or deferred
         """
-        existing_event = self._get_event_by_source_id(event_data.source_id)
+        if self.over_budget and self._needs_lookup(event_data.source_id):
+            logger.info(f"API budget used up, deferring {event_data.source_id}")
+            return UpsertOutcome.DEFERRED
 
-        if existing_event:
-            self._update_event(existing_event["id"], event_data)
-            return False
-        else:
+        event_id, unchanged = self._resolve_event(
+            event_data.source_id, self._build_event_body(event_data)
+        )
+
+        if event_id is None:
+            self._create_event(event_data)
+            return UpsertOutcome.CREATED
+
+        if unchanged:
+            logger.debug(f"Event {event_id} is unchanged")
+            return UpsertOutcome.UNCHANGED
+
+        try:
+            self._update_event(event_id, event_data)
+        except HttpError as e:
+            if e.resp.status not in GONE_STATUSES:
+                raise
+            logger.warning(f"Event {event_id} no longer exists, recreating it")
+            self._forget_event(event_data.source_id)
             self._create_event(event_data)
-            return True
+            return UpsertOutcome.CREATED
+        return UpsertOutcome.UPDATED
+
+    def _execute_batched(
+        self,
+        pending: list[int],
+        build_request: Callable[[int], tuple[str, Any]],
+        on_success: Callable[[int, Any], None],
+        on_failure: Callable[[int, Exception], None],
+        batch_size: int,
+    ) -> None:
+        """Send requests in batches, resending retryable failures in later rounds.
+
+        Args:
+            pending: Indexes of the items to send requests for
+            build_request: Builds the API method name and request for an item
+            on_success: Called with an item's index and response once it succeeds
+            on_failure: Called with an item's index and error once it has failed
+                and will not be retried
+            batch_size: Maximum number of requests per batch
+        """
+
+        def callback(
+            request_id: str, response: Any, exception: Exception | None
+        ) -> None:
+            i = int(request_id)
+            if exception is None:
+                on_success(i, response)
+                return
+            if self.retry_policy is not None:
+                delay = self.retry_policy.record_failure(exception, attempt)
+                if delay is not None:
+                    retry_delays[i] = delay
+                    return
+            on_failure(i, exception)
+
+        # Individual requests that fail with retryable errors are resent in
+        # later rounds, after the longest of their backoff delays
+        attempt = 1
+        while True:
+            retry_delays: dict[int, float] = {}
+            for chunk_start in range(0, len(pending), batch_size):
+                chunk = pending[chunk_start : chunk_start + batch_size]
+                batch = self.service.new_batch_http_request(callback=callback)
+                for i in chunk:
+                    method, request = build_request(i)
+                    batch.add(request, request_id=str(i))
+                    if self.api_usage is not None:
+                        self.api_usage.record(
+                            method, payload_bytes=_payload_bytes(request)
+                        )
+
+                logger.info(f"Sending batch of {len(chunk)} requests")
+                try:
+                    self._execute(batch, BATCH_METHOD, cost=len(chunk))
+                except HttpError as e:
+                    logger.error(f"Batch request failed: {e}")
+
+            if not retry_delays:
+                return
+            time.sleep(max(retry_delays.values()))
+            pending = sorted(retry_delays)
+            attempt += 1
+
+    def _write_batched(
+        self,
+        events: list[CalendarEventData],
+        bodies: list[dict[str, Any]],
+        existing_ids: list[str | None],
+        pending: list[int],
+        outcomes: list[UpsertOutcome],
+        batch_size: int,
+    ) -> None:
+        """Insert or update events in batches, retrying failed items.
+
+        Args:
+            events: All events being written
+            bodies: Event body for each event
+            existing_ids: Existing event ID for each event, None to insert
+            pending: Indexes of the events to write
+            outcomes: Outcome for each event, updated as writes succeed
+            batch_size: Maximum number of requests per batch
+        """
+        # Generated once, so that a resent insert carries the same ID
+        insert_bodies = {
+            i: {**bodies[i], "id": new_event_id()}
+            for i in pending
+            if existing_ids[i] is None
+        }
+
+        def build_request(i: int) -> tuple[str, Any]:
+            event_id = existing_ids[i]
+            if event_id is None:
+                return "insert", self.service.events().insert(
+                    calendarId=self.calendar_id,
+                    body=insert_bodies[i],  # type: ignore[arg-type]  # Stubs expect strict TypedDict, API accepts partial dicts
+                )
+            return "update", self.service.events().update(
+                calendarId=self.calendar_id,
+                eventId=event_id,
+                body=bodies[i],  # type: ignore[arg-type]  # Stubs expect strict TypedDict, API accepts partial dicts
+            )
+
+        def on_success(i: int, response: Any) -> None:
+            if existing_ids[i] is None:
+                outcomes[i] = UpsertOutcome.CREATED
+                logger.info(f"Created event {response['id']}")
+            else:
+                outcomes[i] = UpsertOutcome.UPDATED
+                logger.info(f"Updated event {response['id']}")
+            self._record_event(events[i].source_id, dict(response))
+
+        def on_failure(i: int, exception: Exception) -> None:
+            if existing_ids[i] is None and is_duplicate(exception):
+                # An earlier attempt created the event but its response was lost
+                on_success(i, insert_bodies[i])
+                return
+            logger.error(f"Failed to write event {events[i].source_id}: {exception}")
+            if isinstance(exception, HttpError) and exception.resp.status in (
+                GONE_STATUSES
+            ):
+                # Recreated on the next run
+                self._forget_event(events[i].source_id)
+
+        self._execute_batched(
+            pending, build_request, on_success, on_failure, batch_size
+        )
+
+    def upsert_events(
+        self, events: list[CalendarEventData], batch_size: int = MAX_BATCH_SIZE
+    ) -> list[UpsertOutcome]:
+        """Create or update many events using batched write requests.
+
+        Existing events are resolved first, against the state store or
+        prefetched index if available and otherwise with batched lookups, and
+        unchanged events are skipped. Then inserts and updates are sent in
+        batches of up to batch_size requests. Events whose lookup fails are
+        reported as failed without stopping the others. Once the API budget is
+        used up, events that could only be resolved with a lookup request are
+        deferred to the next run.
+
+        Args:
+            events: Events to upsert
+            batch_size: Maximum number of requests per batch (at most 50)
+
+        Returns:
+            Outcome for each event, in the same order as events
+        """
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+
+        outcomes = [UpsertOutcome.FAILED] * len(events)
+        bodies = [self._build_event_body(e) for e in events]
+        resolved: dict[int, tuple[str | None, bool]] = {}
+        lookups: list[int] = []
+        for i, event_data in enumerate(events):
+            if not self._needs_lookup(event_data.source_id):
+                resolved[i] = self._resolve_event(event_data.source_id, bodies[i])
+            elif self.over_budget:
+                logger.info(f"API budget used up, deferring {event_data.source_id}")
+                outcomes[i] = UpsertOutcome.DEFERRED
+            else:
+                lookups.append(i)
+        resolved.update(self._lookup_batched(events, bodies, lookups, batch_size))
+
+        existing_ids: list[str | None] = [None] * len(events)
+        pending: list[int] = []
+        for i, (event_id, unchanged) in sorted(resolved.items()):
+            existing_ids[i] = event_id
+            if unchanged:
+                logger.debug(f"Event {event_id} is unchanged")
+                outcomes[i] = UpsertOutcome.UNCHANGED
+            else:
+                pending.append(i)
+
+        self._write_batched(events, bodies, existing_ids, pending, outcomes, batch_size)
+        return outcomes
+
+    def _lookup_batched(
+        self,
+        events: list[CalendarEventData],
+        bodies: list[dict[str, Any]],
+        pending: list[int],
+        batch_size: int,
+    ) -> dict[int, tuple[str | None, bool]]:
+        """Look up events by source_id in batches, retrying failed items.
+
+        Args:
+            events: All events being written
+            bodies: Event body for each event
+            pending: Indexes of the events to look up
+            batch_size: Maximum number of requests per batch
+
+        Returns:
+            Mapping of index to (existing event ID or None, whether content is
+            unchanged) for each event looked up, leaving out failed lookups
+        """
+        resolved: dict[int, tuple[str | None, bool]] = {}
+
+        def build_request(i: int) -> tuple[str, Any]:
+            return "list", self.service.events().list(
+                calendarId=self.calendar_id,
+                privateExtendedProperty=f"source_id={events[i].source_id}",
+                maxResults=1,
+            )
+
+        def on_success(i: int, response: Any) -> None:
+            items = response.get("items", [])
+            existing = dict(items[0]) if items else None
+            resolved[i] = self._compare_existing(
+                events[i].source_id, existing, bodies[i]
+            )
+
+        def on_failure(i: int, exception: Exception) -> None:
+            # Left failed rather than losing the rest of the run
+            logger.error(f"Failed to look up event {events[i].source_id}: {exception}")
+
+        self._execute_batched(
+            pending, build_request, on_success, on_failure, batch_size
+        )
+        return resolved
+
+    def _known_events(
+        self,
+    ) -> dict[str, tuple[str, str | None, str | None, bool]]:
+        """Get the managed events known to exist, without writing anything.
+
+        Uses the state store if there is one, and otherwise lists the managed
+        events once.
+
+        Returns:
+            Mapping of source_id to (event ID, content hash, summary if known,
+            whether the event carries the managed-by marker)
+        """
+        if self.state_store is not None:
+            return {
+                source_id: (state.event_id, state.content_hash, None, state.managed)
+                for source_id, state in self.state_store.get_all(
+                    self.calendar_id
+                ).items()
+            }
+
+        if self._event_index is None:
+            self.prefetch_events()
+        assert self._event_index is not None
+        return {
+            source_id: self._known_event(event)
+            for source_id, event in self._event_index.items()
+        }
+
+    @staticmethod
+    def _known_event(
+        event: dict[str, Any],
+    ) -> tuple[str, str | None, str | None, bool]:
+        """Get the (event ID, content hash, summary, marked) of a remote event."""
+        private = event.get("extendedProperties", {}).get("private", {})
+        return (
+            event["id"],
+            private.get(CONTENT_HASH_KEY),
+            event.get("summary"),
+            CalendarClient._is_marked(event),
+        )
+
+    def plan_sync(
+        self, events: list[CalendarEventData], profile: str, prune: bool = False
+    ) -> SyncPlan:
+        """Compute the changes syncing events would make, without writing.
+
+        With a state store the plan is computed from the store alone, making no
+        API requests (reconcile first to account for changes made elsewhere).
+        Otherwise the managed events are listed once, and events missing from
+        the listing are looked up. When pruning, the events find_stale_events
+        would return are planned for deletion.
+
+        Args:
+            events: Events the calendar should hold
+            profile: Name of the profile the plan is for
+            prune: Whether to plan deletions of stale managed events
+
+        Returns:
+            SyncPlan for this client's calendar
+        """
+        known = self._known_events()
+        changes = []
+        for event_data in events:
+            event_body = self._build_event_body(event_data)
+            new_hash = event_body["extendedProperties"]["private"][CONTENT_HASH_KEY]
+            current = known.get(event_data.source_id)
+            if current is None and self.state_store is None:
+                # Events written before the managed-by marker are not listed
+                existing = self._get_event_by_source_id(event_data.source_id)
+                if existing is not None:
+                    current = self._known_event(existing)
+            if current is None:
+                action = PlanAction.CREATE
+            elif current[1] == new_hash:
+                action = PlanAction.UNCHANGED
+            else:
+                action = PlanAction.UPDATE
+            changes.append(
+                PlannedChange(
+                    action=action,
+                    source_id=event_data.source_id,
+                    summary=event_data.summary,
+                    event_id=current[0] if current is not None else None,
+                    event=event_data if action is not PlanAction.UNCHANGED else None,
+                )
+            )
+
+        wanted = {event_data.source_id for event_data in events}
+        for source_id, (event_id, _, summary, managed) in known.items():
+            if prune and managed and source_id not in wanted:
+                changes.append(
+                    PlannedChange(
+                        action=PlanAction.DELETE,
+                        source_id=source_id,
+                        summary=summary,
+                        event_id=event_id,
+                    )
+                )
+
+        plan = SyncPlan(profile=profile, calendar_id=self.calendar_id, changes=changes)
+        logger.info(f"Planned sync of {self.calendar_id}: {dict(plan.counts())}")
+        return plan
+
+    def apply_plan(
+        self, plan: SyncPlan, batch_size: int = MAX_BATCH_SIZE
+    ) -> list[UpsertOutcome]:
+        """Apply a plan's creates and updates in batched write requests.
+
+        Planned deletions are left to delete_events, which caps how many one
+        run may delete.
+
+        Args:
+            plan: Plan computed for this client's calendar
+            batch_size: Maximum number of requests per batch (at most 50)
+
+        Returns:
+            Outcome for each created, updated or unchanged event, in plan order
+
+        Raises:
+            ValueError: If the plan is for another calendar
+        """
+        if plan.calendar_id != self.calendar_id:
+            raise ValueError(
+                f"Plan is for calendar {plan.calendar_id}, not {self.calendar_id}"
+            )
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+
+        changes = [c for c in plan.changes if c.action is not PlanAction.DELETE]
+        # Unchanged entries carry no event and are never written
+        writes = [(i, c, c.event) for i, c in enumerate(changes) if c.event is not None]
+        events = [event_data for _, _, event_data in writes]
+        existing_ids = [
+            change.event_id if change.action is PlanAction.UPDATE else None
+            for _, change, _ in writes
+        ]
+        write_outcomes = [UpsertOutcome.FAILED] * len(writes)
+        self._write_batched(
+            events,
+            [self._build_event_body(event_data) for event_data in events],
+            existing_ids,
+            list(range(len(writes))),
+            write_outcomes,
+            batch_size,
+        )
+
+        outcomes = [UpsertOutcome.UNCHANGED] * len(changes)
+        for (i, _, _), outcome in zip(writes, write_outcomes, strict=True):
+            outcomes[i] = outcome
+        return outcomes
+
+    def find_stale_events(self, events: list[CalendarEventData]) -> dict[str, str]:
+        """Find managed events whose source is no longer among the events.
+
+        Fixtures that disappear from the ticketing page, or whose eligible
+        category changes, leave behind events that nothing will update again.
+        Only events carrying the managed-by marker are candidates, so events
+        that merely have a source_id, which other tools may set too, are never
+        deleted.
+
+        Args:
+            events: Events the calendar should hold
+
+        Returns:
+            Mapping of stale source_id to event ID
+        """
+        wanted = {event_data.source_id for event_data in events}
+        return {
+            source_id: event_id
+            for source_id, (event_id, _, _, managed) in self._known_events().items()
+            if managed and source_id not in wanted
+        }
+
+    def delete_events(
+        self,
+        stale: dict[str, str],
+        max_deletes: int | None = None,
+        batch_size: int = MAX_BATCH_SIZE,
+    ) -> int:
+        """Delete events in batched requests.
+
+        Events that are already gone count as deleted.
+
+        Args:
+            stale: Mapping of source_id to event ID of the events to delete
+            max_deletes: Refuse to delete more than this many events, None for
+                no limit
+            batch_size: Maximum number of requests per batch (at most 50)
+
+        Returns:
+            Number of events deleted
+
+        Raises:
+            ValueError: If there are more events than max_deletes
+        """
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+        if max_deletes is not None and len(stale) > max_deletes:
+            raise ValueError(
+                f"Refusing to delete {len(stale)} events from {self.calendar_id} "
+                f"(limit is {max_deletes})"
+            )
+
+        items = list(stale.items())
+        deleted = 0
+
+        def build_request(i: int) -> tuple[str, Any]:
+            return "delete", self.service.events().delete(
+                calendarId=self.calendar_id, eventId=items[i][1]
+            )
+
+        def on_success(i: int, response: Any) -> None:
+            nonlocal deleted
+            deleted += 1
+            logger.info(f"Deleted event {items[i][1]}")
+            self._forget_event(items[i][0])
+
+        def on_failure(i: int, exception: Exception) -> None:
+            nonlocal deleted
+            if isinstance(exception, HttpError) and exception.resp.status in (
+                GONE_STATUSES
+            ):
+                deleted += 1
+                logger.info(f"Event {items[i][1]} was already deleted")
+                self._forget_event(items[i][0])
+                return
+            logger.error(f"Failed to delete event {items[i][0]}: {exception}")
+
+        self._execute_batched(
+            list(range(len(items))), build_request, on_success, on_failure, batch_size
+        )
+        return deleted
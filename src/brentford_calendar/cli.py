@@ -1,19 +1,51 @@
 """CLI for Brentford Calendar sync."""
 
+import functools
+import json
 import logging
 import sys
+from collections import Counter
+from collections.abc import Iterable
 from pathlib import Path
+from typing import Any
 
 import click
+from pydantic import BaseModel
 
-from brentford_calendar.calendar_client import CalendarClient
-from brentford_calendar.config import load_config_from_file
+from brentford_calendar import __version__, metrics
+from brentford_calendar.cache import LastSyncCache, PageCache, TokenCache
+from brentford_calendar.calendar_client import (
+    CalendarClient,
+    UpsertOutcome,
+    build_service,
+)
+from brentford_calendar.config import (
+    SyncProfile,
+    load_config_from_file,
+    load_profiles_from_file,
+)
+from brentford_calendar.eligibility import EligibilityIndex
 from brentford_calendar.models import (
+    CalendarEventData,
+    FixtureData,
     MembershipType,
     OnsaleFixtureData,
     ProcessedFixtureData,
+    parse_category_label,
 )
-from brentford_calendar.scraper import scrape_fixtures
+from brentford_calendar.plan import SyncPlan, load_plans, save_plans
+from brentford_calendar.profiling import StageProfiler
+from brentford_calendar.ratelimit import TokenBucket
+from brentford_calendar.retry import RetryPolicy
+from brentford_calendar.scraper import (
+    extract_fixtures,
+    fetch_page_conditional,
+    scrape_fixtures,
+    stream_fixtures,
+)
+from brentford_calendar.state import SyncStateStore
+from brentford_calendar.sync import ConcurrentSyncEngine, upsert_sequentially
+from brentford_calendar.usage import ApiUsage
 
 
 def setup_logging(verbose: int) -> None:
@@ -31,6 +63,326 @@ def setup_logging(verbose: int) -> None:
     )
 
 
+def _load_profiles(
+    profiles_file: Path | None,
+    membership: str | None,
+    taps: int | None,
+    credentials: Path | None,
+    calendar_id: str | None,
+) -> list[SyncProfile]:
+    """Get the profiles to sync from the profiles file or the command line.
+
+    Args:
+        profiles_file: Path to the profiles JSON file, if given
+        membership: Membership type name, if given
+        taps: Number of TAPs, if given
+        credentials: Default service account file, if given
+        calendar_id: Google Calendar ID, if given
+
+    Returns:
+        List of profiles, each with credentials set
+
+    Raises:
+        click.UsageError: If the options are missing or inconsistent
+    """
+    if profiles_file is None:
+        missing = [
+            option
+            for option, value in [
+                ("--membership", membership),
+                ("--credentials", credentials),
+                ("--calendar-id", calendar_id),
+            ]
+            if value is None
+        ]
+        if missing:
+            raise click.UsageError(
+                f"Missing option(s) {', '.join(missing)} (or use --profiles)"
+            )
+        assert membership is not None and calendar_id is not None
+        return [
+            SyncProfile(
+                name=calendar_id,
+                membership=MembershipType[membership.upper()],
+                taps=taps or 0,
+                calendar_id=calendar_id,
+                credentials=credentials,
+            )
+        ]
+
+    if membership is not None or taps is not None or calendar_id is not None:
+        raise click.UsageError(
+            "--profiles cannot be combined with --membership, --taps or --calendar-id"
+        )
+    try:
+        profiles = load_profiles_from_file(profiles_file)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--profiles") from e
+    for profile in profiles:
+        if profile.credentials is None:
+            if credentials is None:
+                raise click.UsageError(
+                    f"Profile {profile.name} has no credentials "
+                    "and --credentials was not given"
+                )
+            profile.credentials = credentials
+    return profiles
+
+
+def _load_plans(plan_file: Path, profiles: list[SyncProfile]) -> dict[str, SyncPlan]:
+    """Load a plan file and match its plans to the profiles being synced.
+
+    Args:
+        plan_file: Path to a plan file written by --plan
+        profiles: Profiles being synced
+
+    Returns:
+        Mapping of profile name to its plan
+
+    Raises:
+        click.BadParameter: If the file is invalid or lacks a profile's plan
+    """
+    try:
+        plans = {plan.profile: plan for plan in load_plans(plan_file)}
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--apply-plan") from e
+    for profile in profiles:
+        plan = plans.get(profile.name)
+        if plan is None or plan.calendar_id != profile.calendar_id:
+            raise click.BadParameter(
+                f"No plan for profile {profile.name} ({profile.calendar_id})",
+                param_hint="--apply-plan",
+            )
+    return plans
+
+
+def _sync_key(profile: SyncProfile) -> str:
+    """Get the key recording which page a profile's calendar was synced from."""
+    return (
+        f"{__version__}:{profile.calendar_id}:{profile.membership.name}:{profile.taps}"
+    )
+
+
+def _find_onsale_fixtures(
+    raw_fixtures: Iterable[FixtureData], profiles: list[SyncProfile], vectorized: bool
+) -> dict[str, list[OnsaleFixtureData]]:
+    """Process fixtures once, then find each profile's eligible fixtures.
+
+    Args:
+        raw_fixtures: Scraped fixtures (when streaming, processed as each arrives)
+        profiles: Profiles to find eligible fixtures for
+        vectorized: Whether to use the NumPy engine
+
+    Returns:
+        Mapping of profile name to its eligible fixtures
+    """
+    logger = logging.getLogger(__name__)
+    processed_fixtures = [
+        ProcessedFixtureData.from_fixture_data(fixture) for fixture in raw_fixtures
+    ]
+    logger.info(f"Found {len(processed_fixtures)} raw fixtures")
+    with metrics.span("eligibility"):
+        if vectorized:
+            from brentford_calendar.vectorized import VectorizedEligibility
+
+            eligibility = VectorizedEligibility(processed_fixtures)
+            return dict(
+                zip(
+                    [profile.name for profile in profiles],
+                    eligibility.onsale_fixtures(
+                        [(profile.membership, profile.taps) for profile in profiles]
+                    ),
+                    strict=True,
+                )
+            )
+
+        index = EligibilityIndex(processed_fixtures)
+        return {
+            profile.name: index.onsale_fixtures(profile.membership, profile.taps)
+            for profile in profiles
+        }
+
+
+class _ServiceAccountClients:
+    """Calendar clients for each profile, sharing one per service account.
+
+    Profiles whose service account has been seen before get a client for
+    their calendar reusing that account's credentials and service.
+    """
+
+    def __init__(
+        self,
+        api_endpoint: str | None,
+        token_cache: TokenCache | None,
+        **shared: Any,
+    ):
+        """Set up the clients.
+
+        Args:
+            api_endpoint: Send API requests here rather than to Google, if given
+            token_cache: Optional on-disk cache of access tokens
+            **shared: State store, rate limiter, retry policy and API usage
+                shared by every client
+        """
+        self.api_endpoint = api_endpoint
+        self.token_cache = token_cache
+        self.shared = shared
+        self._clients: dict[Path, CalendarClient] = {}
+
+    def client_for(self, profile: SyncProfile) -> CalendarClient:
+        """Get a client for a profile's calendar.
+
+        Args:
+            profile: Profile to sync, with credentials set
+
+        Returns:
+            CalendarClient for the profile's calendar
+        """
+        assert profile.credentials is not None
+        base = self._clients.get(profile.credentials)
+        if base is not None:
+            return base.for_calendar(profile.calendar_id)
+        config = load_config_from_file(profile.credentials, profile.calendar_id)
+        if self.api_endpoint is not None:
+            config = config.model_copy(update={"api_endpoint": self.api_endpoint})
+        client = CalendarClient.from_config(
+            config, token_cache=self.token_cache, **self.shared
+        )
+        self._clients[profile.credentials] = client
+        return client
+
+
+class ProfileSyncResult(BaseModel):
+    """Counts of what syncing one profile did."""
+
+    outcomes: dict[UpsertOutcome, int]
+    deleted: int = 0
+    # Stale events found but not deleted
+    undeleted: int = 0
+    # Whether pruning was refused for finding too many stale events
+    prune_refused: bool = False
+
+    @property
+    def failed(self) -> int:
+        """Number of events that failed to write or delete."""
+        return self.outcomes.get(UpsertOutcome.FAILED, 0) + self.undeleted
+
+    def summary(self, prune: bool) -> str:
+        """Describe the counts in one line.
+
+        Args:
+            prune: Whether to report deletions
+
+        Returns:
+            Summary such as "Synced 3 events (1 created, 0 updated, 2 unchanged)"
+        """
+        msg = f"Synced {sum(self.outcomes.values())} events "
+        msg += f"({self.outcomes.get(UpsertOutcome.CREATED, 0)} created, "
+        msg += f"{self.outcomes.get(UpsertOutcome.UPDATED, 0)} updated, "
+        msg += f"{self.outcomes.get(UpsertOutcome.UNCHANGED, 0)} unchanged"
+        if prune:
+            msg += f", {self.deleted} deleted"
+        if self.outcomes.get(UpsertOutcome.DEFERRED):
+            msg += f", {self.outcomes[UpsertOutcome.DEFERRED]} deferred"
+        msg += f", {self.failed} failed)" if self.failed else ")"
+        return msg
+
+
+def _refresh_client(
+    client: CalendarClient,
+    api_usage: ApiUsage,
+    reconcile: bool,
+    prefetch: bool,
+    prefix: str,
+) -> None:
+    """Bring a client's knowledge of its calendar up to date before syncing.
+
+    Args:
+        client: Client for the profile's calendar
+        api_usage: Count of API requests and their budget
+        reconcile: Whether to reconcile the state store with the calendar
+        prefetch: Whether to index the managed events
+        prefix: Prefix for messages about the profile
+    """
+    logger = logging.getLogger(__name__)
+    if api_usage.exhausted:
+        # Degraded mode: events the state store or index can't resolve, and
+        # pruning, are deferred to the next run
+        logger.warning(
+            f"{prefix}API budget used up, only writing events "
+            "known to be new or changed"
+        )
+    elif reconcile:
+        client.reconcile_state()
+    elif prefetch:
+        client.prefetch_events()
+
+
+def _sync_profile(
+    client: CalendarClient,
+    work: SyncPlan | list[CalendarEventData],
+    api_usage: ApiUsage,
+    batch: bool,
+    workers: int,
+    api_endpoint: str | None,
+    prune: bool,
+    max_deletes: int,
+    prefix: str,
+) -> ProfileSyncResult:
+    """Write one profile's events or apply its plan, then prune if asked.
+
+    Args:
+        client: Client for the profile's calendar
+        work: Events the calendar should hold, or a plan to apply
+        api_usage: Count of API requests and their budget
+        batch: Whether to write events in batched requests
+        workers: Number of threads to write events from
+        api_endpoint: Endpoint for the workers' services, if not Google
+        prune: Whether to delete stale managed events
+        max_deletes: Most events to delete before refusing to prune
+        prefix: Prefix for messages about the profile
+
+    Returns:
+        Counts of the outcomes
+    """
+    logger = logging.getLogger(__name__)
+    if isinstance(work, SyncPlan):
+        outcomes = client.apply_plan(work)
+        stale = work.deletions() if prune else {}
+    else:
+        if batch:
+            outcomes = client.upsert_events(work)
+        elif workers > 1:
+            engine = ConcurrentSyncEngine(
+                client,
+                functools.partial(build_service, client.credentials, api_endpoint),
+                workers,
+            )
+            outcomes = engine.upsert_events(work)
+        else:
+            outcomes = upsert_sequentially(client, work)
+        stale = (
+            client.find_stale_events(work) if prune and not api_usage.exhausted else {}
+        )
+
+    result = ProfileSyncResult(outcomes=Counter(outcomes))
+    if prune and api_usage.exhausted:
+        logger.warning(f"{prefix}API budget used up, deferring pruning")
+        return result
+    if stale:
+        try:
+            result.deleted = client.delete_events(stale, max_deletes=max_deletes)
+        except ValueError as e:
+            # Most likely a scrape that found too few fixtures, so leave the
+            # calendar alone rather than empty it
+            logger.warning(f"Not pruning: {e}")
+            click.echo(f"Error: {prefix}{e}", err=True)
+            result.prune_refused = True
+            return result
+        result.undeleted = len(stale) - result.deleted
+    return result
+
+
 @click.command()
 @click.option(
     "--verbose",
@@ -44,84 +396,338 @@ def setup_logging(verbose: int) -> None:
         [m.name for m in MembershipType],
         case_sensitive=False,
     ),
-    required=True,
     help="Membership type (e.g., MY_BEES_MEMBERS)",
 )
 @click.option(
     "--taps",
     type=int,
-    default=0,
     help="Number of TAPs you have (default: 0)",
 )
 @click.option(
     "--credentials",
     type=click.Path(exists=True, path_type=Path),
-    required=True,
     help="Path to Google service account JSON file",
 )
 @click.option(
     "--calendar-id",
     type=str,
-    required=True,
     help="Google Calendar ID",
 )
+@click.option(
+    "--profiles",
+    "profiles_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="JSON file of profiles to sync from a single scrape, "
+    "instead of --membership, --taps and --calendar-id",
+)
+@click.option(
+    "--prefetch",
+    is_flag=True,
+    help="List all managed events once instead of looking up each event",
+)
+@click.option(
+    "--batch",
+    is_flag=True,
+    help="Send event writes in batched requests",
+)
+@click.option(
+    "--state-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="SQLite file recording previously written events, to skip lookups",
+)
+@click.option(
+    "--reconcile",
+    is_flag=True,
+    help="Repair the state file against the calendar before syncing",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of concurrent workers writing events (default: 1)",
+)
+@click.option(
+    "--max-qps",
+    type=click.FloatRange(min=0, min_open=True),
+    default=10.0,
+    help="Maximum Calendar API requests per second (default: 10)",
+)
+@click.option(
+    "--retry-budget",
+    type=click.IntRange(min=0),
+    default=50,
+    help="Maximum retries of failed Calendar API requests per run (default: 50)",
+)
+@click.option(
+    "--max-api-calls",
+    type=click.IntRange(min=0),
+    help="Calendar API requests after which only new or changed events are written",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory for caching data between runs, such as access tokens",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Sync even if the page is unchanged since the last sync",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Print the changes a sync would make without writing to the calendar",
+)
+@click.option(
+    "--plan",
+    "plan_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the changes a sync would make to a plan file (implies --dry-run)",
+)
+@click.option(
+    "--apply-plan",
+    "apply_plan_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Apply a plan file written by --plan instead of scraping",
+)
+@click.option(
+    "--prune",
+    is_flag=True,
+    help="Delete managed events for fixtures that are no longer on sale",
+)
+@click.option(
+    "--max-deletes",
+    type=click.IntRange(min=0),
+    default=10,
+    show_default=True,
+    help="Refuse to prune more than this many events from a calendar in one run",
+)
+@click.option(
+    "--metrics",
+    "metrics_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Append a JSON record of the run's timings and counters to a file",
+)
+@click.option(
+    "--prometheus-textfile",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the run's metrics to a Prometheus textfile",
+)
+@click.option(
+    "--profile-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Profile each stage with cProfile, writing the profiles to a directory",
+)
+@click.option(
+    "--profile-memory",
+    is_flag=True,
+    help="With --profile-dir, also report peak memory and top allocation sites",
+)
+@click.option(
+    "--api-endpoint",
+    help="Send Calendar API requests to a local stand-in, such as the fake server",
+)
+@click.option(
+    "--vectorized",
+    is_flag=True,
+    help="Compute eligibility for all profiles with NumPy (requires the 'fast' extra)",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Process fixtures while the page downloads (skips the unchanged-page check)",
+)
 def main(
     verbose: int,
-    membership: str,
-    taps: int,
-    credentials: Path,
-    calendar_id: str,
+    membership: str | None,
+    taps: int | None,
+    credentials: Path | None,
+    calendar_id: str | None,
+    profiles_file: Path | None,
+    prefetch: bool,
+    batch: bool,
+    state_file: Path | None,
+    reconcile: bool,
+    workers: int,
+    max_qps: float,
+    retry_budget: int,
+    max_api_calls: int | None,
+    cache_dir: Path | None,
+    force: bool,
+    dry_run: bool,
+    plan_file: Path | None,
+    apply_plan_file: Path | None,
+    prune: bool,
+    max_deletes: int,
+    metrics_file: Path | None,
+    prometheus_textfile: Path | None,
+    profile_dir: Path | None,
+    profile_memory: bool,
+    api_endpoint: str | None,
+    vectorized: bool,
+    stream: bool,
 ) -> None:
     """Sync Brentford FC ticket on-sale dates to Google Calendar."""
     setup_logging(verbose)
     logger = logging.getLogger(__name__)
+    run_metrics = metrics.reset()
+
+    if reconcile and state_file is None:
+        raise click.UsageError("--reconcile requires --state-file")
+    if batch and workers > 1:
+        raise click.UsageError("--batch cannot be combined with --workers")
+    if profile_memory and profile_dir is None:
+        raise click.UsageError("--profile-memory requires --profile-dir")
+
+    if vectorized:
+        try:
+            import brentford_calendar.vectorized  # noqa: F401
+        except ImportError as e:
+            raise click.UsageError(
+                "--vectorized requires NumPy (install the 'fast' extra)"
+            ) from e
 
+    dry_run = dry_run or plan_file is not None
+    if apply_plan_file is not None and dry_run:
+        raise click.UsageError("--apply-plan cannot be combined with --dry-run/--plan")
+
+    profiles = _load_profiles(profiles_file, membership, taps, credentials, calendar_id)
+    multi_profile = profiles_file is not None
+    plans = _load_plans(apply_plan_file, profiles) if apply_plan_file else None
+
+    state_store = None
+    profiler = None
+    if profile_dir is not None:
+        profiler = StageProfiler(profile_dir, trace_memory=profile_memory)
+        profiler.start()
     try:
-        logger.info("Fetching fixtures from Brentford FC website")
-        raw_fixtures = scrape_fixtures()
-        logger.info(f"Found {len(raw_fixtures)} raw fixtures")
-
-        # Convert membership string to enum
-        membership_type = MembershipType[membership.upper()]
-        logger.info(f"Filtering for {membership_type.value} with {taps} TAPs")
-
-        # Process fixtures: FixtureData -> ProcessedFixtureData -> OnsaleFixtureData
-        onsale_fixtures = []
-        for fixture in raw_fixtures:
-            processed = ProcessedFixtureData.from_fixture_data(fixture)
-            onsale = OnsaleFixtureData.from_processed_fixture_data(
-                processed, membership_type, taps
+        for profile in profiles:
+            logger.info(
+                f"Profile {profile.name}: {profile.membership.value} "
+                f"with {profile.taps} TAPs"
             )
-            if onsale is not None:
-                onsale_fixtures.append(onsale)
 
-        logger.info(
-            f"Found {len(onsale_fixtures)} fixtures with eligible on-sale dates"
-        )
+        page = None
+        onsale_fixtures: dict[str, list[OnsaleFixtureData]] = {}
+        if plans is None:
+            logger.info("Fetching fixtures from Brentford FC website")
+            raw_fixtures: Iterable[FixtureData]
+            if stream:
+                raw_fixtures = stream_fixtures()
+            elif cache_dir is not None:
+                page = fetch_page_conditional(PageCache(cache_dir / "pages"))
+                last_sync = LastSyncCache(cache_dir / "last-sync.json")
+                if not force:
+                    profiles = [
+                        profile
+                        for profile in profiles
+                        if last_sync.get(_sync_key(profile)) != page.content_hash
+                    ]
+                    if not profiles:
+                        click.echo("No changes since last sync")
+                        return
+                raw_fixtures = extract_fixtures(page.content)
+            else:
+                raw_fixtures = scrape_fixtures()
+            onsale_fixtures = _find_onsale_fixtures(raw_fixtures, profiles, vectorized)
+            logger.debug(f"Category label cache: {parse_category_label.cache_info()}")
 
-        # Sync to Google Calendar
+        # Sync to Google Calendar, sharing credentials and services between
+        # profiles that use the same service account
         logger.info("Syncing to Google Calendar")
-        config = load_config_from_file(credentials, calendar_id)
-        client = CalendarClient.from_config(config)
-
-        # Sync each onsale fixture
-        created, updated = 0, 0
-        for onsale_fixture in onsale_fixtures:
-            event_data = onsale_fixture.to_calendar_event_data()
-            was_created = client.upsert_event(event_data)
-            if was_created:
-                created += 1
-            else:
-                updated += 1
+        state_store = SyncStateStore(state_file) if state_file else None
+        retry_policy = RetryPolicy(budget=retry_budget)
+        api_usage = ApiUsage(max_api_calls)
+        clients = _ServiceAccountClients(
+            api_endpoint,
+            token_cache=TokenCache(cache_dir / "tokens.json") if cache_dir else None,
+            state_store=state_store,
+            rate_limiter=TokenBucket(max_qps),
+            retry_policy=retry_policy,
+            api_usage=api_usage,
+        )
+
+        any_failed = False
+        new_plans = []
+        with metrics.span("sync"):
+            for profile in profiles:
+                prefix = f"{profile.name}: " if multi_profile else ""
+                try:
+                    client = clients.client_for(profile)
+                    _refresh_client(client, api_usage, reconcile, prefetch, prefix)
+                    if plans is not None:
+                        work: SyncPlan | list[CalendarEventData] = plans[profile.name]
+                    else:
+                        fixtures = onsale_fixtures[profile.name]
+                        logger.info(
+                            f"{prefix}Found {len(fixtures)} fixtures "
+                            "with eligible on-sale dates"
+                        )
+                        work = [f.to_calendar_event_data() for f in fixtures]
+                        if dry_run:
+                            plan = client.plan_sync(work, profile.name, prune=prune)
+                            new_plans.append(plan)
+                            for line in plan.describe():
+                                click.echo(f"{prefix}{line}")
+                            continue
 
-        msg = f"Synced {len(onsale_fixtures)} events "
-        msg += f"({created} created, {updated} updated)"
-        click.echo(msg)
+                    result = _sync_profile(
+                        client,
+                        work,
+                        api_usage,
+                        batch=batch,
+                        workers=workers,
+                        api_endpoint=api_endpoint,
+                        prune=prune,
+                        max_deletes=max_deletes,
+                        prefix=prefix,
+                    )
+                except Exception as e:
+                    if not multi_profile:
+                        raise
+                    logger.error(f"Failed to sync profile {profile.name}: {e}")
+                    click.echo(f"Error: {prefix}{e}", err=True)
+                    any_failed = True
+                    continue
+
+                msg = f"{prefix}{result.summary(prune)}"
+                if retry_policy.retries and not multi_profile:
+                    msg += f" after {retry_policy.retries} retries "
+                    msg += f"({retry_policy.throttles} throttled)"
+                click.echo(msg)
+                if result.prune_refused:
+                    any_failed = True
+                if result.failed:
+                    any_failed = True
+                elif page is not None and not api_usage.exhausted:
+                    last_sync.set(_sync_key(profile), page.content_hash)
+
+        if plan_file is not None:
+            save_plans(plan_file, new_plans)
+        if api_usage.calls:
+            click.echo(api_usage.summary())
+        if retry_policy.retries and multi_profile:
+            click.echo(
+                f"Retried {retry_policy.retries} requests "
+                f"({retry_policy.throttles} throttled)"
+            )
+        if any_failed:
+            sys.exit(1)
 
     except Exception as e:
         logger.error(f"Failed to process fixtures: {e}", exc_info=verbose >= 2)
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
+    finally:
+        if state_store is not None:
+            state_store.close()
+        if profiler is not None:
+            profiler.stop()
+        logger.info(f"Run metrics: {json.dumps(run_metrics.to_record())}")
+        if metrics_file is not None:
+            run_metrics.write_json(metrics_file)
+        if prometheus_textfile is not None:
+            run_metrics.write_prometheus(prometheus_textfile)
 
 
 if __name__ == "__main__":
@@ -5,7 +5,9 @@ import logging
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+from brentford_calendar.models import MembershipType
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,11 @@ class GoogleCalendarConfig(BaseModel):
         description="Google service account credentials"
     )
     calendar_id: str = Field(description="Google Calendar ID")
+    api_endpoint: str | None = Field(
+        default=None,
+        description="Root URL of a local stand-in for the Google APIs, such as "
+        "the fake Calendar server, which is sent unauthenticated requests",
+    )
 
 
 def load_config_from_file(
@@ -47,3 +54,57 @@ def load_config_from_file(
         service_account_info=service_account_data,
         calendar_id=calendar_id,
     )
+
+
+class SyncProfile(BaseModel):
+    """A supporter's membership and the calendar to sync their on-sale dates to."""
+
+    name: str = Field(description="Name identifying the profile in output")
+    membership: MembershipType = Field(description="Membership type")
+    taps: int = Field(default=0, ge=0, description="Number of TAPs")
+    calendar_id: str = Field(description="Google Calendar ID")
+    credentials: Path | None = Field(
+        default=None, description="Path to Google service account JSON file"
+    )
+
+    @field_validator("membership", mode="before")
+    @classmethod
+    def _membership_from_name(cls, value: Any) -> Any:
+        """Accept membership types by name (e.g. MY_BEES_MEMBERS)."""
+        if isinstance(value, str) and value.upper() in MembershipType.__members__:
+            return MembershipType[value.upper()]
+        return value
+
+
+def load_profiles_from_file(profiles_path: Path) -> list[SyncProfile]:
+    """Load sync profiles from a JSON file.
+
+    The file holds a list of profiles. Relative credentials paths are resolved
+    against the directory containing the profiles file.
+
+    Args:
+        profiles_path: Path to the profiles JSON file
+
+    Returns:
+        List of SyncProfile objects, in file order
+
+    Raises:
+        FileNotFoundError: If the profiles file doesn't exist
+        pydantic.ValidationError: If the file is invalid JSON or a profile is invalid
+        ValueError: If the file has no profiles or profile names are not unique
+    """
+    logger.info(f"Loading sync profiles from {profiles_path}")
+
+    profiles = TypeAdapter(list[SyncProfile]).validate_json(profiles_path.read_text())
+    if not profiles:
+        raise ValueError(f"No profiles in {profiles_path}")
+
+    names = [profile.name for profile in profiles]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate profile names: {', '.join(duplicates)}")
+
+    for profile in profiles:
+        if profile.credentials is not None and not profile.credentials.is_absolute():
+            profile.credentials = profiles_path.parent / profile.credentials
+    return profiles
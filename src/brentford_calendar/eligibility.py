@@ -0,0 +1,137 @@
+"""Index of fixture on-sale windows for answering many eligibility queries."""
+
+import logging
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import datetime
+
+from brentford_calendar.models import (
+    CategoryWindow,
+    MembershipType,
+    OnsaleFixtureData,
+    ProcessedFixtureData,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FixtureEligibility:
+    """Earliest eligible on-sale window of one fixture for any membership and TAPs.
+
+    For each membership tier, the categories that tier can purchase are sorted
+    by TAPs threshold and paired with the running earliest window, so a lookup
+    is a binary search for the highest threshold the TAPs meet.
+    """
+
+    def __init__(self, processed: ProcessedFixtureData):
+        """Build the index for a fixture.
+
+        Args:
+            processed: Processed fixture data with all categories
+        """
+        self.processed = processed
+        self._thresholds: dict[MembershipType, list[int]] = {}
+        self._earliest: dict[MembershipType, list[CategoryWindow]] = {}
+
+        for membership in MembershipType:
+            candidates = sorted(
+                (
+                    (category.minimum_taps, index, category)
+                    for index, category in enumerate(processed.categories)
+                    if membership.can_purchase(category.membership_type)
+                ),
+                key=lambda candidate: candidate[:2],
+            )
+            thresholds: list[int] = []
+            earliest: list[CategoryWindow] = []
+            best_key: tuple[datetime, int] | None = None
+            for minimum_taps, index, category in candidates:
+                # Ties on date go to the category listed first, matching the
+                # stable sort in OnsaleFixtureData.from_processed_fixture_data
+                key = (category.on_sale_date, index)
+                if best_key is None or key < best_key:
+                    best_key, best = key, category
+                thresholds.append(minimum_taps)
+                earliest.append(best)
+            self._thresholds[membership] = thresholds
+            self._earliest[membership] = earliest
+
+    def earliest_window(
+        self, membership: MembershipType, taps: int
+    ) -> CategoryWindow | None:
+        """Find the earliest on-sale window a user is eligible for.
+
+        Args:
+            membership: User's membership type
+            taps: User's TAP count
+
+        Returns:
+            Earliest eligible CategoryWindow, or None if there is none
+        """
+        position = bisect_right(self._thresholds[membership], taps)
+        return self._earliest[membership][position - 1] if position else None
+
+    def onsale(self, membership: MembershipType, taps: int) -> OnsaleFixtureData | None:
+        """Get the fixture's on-sale data for a user.
+
+        Equivalent to OnsaleFixtureData.from_processed_fixture_data.
+
+        Args:
+            membership: User's membership type
+            taps: User's TAP count
+
+        Returns:
+            OnsaleFixtureData if any eligible categories exist, None otherwise
+        """
+        window = self.earliest_window(membership, taps)
+        if window is None:
+            return None
+        return OnsaleFixtureData(
+            general_fixture_data=self.processed.general_fixture_data,
+            onsale=window,
+        )
+
+
+class EligibilityIndex:
+    """Eligibility of every fixture in a scrape, built once and queried per user."""
+
+    def __init__(self, fixtures: Iterable[ProcessedFixtureData] = ()):
+        """Build the index.
+
+        Args:
+            fixtures: Processed fixtures to index
+        """
+        self.fixtures: list[FixtureEligibility] = []
+        for processed in fixtures:
+            self.add(processed)
+
+    def __len__(self) -> int:
+        """Get the number of indexed fixtures."""
+        return len(self.fixtures)
+
+    def add(self, processed: ProcessedFixtureData) -> None:
+        """Index another fixture.
+
+        Args:
+            processed: Processed fixture data with all categories
+        """
+        self.fixtures.append(FixtureEligibility(processed))
+
+    def onsale_fixtures(
+        self, membership: MembershipType, taps: int
+    ) -> list[OnsaleFixtureData]:
+        """Get the fixtures a user is eligible to buy, with their on-sale windows.
+
+        Args:
+            membership: User's membership type
+            taps: User's TAP count
+
+        Returns:
+            OnsaleFixtureData for each eligible fixture, in index order
+        """
+        onsale_fixtures = []
+        for fixture in self.fixtures:
+            onsale = fixture.onsale(membership, taps)
+            if onsale is not None:
+                onsale_fixtures.append(onsale)
+        return onsale_fixtures
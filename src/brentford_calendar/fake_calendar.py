@@ -0,0 +1,554 @@
+"""Local stand-in for the Google Calendar v3 events API.
+
+Serves the events endpoints the sync uses (list, get, insert, update, patch,
+delete and batch, including incremental sync tokens) over HTTP on localhost,
+with configurable latency, error injection and quota throttling. Point a
+client at it by setting GoogleCalendarConfig.api_endpoint (or --api-endpoint)
+to FakeCalendarServer.url.
+"""
+
+import argparse
+import copy
+import email.message
+import email.parser
+import json
+import logging
+import random
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import Counter
+from datetime import UTC, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SERVICE_PATH = "/calendar/v3/"
+BATCH_PATH = "/batch/calendar/v3"
+
+# Page sizes applied by the real API
+DEFAULT_PAGE_SIZE = 250
+MAX_PAGE_SIZE = 2500
+
+# Parameters the real API refuses to combine with a sync token
+SYNC_TOKEN_EXCLUSIVE_PARAMS = (
+    "iCalUID",
+    "orderBy",
+    "privateExtendedProperty",
+    "q",
+    "sharedExtendedProperty",
+    "timeMin",
+    "timeMax",
+    "updatedMin",
+)
+
+# API method for each HTTP method, with and without an event ID in the path
+API_METHODS = {
+    ("GET", False): "list",
+    ("POST", False): "insert",
+    ("GET", True): "get",
+    ("PUT", True): "update",
+    ("PATCH", True): "patch",
+    ("DELETE", True): "delete",
+}
+
+Response = tuple[int, dict[str, Any] | None]
+
+
+def _error(status: int, message: str, reason: str) -> Response:
+    """Build an error response in the format the Google APIs use."""
+    return status, {
+        "error": {
+            "code": status,
+            "message": message,
+            "errors": [{"domain": "global", "reason": reason, "message": message}],
+        }
+    }
+
+
+def _merge(target: dict[str, Any], patch: dict[str, Any]) -> None:
+    """Apply patch semantics, merging nested objects into the target."""
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+class FakeCalendarServer:
+    """In-memory Calendar v3 events API served from a background thread.
+
+    Events are stored per calendar, and any calendar ID is accepted. Deleted
+    events are kept as cancelled tombstones so incremental listings can
+    report them. Requests inside a batch are each subject to throttling and
+    error injection, as they are against the real quota.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        max_qps: float | None = None,
+        page_size: int = MAX_PAGE_SIZE,
+        seed: int = 0,
+    ):
+        """Initialize the server (call start() to serve requests).
+
+        Args:
+            latency: Delay before answering each HTTP request, in seconds
+            error_rate: Probability of answering a request with a 503
+            max_qps: Requests per second allowed before answering with 403
+                rateLimitExceeded, None for no limit
+            page_size: Largest page returned by list, whatever maxResults is
+            seed: Seed for the random errors
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_qps = max_qps
+        self.page_size = page_size
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._calendars: dict[str, dict[str, dict[str, Any]]] = {}
+        self._sequences: dict[tuple[str, str], int] = {}
+        self._sequence = 0
+        self._min_sync_sequence = 0
+        self._injected: list[int] = []
+        self._lost_responses = 0
+        self._tokens = max_qps or 0.0
+        self._refilled = time.monotonic()
+        self._lock = threading.RLock()
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Root URL to use as the API endpoint."""
+        if self._httpd is None:
+            raise RuntimeError("Server is not running")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}/"
+
+    def start(self, port: int = 0) -> "FakeCalendarServer":
+        """Start serving on localhost.
+
+        Args:
+            port: Port to listen on, 0 for any free port
+
+        Returns:
+            The server, for chaining
+        """
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="fake-calendar",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(f"Fake Calendar API listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeCalendarServer":
+        """Start the server for the duration of a with block."""
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the server."""
+        self.stop()
+
+    def inject_errors(self, status: int, count: int = 1) -> None:
+        """Answer the next requests with an error.
+
+        Args:
+            status: HTTP status to answer with, such as 500 or 429
+            count: Number of requests to fail
+        """
+        with self._lock:
+            self._injected.extend([status] * count)
+
+    def lose_responses(self, count: int = 1) -> None:
+        """Apply the next writes but answer them with a 503.
+
+        Simulates a write committed by the server whose response never reached
+        the client.
+
+        Args:
+            count: Number of writes whose response is lost
+        """
+        with self._lock:
+            self._lost_responses += count
+
+    def expire_sync_tokens(self) -> None:
+        """Invalidate every sync token issued so far, forcing a full sync."""
+        with self._lock:
+            self._min_sync_sequence = self._sequence
+
+    def events(self, calendar_id: str) -> list[dict[str, Any]]:
+        """Get the events in a calendar, excluding deleted events.
+
+        Args:
+            calendar_id: Calendar ID
+
+        Returns:
+            Copies of the stored events, in creation order
+        """
+        with self._lock:
+            return [
+                copy.deepcopy(event)
+                for event in self._calendars.get(calendar_id, {}).values()
+                if event["status"] != "cancelled"
+            ]
+
+    def _reject(self) -> Response | None:
+        """Decide whether to fail a request through injection or throttling."""
+        with self._lock:
+            if self._injected:
+                status = self._injected.pop(0)
+                if status in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.FORBIDDEN):
+                    return _error(status, "Rate Limit Exceeded", "rateLimitExceeded")
+                return _error(status, "Injected error", "backendError")
+            if self.error_rate and self._random.random() < self.error_rate:
+                return _error(503, "Service unavailable", "backendError")
+            if self.max_qps is not None:
+                now = time.monotonic()
+                self._tokens = min(
+                    max(self.max_qps, 1.0),
+                    self._tokens + (now - self._refilled) * self.max_qps,
+                )
+                self._refilled = now
+                if self._tokens < 1:
+                    return _error(403, "Rate Limit Exceeded", "rateLimitExceeded")
+                self._tokens -= 1
+        return None
+
+    def dispatch(self, method: str, target: str, body: bytes) -> Response:
+        """Handle a single (non-batch) API request.
+
+        Args:
+            method: HTTP method
+            target: Request path and query string
+            body: Request body
+
+        Returns:
+            Tuple of (HTTP status, JSON response or None for no content)
+        """
+        parsed = urllib.parse.urlsplit(target)
+        query = urllib.parse.parse_qs(parsed.query)
+        if not parsed.path.startswith(SERVICE_PATH):
+            return _error(404, "Not Found", "notFound")
+        parts = [
+            urllib.parse.unquote(part)
+            for part in parsed.path[len(SERVICE_PATH) :].split("/")
+        ]
+        if len(parts) < 3 or parts[0] != "calendars" or parts[2] != "events":
+            return _error(404, "Not Found", "notFound")
+        calendar_id = parts[1]
+        event_id = parts[3] if len(parts) == 4 else None
+
+        try:
+            payload = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            return _error(400, "Parse Error", "parseError")
+
+        name = API_METHODS.get((method, event_id is not None))
+        if name is None:
+            return _error(405, "Method Not Allowed", "methodNotAllowed")
+
+        with self._lock:
+            self.requests[name] += 1
+        rejected = self._reject()
+        if rejected is not None:
+            return rejected
+
+        with self._lock:
+            calendar = self._calendars.setdefault(calendar_id, {})
+            if name == "list":
+                return self._list(calendar_id, calendar, query)
+            if name == "get":
+                return self._get(calendar, event_id)
+            response = self._apply(name, calendar_id, calendar, event_id, payload)
+            if response[0] < 300 and self._lost_responses:
+                self._lost_responses -= 1
+                return _error(503, "Service unavailable", "backendError")
+            return response
+
+    def _get(
+        self, calendar: dict[str, dict[str, Any]], event_id: str | None
+    ) -> Response:
+        """Get a single event."""
+        assert event_id is not None
+        event = calendar.get(event_id)
+        if event is None:
+            return _error(404, "Not Found", "notFound")
+        if event["status"] == "cancelled":
+            return _error(410, "Resource has been deleted", "deleted")
+        return 200, copy.deepcopy(event)
+
+    def _apply(
+        self,
+        name: str,
+        calendar_id: str,
+        calendar: dict[str, dict[str, Any]],
+        event_id: str | None,
+        payload: dict[str, Any],
+    ) -> Response:
+        """Apply a write (insert, update, patch or delete) to a calendar."""
+        if name == "insert":
+            # Client-supplied IDs may not reuse any existing or deleted event's
+            if "id" in payload and payload["id"] in calendar:
+                return _error(
+                    409, "The requested identifier already exists.", "duplicate"
+                )
+            new_id = payload.get("id") or uuid.uuid4().hex
+            return self._write(calendar_id, calendar, new_id, payload)
+
+        get_response = self._get(calendar, event_id)
+        if get_response[0] != 200:
+            return get_response
+        assert event_id is not None
+        event = calendar[event_id]
+        if name == "update":
+            return self._write(calendar_id, calendar, event_id, payload)
+        if name == "patch":
+            patched = {
+                key: value
+                for key, value in copy.deepcopy(event).items()
+                if key not in ("kind", "etag", "created", "updated")
+            }
+            _merge(patched, payload)
+            return self._write(calendar_id, calendar, event_id, patched)
+        self._bump(calendar_id, event_id)
+        calendar[event_id] = {
+            "kind": "calendar#event",
+            "id": event_id,
+            "status": "cancelled",
+            "etag": self._etag(),
+        }
+        return 204, None
+
+    def _bump(self, calendar_id: str, event_id: str) -> None:
+        """Record a change to an event for incremental sync."""
+        self._sequence += 1
+        self._sequences[calendar_id, event_id] = self._sequence
+
+    def _etag(self) -> str:
+        """Get an ETag for the latest change."""
+        return f'"{self._sequence}"'
+
+    def _write(
+        self,
+        calendar_id: str,
+        calendar: dict[str, dict[str, Any]],
+        event_id: str,
+        body: dict[str, Any],
+    ) -> Response:
+        """Store an inserted or updated event."""
+        if "start" not in body or "end" not in body:
+            return _error(400, "Missing end time.", "required")
+        now = datetime.now(UTC).isoformat().replace("+00:00", "Z")
+        previous = calendar.get(event_id)
+        self._bump(calendar_id, event_id)
+        event = {
+            **copy.deepcopy(body),
+            "kind": "calendar#event",
+            "id": event_id,
+            "status": body.get("status", "confirmed"),
+            "etag": self._etag(),
+            "created": previous["created"] if previous else now,
+            "updated": now,
+        }
+        calendar[event_id] = event
+        return 200, copy.deepcopy(event)
+
+    def _list(
+        self,
+        calendar_id: str,
+        calendar: dict[str, dict[str, Any]],
+        query: dict[str, list[str]],
+    ) -> Response:
+        """List events, filtering by private extended properties and paging."""
+        sync_token = query.get("syncToken", [None])[0]
+        if sync_token is not None:
+            if any(param in query for param in SYNC_TOKEN_EXCLUSIVE_PARAMS):
+                return _error(400, "Invalid parameters with syncToken", "invalid")
+            try:
+                since = int(sync_token)
+            except ValueError:
+                return _error(400, "Invalid sync token", "invalid")
+            if since < self._min_sync_sequence:
+                return _error(410, "Sync token is no longer valid", "fullSyncRequired")
+            events = [
+                event
+                for event_id, event in calendar.items()
+                if self._sequences[calendar_id, event_id] > since
+            ]
+        else:
+            show_deleted = query.get("showDeleted", ["false"])[0] == "true"
+            events = [
+                event
+                for event in calendar.values()
+                if show_deleted or event["status"] != "cancelled"
+            ]
+
+        for condition in query.get("privateExtendedProperty", []):
+            key, _, value = condition.partition("=")
+            events = [
+                event
+                for event in events
+                if event.get("extendedProperties", {}).get("private", {}).get(key)
+                == value
+            ]
+
+        try:
+            max_results = int(query.get("maxResults", [DEFAULT_PAGE_SIZE])[0])
+            offset = int(query.get("pageToken", ["0"])[0])
+        except ValueError:
+            return _error(400, "Invalid value", "invalid")
+        page_size = min(max_results, MAX_PAGE_SIZE, self.page_size)
+        page = events[offset : offset + page_size]
+
+        response: dict[str, Any] = {
+            "kind": "calendar#events",
+            "items": copy.deepcopy(page),
+        }
+        if offset + page_size < len(events):
+            response["nextPageToken"] = str(offset + page_size)
+        else:
+            response["nextSyncToken"] = str(self._sequence)
+        return 200, response
+
+    def dispatch_batch(self, content_type: str, body: bytes) -> tuple[str, bytes]:
+        """Handle a multipart/mixed batch of API requests.
+
+        Args:
+            content_type: Content-Type of the batch, including its boundary
+            body: Batch request body
+
+        Returns:
+            Tuple of (response Content-Type, response body)
+        """
+        with self._lock:
+            self.requests["batch"] += 1
+        message = email.parser.BytesParser().parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body
+        )
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for part in message.get_payload():
+            assert isinstance(part, email.message.Message)
+            request_text = str(part.get_payload())
+            request_line, _, rest = request_text.partition("\n")
+            method, target, _ = request_line.strip().split(" ", 2)
+            inner = email.parser.Parser().parsestr(rest)
+            inner_body = str(inner.get_payload() or "")
+            status, response = self.dispatch(method, target, inner_body.encode())
+            content = json.dumps(response) if response is not None else ""
+            reason = HTTPStatus(status).phrase
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{str(part['Content-ID']).strip('<>')}>\r\n"
+                "\r\n"
+                f"HTTP/1.1 {status} {reason}\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n"
+                f"Content-Length: {len(content)}\r\n"
+                "\r\n"
+                f"{content}\r\n"
+            )
+        parts.append(f"--{boundary}--\r\n")
+        return f"multipart/mixed; boundary={boundary}", "".join(parts).encode()
+
+
+def _make_handler(server: FakeCalendarServer) -> type[BaseHTTPRequestHandler]:
+    """Create a request handler class serving a fake calendar."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately, which Nagle's algorithm
+        # would delay on kept-alive connections
+        disable_nagle_algorithm = True
+
+        def _handle(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            if server.latency:
+                time.sleep(server.latency)
+
+            if urllib.parse.urlsplit(self.path).path == BATCH_PATH:
+                content_type, content = server.dispatch_batch(
+                    self.headers.get("Content-Type", ""), body
+                )
+                status = 200
+            else:
+                status, response = server.dispatch(self.command, self.path, body)
+                content_type = "application/json; charset=UTF-8"
+                content = json.dumps(response).encode() if response is not None else b""
+
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def do_GET(self) -> None:  # noqa: N802
+            self._handle()
+
+        def do_POST(self) -> None:  # noqa: N802
+            self._handle()
+
+        def do_PUT(self) -> None:  # noqa: N802
+            self._handle()
+
+        def do_PATCH(self) -> None:  # noqa: N802
+            self._handle()
+
+        def do_DELETE(self) -> None:  # noqa: N802
+            self._handle()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(format % args)
+
+    return Handler
+
+
+def main() -> None:
+    """Serve a fake calendar until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds per request"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of requests failing"
+    )
+    parser.add_argument("--max-qps", type=float, help="Requests per second allowed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = FakeCalendarServer(
+        latency=args.latency, error_rate=args.error_rate, max_qps=args.max_qps
+    )
+    server.start(args.port)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
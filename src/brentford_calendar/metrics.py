@@ -0,0 +1,274 @@
+"""Lightweight timings and counters showing where a run spends its time."""
+
+import functools
+import json
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, ParamSpec, Protocol, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Prefix of every metric in the Prometheus textfile
+PROMETHEUS_PREFIX = "brentford_calendar"
+
+# Latency percentiles reported for each API method
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Get a percentile of sorted values using the nearest-rank method."""
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class RunMetrics:
+    """Stage durations, counters and API latencies collected during one run.
+
+    A single instance is shared by every thread in a run.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics, starting the run clock."""
+        self.timestamp = time.time()
+        self.durations: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self.latencies: dict[str, list[float]] = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_duration(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage.
+
+        Args:
+            stage: Name of the stage
+            seconds: Time spent, added to any earlier time in the stage
+        """
+        with self._lock:
+            self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increase a counter.
+
+        Args:
+            name: Name of the counter
+            amount: Amount to add
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe_api_call(self, method: str, seconds: float) -> None:
+        """Record a completed (or failed) API call.
+
+        Args:
+            method: API method, such as "list" or "batch"
+            seconds: Round trip time of the call
+        """
+        with self._lock:
+            self.latencies.setdefault(method, []).append(seconds)
+
+    def to_record(self) -> dict[str, Any]:
+        """Summarize the metrics as a JSON-serializable record.
+
+        Returns:
+            Dict of run timestamp and duration, stage durations, counters, and
+            API call counts and latency percentiles by method
+        """
+        with self._lock:
+            api_calls = {}
+            for method, latencies in sorted(self.latencies.items()):
+                ordered = sorted(latencies)
+                api_calls[method] = {
+                    "count": len(ordered),
+                    **{
+                        f"p{round(q * 100)}": _percentile(ordered, q)
+                        for q in PERCENTILES
+                    },
+                    "max": ordered[-1],
+                }
+            return {
+                "timestamp": self.timestamp,
+                "duration": time.perf_counter() - self._started,
+                "stages": dict(self.durations),
+                "counters": dict(self.counters),
+                "api_calls": api_calls,
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text, suitable for node_exporter's textfile collector
+        """
+        record = self.to_record()
+        name = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {name}_last_run_timestamp_seconds When the last run started",
+            f"# TYPE {name}_last_run_timestamp_seconds gauge",
+            f"{name}_last_run_timestamp_seconds {record['timestamp']}",
+            f"# HELP {name}_run_duration_seconds Duration of the last run",
+            f"# TYPE {name}_run_duration_seconds gauge",
+            f"{name}_run_duration_seconds {record['duration']}",
+            f"# HELP {name}_stage_duration_seconds Time spent in each stage",
+            f"# TYPE {name}_stage_duration_seconds gauge",
+        ]
+        for stage, seconds in sorted(record["stages"].items()):
+            lines.append(f'{name}_stage_duration_seconds{{stage="{stage}"}} {seconds}')
+        for counter, value in sorted(record["counters"].items()):
+            lines.append(f"# TYPE {name}_{counter} gauge")
+            lines.append(f"{name}_{counter} {value}")
+        lines += [
+            f"# HELP {name}_api_latency_seconds Calendar API round trip time",
+            f"# TYPE {name}_api_latency_seconds summary",
+        ]
+        for method, stats in record["api_calls"].items():
+            for q in PERCENTILES:
+                lines.append(
+                    f'{name}_api_latency_seconds{{method="{method}",quantile="{q}"}} '
+                    f"{stats[f'p{round(q * 100)}']}"
+                )
+            lines.append(
+                f'{name}_api_latency_seconds_sum{{method="{method}"}} '
+                f"{sum(self.latencies[method])}"
+            )
+            lines.append(
+                f'{name}_api_latency_seconds_count{{method="{method}"}} '
+                f"{stats['count']}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: Path) -> None:
+        """Append the run's record to a JSON Lines file.
+
+        Args:
+            path: File to append to, created if missing
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a") as f:
+            f.write(json.dumps(self.to_record()) + "\n")
+
+    def write_prometheus(self, path: Path) -> None:
+        """Atomically write the metrics as a Prometheus textfile.
+
+        Args:
+            path: File to write, replacing the previous run's metrics
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(self.to_prometheus())
+        tmp_path.replace(path)
+
+
+class SpanListener(Protocol):
+    """Notified as spans start and end, for example to profile each stage."""
+
+    def enter(self, stage: str) -> None:
+        """Handle a span starting."""
+
+    def exit(self, stage: str) -> None:
+        """Handle a span ending."""
+
+
+_current = RunMetrics()
+_listeners: list[SpanListener] = []
+
+
+def current() -> RunMetrics:
+    """Get the metrics being collected for the current run.
+
+    Returns:
+        The current RunMetrics
+    """
+    return _current
+
+
+def reset() -> RunMetrics:
+    """Start collecting metrics for a new run.
+
+    Returns:
+        The new, empty RunMetrics
+    """
+    global _current
+    _current = RunMetrics()
+    return _current
+
+
+def add_listener(listener: SpanListener) -> None:
+    """Start notifying a listener of spans.
+
+    Args:
+        listener: Listener to add
+    """
+    _listeners.append(listener)
+
+
+def remove_listener(listener: SpanListener) -> None:
+    """Stop notifying a listener of spans.
+
+    Args:
+        listener: Listener to remove
+    """
+    _listeners.remove(listener)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a block of code, adding its duration to a stage.
+
+    Args:
+        stage: Name of the stage
+    """
+    for listener in _listeners:
+        listener.enter(stage)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _current.add_duration(stage, time.perf_counter() - start)
+        for listener in reversed(_listeners):
+            listener.exit(stage)
+
+
+def timed(stage: str) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """Decorate a function so its calls add their duration to a stage.
+
+    Args:
+        stage: Name of the stage
+
+    Returns:
+        Decorator
+    """
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def increment(name: str, amount: int = 1) -> None:
+    """Increase a counter in the current run's metrics.
+
+    Args:
+        name: Name of the counter
+        amount: Amount to add
+    """
+    _current.increment(name, amount)
+
+
+def observe_api_call(method: str, seconds: float) -> None:
+    """Record an API call in the current run's metrics.
+
+    Args:
+        method: API method, such as "list" or "batch"
+        seconds: Round trip time of the call
+    """
+    _current.observe_api_call(method, seconds)
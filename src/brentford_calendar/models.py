@@ -1,13 +1,16 @@
 """Data models for Brentford FC fixture ticketing."""
 
+import functools
 import logging
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 
 from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
 
+from brentford_calendar import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,12 +39,58 @@ class MembershipType(str, Enum):
         Returns:
             True if this membership can purchase from that category
         """
-        hierarchy = {
-            MembershipType.SEASON_TICKET: 3,
-            MembershipType.MY_BEES_MEMBERS: 2,
-            MembershipType.MEMBERS: 1,
-        }
-        return hierarchy[self] >= hierarchy[category_type]
+        return MEMBERSHIP_RANKS[self] >= MEMBERSHIP_RANKS[category_type]
+
+
+# Rank of each membership tier, higher tiers purchasing from lower ones
+MEMBERSHIP_RANKS = {
+    MembershipType.SEASON_TICKET: 3,
+    MembershipType.MY_BEES_MEMBERS: 2,
+    MembershipType.MEMBERS: 1,
+}
+
+
+# Minimum TAPs in a category label (handles commas like "1,760+")
+TAPS_PATTERN = re.compile(r"([\d,]+)\+\s*TAPS?", re.IGNORECASE)
+
+# Category label patterns and the membership they require, checked in order
+CATEGORY_LABEL_RULES: tuple[tuple[re.Pattern[str], MembershipType], ...] = (
+    (re.compile("my bees", re.IGNORECASE), MembershipType.MY_BEES_MEMBERS),
+    (re.compile("members", re.IGNORECASE), MembershipType.MEMBERS),
+    (re.compile("season ticket", re.IGNORECASE), MembershipType.SEASON_TICKET),
+    (re.compile("previous purchaser", re.IGNORECASE), MembershipType.MEMBERS),
+)
+
+
+@functools.lru_cache(maxsize=256)
+def parse_category_label(label: str) -> tuple[MembershipType, int]:
+    """Parse a category label to extract membership type and minimum TAPs.
+
+    The site reuses a handful of labels across every fixture, so results are
+    cached; parse_category_label.cache_info() reports the hit rate. Because
+    only misses reach the parser, each unrecognised label is logged once.
+
+    Args:
+        label: Category label like "My Bees members with 500+ TAPs"
+
+    Returns:
+        Tuple of (membership_type, minimum_taps)
+
+    Raises:
+        ValueError: If the label is empty
+    """
+    if not label:
+        raise ValueError("Empty category label")
+
+    taps_match = TAPS_PATTERN.search(label)
+    minimum_taps = int(taps_match.group(1).replace(",", "")) if taps_match else 0
+
+    for pattern, membership_type in CATEGORY_LABEL_RULES:
+        if pattern.search(label):
+            return membership_type, minimum_taps
+
+    logger.warning("Unrecognised category label %r, defaulting to MEMBERS", label)
+    return MembershipType.MEMBERS, minimum_taps
 
 
 class Link(CamelCaseAliasBaseModel):
@@ -139,36 +188,10 @@ class ProcessedFixtureData(CamelCaseAliasBaseModel):
         Returns:
             Tuple of (membership_type, minimum_taps)
         """
-        if not label:
-            raise ValueError("Empty category label")
-
-        # Extract TAPs if present (handles commas like "1,760+")
-        taps_match = re.search(r"([\d,]+)\+\s*TAPS?", label, re.IGNORECASE)
-        minimum_taps = 0
-        if taps_match:
-            # Remove commas and convert to int
-            minimum_taps = int(taps_match.group(1).replace(",", ""))
-
-        # Determine membership type
-        label_lower = label.lower()
-
-        if "my bees" in label_lower:
-            membership_type = MembershipType.MY_BEES_MEMBERS
-        elif "members" in label_lower:
-            membership_type = MembershipType.MEMBERS
-        elif "season ticket" in label_lower:
-            membership_type = MembershipType.SEASON_TICKET
-        elif "previous purchaser" in label_lower:
-            membership_type = MembershipType.MEMBERS
-        else:
-            logger.warning(
-                "Unrecognised category label %r, defaulting to MEMBERS", label
-            )
-            membership_type = MembershipType.MEMBERS
-
-        return membership_type, minimum_taps
+        return parse_category_label(label)
 
     @staticmethod
+    @metrics.timed("process")
     def from_fixture_data(fixture: FixtureData) -> "ProcessedFixtureData":
         """Convert raw FixtureData to ProcessedFixtureData with parsed categories.
 
@@ -209,9 +232,7 @@ class ProcessedFixtureData(CamelCaseAliasBaseModel):
             if not label or not event_id:
                 continue
 
-            membership_type, minimum_taps = ProcessedFixtureData._parse_category_label(
-                label
-            )
+            membership_type, minimum_taps = parse_category_label(label)
 
             categories.append(
                 CategoryWindow(
@@ -234,6 +255,7 @@ class ProcessedFixtureData(CamelCaseAliasBaseModel):
             find_out_more_link=fixture.find_out_more_link,
         )
 
+        metrics.increment("fixtures_processed")
         return ProcessedFixtureData(
             general_fixture_data=general_fixture_data,
             categories=categories,
@@ -333,8 +355,6 @@ class OnsaleFixtureData(CamelCaseAliasBaseModel):
         description = "\n".join(description_lines)
 
         # Use onsale date as event start time
-        from datetime import timedelta
-
         start_time = self.onsale.on_sale_date
         end_time = start_time + timedelta(hours=1)
 
@@ -0,0 +1,110 @@
+"""Serialisable plans of the changes a sync would make to a calendar."""
+
+import logging
+from collections import Counter
+from enum import Enum
+from pathlib import Path
+
+from pydantic import BaseModel, TypeAdapter
+
+from brentford_calendar.models import CalendarEventData
+
+logger = logging.getLogger(__name__)
+
+
+class PlanAction(str, Enum):
+    """Change a sync would make to an event."""
+
+    CREATE = "create"
+    UPDATE = "update"
+    UNCHANGED = "unchanged"
+    DELETE = "delete"
+
+
+class PlannedChange(BaseModel):
+    """A single planned change to a managed event."""
+
+    action: PlanAction
+    source_id: str
+    summary: str | None = None
+    event_id: str | None = None
+    event: CalendarEventData | None = None
+
+
+class SyncPlan(BaseModel):
+    """Changes a sync would make to one calendar."""
+
+    profile: str
+    calendar_id: str
+    changes: list[PlannedChange]
+
+    def counts(self) -> Counter[PlanAction]:
+        """Count the planned changes by action.
+
+        Returns:
+            Counter of PlanAction to number of changes
+        """
+        return Counter(change.action for change in self.changes)
+
+    def deletions(self) -> dict[str, str]:
+        """Get the events the plan would delete.
+
+        Returns:
+            Mapping of source_id to event ID
+        """
+        return {
+            change.source_id: change.event_id
+            for change in self.changes
+            if change.action is PlanAction.DELETE and change.event_id is not None
+        }
+
+    def describe(self) -> list[str]:
+        """Describe the plan for display.
+
+        Returns:
+            One line per create, update and delete, then a summary line
+        """
+        lines = [
+            f"  {change.action.value:<7} {change.summary or change.source_id}"
+            for change in self.changes
+            if change.action is not PlanAction.UNCHANGED
+        ]
+        counts = self.counts()
+        lines.append(
+            f"Plan: {counts[PlanAction.CREATE]} to create, "
+            f"{counts[PlanAction.UPDATE]} to update, "
+            f"{counts[PlanAction.UNCHANGED]} unchanged, "
+            f"{counts[PlanAction.DELETE]} to delete"
+        )
+        return lines
+
+
+_PLANS_ADAPTER = TypeAdapter(list[SyncPlan])
+
+
+def save_plans(path: Path, plans: list[SyncPlan]) -> None:
+    """Write sync plans to a JSON file.
+
+    Args:
+        path: Path to the plan file
+        plans: Plans to write, one per calendar
+    """
+    path.write_bytes(_PLANS_ADAPTER.dump_json(plans, indent=2))
+    logger.info(f"Wrote {len(plans)} sync plans to {path}")
+
+
+def load_plans(path: Path) -> list[SyncPlan]:
+    """Read sync plans from a JSON file.
+
+    Args:
+        path: Path to the plan file
+
+    Returns:
+        Plans in the file, one per calendar
+
+    Raises:
+        pydantic.ValidationError: If the file is not a valid plan file
+    """
+    plans = _PLANS_ADAPTER.validate_json(path.read_bytes())
+    logger.info(f"Read {len(plans)} sync plans from {path}")
+    return plans
@@ -0,0 +1,150 @@
+"""Per-stage profiling of a run, for capturing evidence of regressions."""
+
+import cProfile
+import logging
+import pstats
+import threading
+import tracemalloc
+from pathlib import Path
+
+from brentford_calendar import metrics
+
+logger = logging.getLogger(__name__)
+
+# Stage each metrics span is profiled under
+PROFILE_STAGES = {
+    "fetch": "scrape",
+    "parse": "extract",
+    "validate": "extract",
+    "process": "process",
+    "eligibility": "process",
+    "sync": "sync",
+}
+
+# Number of functions listed in each stage's text report
+REPORT_LIMIT = 40
+
+
+class StageProfiler:
+    """Profiles each stage of a run with its own cProfile profile.
+
+    Stages are delimited by the metrics spans, so a stage is profiled wherever
+    it runs, including when streaming interleaves scraping and processing.
+    Only the thread that started the profiler is profiled.
+    """
+
+    def __init__(
+        self, directory: Path, trace_memory: bool = False, top_allocations: int = 10
+    ):
+        """Initialize the profiler.
+
+        Args:
+            directory: Directory to write the profiles to
+            trace_memory: Whether to also trace memory allocations with
+                tracemalloc
+            top_allocations: Number of allocation sites to report
+        """
+        self.directory = directory
+        self.trace_memory = trace_memory
+        self.top_allocations = top_allocations
+        self.profiles: dict[str, cProfile.Profile] = {}
+        self.peaks: dict[str, int] = {}
+        self._stack: list[str] = []
+        self._thread_id = threading.get_ident()
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+    def _stage(self, span: str) -> str | None:
+        """Get the stage to profile a span under, None to ignore it."""
+        if threading.get_ident() != self._thread_id:
+            return None
+        return PROFILE_STAGES.get(span)
+
+    def enter(self, span: str) -> None:
+        """Switch profiling to the stage of a span that is starting.
+
+        Args:
+            span: Name of the metrics span
+        """
+        stage = self._stage(span)
+        if stage is None:
+            return
+        current = self._stack[-1] if self._stack else None
+        if stage != current:
+            if current is not None:
+                self.profiles[current].disable()
+            if stage not in self.profiles:
+                self.profiles[stage] = cProfile.Profile()
+            self.profiles[stage].enable()
+            if self.trace_memory:
+                tracemalloc.reset_peak()
+        self._stack.append(stage)
+
+    def exit(self, span: str) -> None:
+        """Switch profiling back to the enclosing stage of a span that ended.
+
+        Args:
+            span: Name of the metrics span
+        """
+        stage = self._stage(span)
+        if stage is None:
+            return
+        self._stack.pop()
+        if self._stack and self._stack[-1] == stage:
+            return
+        self.profiles[stage].disable()
+        if self.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.peaks[stage] = max(self.peaks.get(stage, 0), peak)
+        if self._stack:
+            self.profiles[self._stack[-1]].enable()
+
+    def start(self) -> None:
+        """Start profiling the stages of the run."""
+        if self.trace_memory:
+            tracemalloc.start()
+        metrics.add_listener(self)
+
+    def stop(self) -> None:
+        """Stop profiling, and write a report for each stage profiled."""
+        metrics.remove_listener(self)
+        while self._stack:
+            self.profiles[self._stack.pop()].disable()
+        if self.trace_memory:
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(
+                [
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, __file__),
+                ]
+            )
+            tracemalloc.stop()
+        self.write()
+
+    def write(self) -> None:
+        """Write each stage's pstats file and text report, and the memory report.
+
+        Each stage is written to <stage>.pstats (for pstats or snakeviz) and
+        <stage>.txt (the most expensive functions by cumulative time).
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for stage, profile in self.profiles.items():
+            profile.dump_stats(self.directory / f"{stage}.pstats")
+            with (self.directory / f"{stage}.txt").open("w") as f:
+                stats = pstats.Stats(profile, stream=f)
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_LIMIT)
+        if self.trace_memory:
+            (self.directory / "memory.txt").write_text(self._memory_report())
+        logger.info(
+            f"Wrote profiles of {len(self.profiles)} stages to {self.directory}"
+        )
+
+    def _memory_report(self) -> str:
+        """Describe the peak traced memory of each stage and the top allocations."""
+        lines = ["Peak traced memory by stage:"]
+        for stage, peak in self.peaks.items():
+            lines.append(f"  {stage:<8} {peak / 1024:,.1f} KiB")
+        if self._snapshot is not None:
+            lines.append("")
+            lines.append("Largest allocation sites still live at the end of the run:")
+            for stat in self._snapshot.statistics("lineno")[: self.top_allocations]:
+                lines.append(f"  {stat}")
+        return "\n".join(lines) + "\n"
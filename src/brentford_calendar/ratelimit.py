@@ -0,0 +1,53 @@
+"""Rate limiting for Google Calendar API requests."""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at a fixed rate up to a maximum burst capacity.
+    Acquiring more tokens than are available reserves them anyway and sleeps
+    until the deficit has refilled, so concurrent callers are served in order.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum number of tokens (burst size), defaults to rate
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Take tokens from the bucket, blocking until they are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Time spent waiting, in seconds
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+
+        if wait > 0:
+            logger.debug(f"Rate limited, waiting {wait:.2f}s")
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,163 @@
+"""Quota-aware retry and backoff for Google Calendar API requests."""
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+from typing import Any, TypeVar
+
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# 403 reasons Google uses for quota throttling rather than permission errors
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+def is_throttle(error: Exception) -> bool:
+    """Check whether an error is the API throttling requests.
+
+    Args:
+        error: Exception raised by a request
+
+    Returns:
+        True for 429 responses and 403 rate limit errors
+    """
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 429:
+        return True
+    if error.resp.status != 403:
+        return False
+    details: list[Any] = (
+        error.error_details if isinstance(error.error_details, list) else []
+    )
+    reasons = {detail.get("reason") for detail in details if isinstance(detail, dict)}
+    return bool(reasons & RATE_LIMIT_REASONS)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether a failed request may succeed if retried.
+
+    Args:
+        error: Exception raised by a request
+
+    Returns:
+        True for throttling, transient server errors and connection errors
+    """
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRYABLE_STATUSES or is_throttle(error)
+    return isinstance(error, OSError)
+
+
+def retry_after(error: Exception) -> float | None:
+    """Get the delay requested by an error's Retry-After header.
+
+    Args:
+        error: Exception raised by a request
+
+    Returns:
+        Delay in seconds, or None if the header is absent or invalid
+    """
+    if not isinstance(error, HttpError):
+        return None
+    value = error.resp.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter and a per-run retry budget.
+
+    A single policy is shared by every client in a run (including worker
+    threads), so the budget and throttle counts cover the whole run.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 32.0,
+        budget: int = 50,
+    ):
+        """Initialize the retry policy.
+
+        Args:
+            max_attempts: Maximum attempts per request, including the first
+            base_delay: Backoff ceiling for the first retry, in seconds
+            max_delay: Maximum backoff ceiling, in seconds
+            budget: Maximum number of retries across the whole run
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retries = 0
+        self.throttles = 0
+        self._lock = threading.Lock()
+
+    def record_failure(self, error: Exception, attempt: int) -> float | None:
+        """Record a failed attempt and decide whether to retry it.
+
+        Args:
+            error: Exception raised by the attempt
+            attempt: Number of attempts made so far (starting at 1)
+
+        Returns:
+            Delay in seconds before retrying, or None to give up
+        """
+        with self._lock:
+            if is_throttle(error):
+                self.throttles += 1
+            if not is_retryable(error) or attempt >= self.max_attempts:
+                return None
+            if self.retries >= self.budget:
+                logger.warning("Retry budget exhausted, not retrying")
+                return None
+            self.retries += 1
+
+        delay = retry_after(error)
+        if delay is None:
+            ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+            delay = random.uniform(0, ceiling)
+        logger.warning(f"Request failed ({error}), retrying in {delay:.1f}s")
+        return delay
+
+    def call(self, func: Callable[[], T]) -> T:
+        """Call a function, retrying retryable failures with backoff.
+
+        Args:
+            func: Function performing the request
+
+        Returns:
+            The function's result
+
+        Raises:
+            Exception: The last error, once it is not retryable or retries
+                are exhausted
+        """
+        attempt = 1
+        while True:
+            try:
+                return func()
+            except (HttpError, OSError) as e:
+                delay = self.record_failure(e, attempt)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
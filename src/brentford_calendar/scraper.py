@@ -1,25 +1,103 @@
 """Web scraper for Brentford FC ticket information."""
 
+import codecs
+import hashlib
 import html
 import json
 import logging
+from collections.abc import Iterable, Iterator
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING
 
-import requests
-from bs4 import BeautifulSoup
+from pydantic import TypeAdapter, ValidationError
 
+from brentford_calendar import metrics
+from brentford_calendar.cache import CachedPage, PageCache
 from brentford_calendar.models import FixtureData
 
+# requests and bs4 are imported where used, as they are slow to import
+if TYPE_CHECKING:
+    import requests
+
 logger = logging.getLogger(__name__)
 
 TICKETING_URL = "https://www.brentfordfc.com/en/ticket-information"
 
+# data-component of the divs holding fixture ticketing data
+FIXTURE_COMPONENT = "FixtureTicketingModule"
+
+# Statuses worth retrying at the transport level
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_default_session: "requests.Session | None" = None
+
+# Validates a JSON array of fixtures straight from the raw JSON text
+_FIXTURE_LIST_ADAPTER = TypeAdapter(list[FixtureData])
+
+
+def create_session(
+    pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.5
+) -> "requests.Session":
+    """Create an HTTP session with connection pooling, compression and retries.
+
+    Connections are kept alive and reused across requests. Accept-Encoding
+    advertises every encoding urllib3 can decode (brotli and zstd when their
+    optional packages are installed).
+
+    Args:
+        pool_size: Maximum number of pooled connections per host
+        retries: Maximum number of retries for failed GET requests
+        backoff_factor: Exponential backoff factor between retries, in seconds
+
+    Returns:
+        Configured requests Session
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.request import ACCEPT_ENCODING
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+
+def get_session() -> "requests.Session":
+    """Get the shared default session, creating it on first use.
+
+    Returns:
+        Default requests Session
+    """
+    global _default_session
+    if _default_session is None:
+        _default_session = create_session()
+    return _default_session
+
 
-def fetch_page(url: str = TICKETING_URL, timeout: int = 30) -> str:
+@metrics.timed("fetch")
+def fetch_page(
+    url: str = TICKETING_URL,
+    timeout: int = 30,
+    session: "requests.Session | None" = None,
+) -> str:
     """Fetch HTML content from the given URL.
 
     Args:
         url: The URL to fetch (defaults to Brentford ticketing page)
         timeout: Request timeout in seconds
+        session: Session to fetch with (defaults to the shared session)
 
     Returns:
         HTML content as string
@@ -28,17 +106,231 @@ def fetch_page(url: str = TICKETING_URL, timeout: int = 30) -> str:
         requests.RequestException: If the request fails
     """
     logger.info(f"Fetching page from {url}")
-    response = requests.get(url, timeout=timeout)
+    response = (session or get_session()).get(url, timeout=timeout)
     response.raise_for_status()
     logger.debug(f"Received {len(response.text)} bytes")
+    metrics.increment("bytes_fetched", len(response.content))
     return response.text
 
 
+@metrics.timed("fetch")
+def fetch_page_conditional(
+    cache: PageCache,
+    url: str = TICKETING_URL,
+    timeout: int = 30,
+    session: "requests.Session | None" = None,
+) -> CachedPage:
+    """Fetch HTML content, revalidating a cached copy if there is one.
+
+    Sends If-None-Match/If-Modified-Since using the cached validators and
+    returns the cached copy on 304 Not Modified. Fresh responses are cached.
+
+    Args:
+        cache: Cache of previously fetched pages
+        url: The URL to fetch (defaults to Brentford ticketing page)
+        timeout: Request timeout in seconds
+        session: Session to fetch with (defaults to the shared session)
+
+    Returns:
+        CachedPage with the content and its hash
+
+    Raises:
+        requests.RequestException: If the request fails
+    """
+    cached = cache.load(url)
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    logger.info(f"Fetching page from {url}")
+    response = (session or get_session()).get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cached is not None:
+        logger.info("Page not modified since last fetch")
+        return cached
+
+    response.raise_for_status()
+    logger.debug(f"Received {len(response.text)} bytes")
+    metrics.increment("bytes_fetched", len(response.content))
+    page = CachedPage(
+        content=response.text,
+        content_hash=hashlib.sha256(response.content).hexdigest(),
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    cache.save(url, page)
+    return page
+
+
+class FixturePropsParser(HTMLParser):
+    """Event-driven scanner collecting the data-props of fixture module divs.
+
+    Unlike a DOM parser it keeps no tree, so it can be fed the document in
+    chunks and collects each module's props as soon as its start tag is seen.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        super().__init__(convert_charrefs=True)
+        self.props: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        """Collect data-props from fixture module divs."""
+        if tag != "div":
+            return
+        # Like html5lib, the first occurrence of a duplicated attribute wins
+        attributes: dict[str, str | None] = {}
+        for name, value in attrs:
+            attributes.setdefault(name, value)
+        if attributes.get("data-component") == FIXTURE_COMPONENT:
+            self.props.append(attributes.get("data-props") or "")
+
+
+@metrics.timed("parse")
+def _scan_fixture_props(html_content: str) -> list[str]:
+    """Find the data-props of every fixture module in a single streaming pass.
+
+    Args:
+        html_content: Raw HTML content
+
+    Returns:
+        Attribute value of each module's data-props ("" if absent)
+    """
+    parser = FixturePropsParser()
+    parser.feed(html_content)
+    parser.close()
+    return parser.props
+
+
+@metrics.timed("parse")
+def _soup_fixture_props(html_content: str) -> list[str]:
+    """Find the data-props of every fixture module by building a full DOM.
+
+    Slow, but tolerant of any markup html5lib can parse.
+
+    Args:
+        html_content: Raw HTML content
+
+    Returns:
+        Attribute value of each module's data-props ("" if absent)
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html5lib")
+    fixture_divs = soup.find_all("div", {"data-component": FIXTURE_COMPONENT})
+    return [str(div.get("data-props", "")) for div in fixture_divs]
+
+
+def _decode_fixture_props(raw_props: str) -> str | None:
+    """Decode the HTML entities (&quot; -> ") in a module's data-props.
+
+    Args:
+        raw_props: Attribute value of the module's data-props
+
+    Returns:
+        JSON text of the fixture, or None if the module has no props
+    """
+    if not raw_props:
+        logger.warning("Found div without data-props, skipping")
+        return None
+    return html.unescape(raw_props)
+
+
+def _validate_fixture_json(decoded_props: str) -> FixtureData:
+    """Validate one fixture's JSON text into FixtureData in a single pass.
+
+    Args:
+        decoded_props: JSON text of the fixture
+
+    Returns:
+        FixtureData
+
+    Raises:
+        json.JSONDecodeError: If JSON parsing fails
+        pydantic.ValidationError: If fixture data doesn't match schema
+    """
+    try:
+        return FixtureData.model_validate_json(decoded_props)
+    except ValidationError as e:
+        if not any(error["type"] == "json_invalid" for error in e.errors()):
+            raise
+        # Re-parse with json to raise (and report) a JSONDecodeError
+        try:
+            json.loads(decoded_props)
+        except json.JSONDecodeError as json_error:
+            logger.error(f"Failed to parse JSON from data-props: {json_error}")
+            logger.debug(f"Raw data: {decoded_props[:200]}...")
+            raise
+        raise
+
+
+@metrics.timed("validate")
+def _parse_fixture_props(raw_props: str) -> FixtureData | None:
+    """Parse one fixture module's data-props into FixtureData.
+
+    Args:
+        raw_props: Attribute value of the module's data-props
+
+    Returns:
+        FixtureData, or None if the module has no props
+
+    Raises:
+        json.JSONDecodeError: If JSON parsing fails
+        pydantic.ValidationError: If fixture data doesn't match schema
+    """
+    decoded_props = _decode_fixture_props(raw_props)
+    if decoded_props is None:
+        return None
+    fixture = _validate_fixture_json(decoded_props)
+    logger.debug(f"Parsed fixture: {fixture.title}")
+    return fixture
+
+
+@metrics.timed("validate")
+def _parse_all_fixture_props(fixture_props: list[str]) -> list[FixtureData]:
+    """Parse every fixture module's data-props with one validation call.
+
+    The decoded props are joined into a single JSON array and validated by
+    pydantic's JSON parser, skipping the intermediate dicts. If that fails,
+    each fixture is parsed on its own so the error names the culprit.
+
+    Args:
+        fixture_props: Attribute value of each module's data-props
+
+    Returns:
+        List of FixtureData objects, in module order
+
+    Raises:
+        json.JSONDecodeError: If JSON parsing fails for any fixture
+        pydantic.ValidationError: If fixture data doesn't match schema
+    """
+    decoded = [
+        decoded_props
+        for decoded_props in map(_decode_fixture_props, fixture_props)
+        if decoded_props is not None
+    ]
+    try:
+        fixtures = _FIXTURE_LIST_ADAPTER.validate_json(f"[{','.join(decoded)}]")
+    except ValidationError:
+        fixtures = None
+    # A count mismatch means some props were not a single JSON value
+    if fixtures is None or len(fixtures) != len(decoded):
+        fixtures = [_validate_fixture_json(decoded_props) for decoded_props in decoded]
+    for fixture in fixtures:
+        logger.debug(f"Parsed fixture: {fixture.title}")
+    metrics.increment("fixtures_parsed", len(fixtures))
+    return fixtures
+
+
 def extract_fixtures(html_content: str) -> list[FixtureData]:
     """Extract fixture ticketing data from HTML.
 
-    Parses HTML to find all divs with data-component="FixtureTicketingModule",
-    decodes the HTML entities in data-props, and parses the JSON data.
+    Finds all divs with data-component="FixtureTicketingModule", decodes the
+    HTML entities in data-props, and validates the JSON data. The document is
+    scanned with a lightweight streaming parser; if that finds no modules even
+    though the page mentions them, it falls back to a full html5lib parse.
 
     Args:
         html_content: Raw HTML content
@@ -51,34 +343,124 @@ def extract_fixtures(html_content: str) -> list[FixtureData]:
         pydantic.ValidationError: If fixture data doesn't match schema
     """
     logger.info("Parsing HTML for fixture data")
-    soup = BeautifulSoup(html_content, "html5lib")
+    fixture_props = _scan_fixture_props(html_content)
+    if not fixture_props and FIXTURE_COMPONENT in html_content:
+        logger.warning("Streaming scan found no fixture modules, parsing full DOM")
+        fixture_props = _soup_fixture_props(html_content)
+    logger.info(f"Found {len(fixture_props)} fixture modules")
 
-    # Find all FixtureTicketingModule divs
-    fixture_divs = soup.find_all("div", {"data-component": "FixtureTicketingModule"})
-    logger.info(f"Found {len(fixture_divs)} fixture modules")
+    fixtures = _parse_all_fixture_props(fixture_props)
 
-    fixtures = []
-    for div in fixture_divs:
-        raw_props = div.get("data-props", "")
-        if not raw_props:
-            logger.warning("Found div without data-props, skipping")
-            continue
+    logger.info(f"Successfully parsed {len(fixtures)} fixtures")
+    return fixtures
 
-        # Decode HTML entities (&quot; -> ")
-        decoded_props = html.unescape(raw_props)
 
-        try:
-            fixture_dict = json.loads(decoded_props)
-            fixture = FixtureData.model_validate(fixture_dict)
-            fixtures.append(fixture)
-            logger.debug(f"Parsed fixture: {fixture.title}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON from data-props: {e}")
-            logger.debug(f"Raw data: {decoded_props[:200]}...")
-            raise
+def iter_fixtures(
+    chunks: Iterable[bytes], encoding: str = "utf-8"
+) -> Iterator[FixtureData]:
+    """Incrementally extract fixtures from a document arriving in chunks.
 
-    logger.info(f"Successfully parsed {len(fixtures)} fixtures")
-    return fixtures
+    Each fixture is yielded as soon as its module's start tag has been
+    received, so callers can process fixtures while the rest of the document
+    is still downloading. Unlike extract_fixtures, there is no full DOM
+    fallback.
+
+    Args:
+        chunks: Raw document bytes, in order
+        encoding: Character encoding of the document
+
+    Yields:
+        FixtureData objects, in document order
+
+    Raises:
+        json.JSONDecodeError: If JSON parsing fails for any fixture
+        pydantic.ValidationError: If fixture data doesn't match schema
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    parser = FixturePropsParser()
+    found = 0
+
+    def drain() -> Iterator[FixtureData]:
+        nonlocal found
+        fixture_props, parser.props = parser.props, []
+        found += len(fixture_props)
+        for raw_props in fixture_props:
+            fixture = _parse_fixture_props(raw_props)
+            if fixture is not None:
+                metrics.increment("fixtures_parsed")
+                yield fixture
+
+    for chunk in chunks:
+        with metrics.span("parse"):
+            parser.feed(decoder.decode(chunk))
+        yield from drain()
+    with metrics.span("parse"):
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    yield from drain()
+    logger.info(f"Found {found} fixture modules")
+
+
+def fetch_page_chunks(
+    url: str = TICKETING_URL,
+    timeout: int = 30,
+    session: "requests.Session | None" = None,
+    chunk_size: int = 16 * 1024,
+) -> Iterator[bytes]:
+    """Stream the body of a page as it downloads.
+
+    Args:
+        url: The URL to fetch (defaults to Brentford ticketing page)
+        timeout: Request timeout in seconds
+        session: Session to fetch with (defaults to the shared session)
+        chunk_size: Maximum size of each chunk in bytes
+
+    Yields:
+        Chunks of the (decompressed) response body
+
+    Raises:
+        requests.RequestException: If the request fails
+    """
+    logger.info(f"Streaming page from {url}")
+    with metrics.span("fetch"):
+        request = (session or get_session()).get(url, timeout=timeout, stream=True)
+    with request as response:
+        response.raise_for_status()
+        chunks = response.iter_content(chunk_size=chunk_size)
+        received = 0
+        while True:
+            # Only time waiting for the network, not the consumer of each chunk
+            with metrics.span("fetch"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            received += len(chunk)
+            yield chunk
+    logger.debug(f"Received {received} bytes")
+    metrics.increment("bytes_fetched", received)
+
+
+def stream_fixtures(
+    url: str = TICKETING_URL,
+    timeout: int = 30,
+    session: "requests.Session | None" = None,
+) -> Iterator[FixtureData]:
+    """Scrape fixtures, yielding each one while the page is still downloading.
+
+    Args:
+        url: The URL to fetch (defaults to Brentford ticketing page)
+        timeout: Request timeout in seconds
+        session: Session to fetch with (defaults to the shared session)
+
+    Yields:
+        FixtureData objects, in page order
+
+    Raises:
+        requests.RequestException: If fetching fails
+        json.JSONDecodeError: If parsing fails
+        pydantic.ValidationError: If data doesn't match schema
+    """
+    yield from iter_fixtures(fetch_page_chunks(url, timeout, session))
 
 
 def scrape_fixtures() -> list[FixtureData]:
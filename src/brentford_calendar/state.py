@@ -0,0 +1,210 @@
+"""Local persistent store of calendar sync state."""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS event_state (
+    calendar_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    etag TEXT,
+    content_hash TEXT,
+    managed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (calendar_id, source_id)
+);
+CREATE TABLE IF NOT EXISTS sync_token (
+    calendar_id TEXT PRIMARY KEY,
+    token TEXT NOT NULL
+);
+"""
+
+
+class EventState(BaseModel):
+    """Last known state of an event written to Google Calendar."""
+
+    event_id: str
+    etag: str | None = None
+    content_hash: str | None = None
+    # Whether the event carries the managed-by marker, so may be deleted
+    managed: bool = False
+
+
+class SyncStateStore:
+    """SQLite-backed mapping of (calendar_id, source_id) to event state.
+
+    A single store may be shared between threads.
+    """
+
+    def __init__(self, path: Path | str):
+        """Open (and create if needed) the state database.
+
+        Args:
+            path: Path to the SQLite database file, or ":memory:"
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._migrate()
+        self._connection.commit()
+        logger.info(f"Opened sync state store at {path}")
+
+    def _migrate(self) -> None:
+        """Add the managed column to databases created before it existed.
+
+        Every event written since content hashes were introduced also carries
+        the managed-by marker, so rows with a content hash are marked managed.
+        """
+        columns = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(event_state)")
+        }
+        if "managed" in columns:
+            return
+        logger.info("Adding managed column to sync state store")
+        self._connection.execute(
+            "ALTER TABLE event_state ADD COLUMN managed INTEGER NOT NULL DEFAULT 0"
+        )
+        self._connection.execute(
+            "UPDATE event_state SET managed = content_hash IS NOT NULL"
+        )
+
+    def _query(self, sql: str, params: tuple[str, ...]) -> list[tuple[Any, ...]]:
+        """Run a read query and fetch all rows."""
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def _write(self, sql: str, params: tuple[str | int | None, ...]) -> None:
+        """Run a write statement and commit it."""
+        with self._lock:
+            self._connection.execute(sql, params)
+            self._connection.commit()
+
+    def get(self, calendar_id: str, source_id: str) -> EventState | None:
+        """Look up the stored state for an event.
+
+        Args:
+            calendar_id: Google Calendar ID
+            source_id: Unique identifier for the event source
+
+        Returns:
+            EventState if known, None otherwise
+        """
+        rows = self._query(
+            "SELECT event_id, etag, content_hash, managed FROM event_state "
+            "WHERE calendar_id = ? AND source_id = ?",
+            (calendar_id, source_id),
+        )
+        if not rows:
+            return None
+        event_id, etag, content_hash, managed = rows[0]
+        return EventState(
+            event_id=event_id,
+            etag=etag,
+            content_hash=content_hash,
+            managed=bool(managed),
+        )
+
+    def get_all(self, calendar_id: str) -> dict[str, EventState]:
+        """Load the stored state of every event in a calendar.
+
+        Args:
+            calendar_id: Google Calendar ID
+
+        Returns:
+            Mapping of source_id to EventState
+        """
+        rows = self._query(
+            "SELECT source_id, event_id, etag, content_hash, managed FROM event_state "
+            "WHERE calendar_id = ?",
+            (calendar_id,),
+        )
+        return {
+            row[0]: EventState(
+                event_id=row[1],
+                etag=row[2],
+                content_hash=row[3],
+                managed=bool(row[4]),
+            )
+            for row in rows
+        }
+
+    def put(self, calendar_id: str, source_id: str, state: EventState) -> None:
+        """Record the state of an event.
+
+        Args:
+            calendar_id: Google Calendar ID
+            source_id: Unique identifier for the event source
+            state: State to record
+        """
+        self._write(
+            "INSERT OR REPLACE INTO event_state "
+            "(calendar_id, source_id, event_id, etag, content_hash, managed) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                calendar_id,
+                source_id,
+                state.event_id,
+                state.etag,
+                state.content_hash,
+                int(state.managed),
+            ),
+        )
+
+    def delete(self, calendar_id: str, source_id: str) -> None:
+        """Forget the state of an event.
+
+        Args:
+            calendar_id: Google Calendar ID
+            source_id: Unique identifier for the event source
+        """
+        self._write(
+            "DELETE FROM event_state WHERE calendar_id = ? AND source_id = ?",
+            (calendar_id, source_id),
+        )
+
+    def get_sync_token(self, calendar_id: str) -> str | None:
+        """Look up the incremental sync token for a calendar.
+
+        Args:
+            calendar_id: Google Calendar ID
+
+        Returns:
+            Sync token if one has been stored, None otherwise
+        """
+        rows = self._query(
+            "SELECT token FROM sync_token WHERE calendar_id = ?", (calendar_id,)
+        )
+        return str(rows[0][0]) if rows else None
+
+    def put_sync_token(self, calendar_id: str, token: str) -> None:
+        """Record the incremental sync token for a calendar.
+
+        Args:
+            calendar_id: Google Calendar ID
+            token: nextSyncToken returned by the last listing
+        """
+        self._write(
+            "INSERT OR REPLACE INTO sync_token (calendar_id, token) VALUES (?, ?)",
+            (calendar_id, token),
+        )
+
+    def delete_sync_token(self, calendar_id: str) -> None:
+        """Forget the incremental sync token for a calendar.
+
+        Args:
+            calendar_id: Google Calendar ID
+        """
+        self._write("DELETE FROM sync_token WHERE calendar_id = ?", (calendar_id,))
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
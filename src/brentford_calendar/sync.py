@@ -0,0 +1,103 @@
+"""Concurrent sync engine for upserting events to Google Calendar."""
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from brentford_calendar.calendar_client import CalendarClient, UpsertOutcome
+from brentford_calendar.models import CalendarEventData
+
+logger = logging.getLogger(__name__)
+
+
+def upsert_safely(
+    client: CalendarClient, event_data: CalendarEventData
+) -> UpsertOutcome:
+    """Upsert a single event, reporting failures instead of raising.
+
+    Args:
+        client: Client to write the event with
+        event_data: Event data to upsert
+
+    Returns:
+        Outcome of the upsert, FAILED if it raised
+    """
+    try:
+        return client.upsert_event(event_data)
+    except Exception as e:
+        logger.error(f"Failed to write event {event_data.source_id}: {e}")
+        return UpsertOutcome.FAILED
+
+
+def upsert_sequentially(
+    client: CalendarClient, events: list[CalendarEventData]
+) -> list[UpsertOutcome]:
+    """Create or update events one at a time, continuing past failures.
+
+    Args:
+        client: Client to write the events with
+        events: Events to upsert
+
+    Returns:
+        Outcome for each event, in the same order as events
+    """
+    return [upsert_safely(client, event_data) for event_data in events]
+
+
+class ConcurrentSyncEngine:
+    """Upserts events from a bounded pool of worker threads.
+
+    The Google API client's HTTP transport is not thread-safe, so each worker
+    lazily builds its own service and wraps it in a client that shares the
+    base client's index, state store and rate limiter.
+    """
+
+    def __init__(
+        self,
+        client: CalendarClient,
+        service_factory: Callable[[], Any],
+        workers: int,
+    ):
+        """Initialize the sync engine.
+
+        Args:
+            client: Base client whose shared state the workers use
+            service_factory: Builds a new Google Calendar API service
+            workers: Maximum number of concurrent workers
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.client = client
+        self.service_factory = service_factory
+        self.workers = workers
+        self._local = threading.local()
+
+    def _worker_client(self) -> CalendarClient:
+        """Get the calling worker thread's client, creating it on first use."""
+        client: CalendarClient | None = getattr(self._local, "client", None)
+        if client is None:
+            logger.debug(f"Building service for {threading.current_thread().name}")
+            client = self.client.with_service(self.service_factory())
+            self._local.client = client
+        return client
+
+    def _upsert(self, event_data: CalendarEventData) -> UpsertOutcome:
+        """Upsert a single event from the calling worker thread."""
+        return upsert_safely(self._worker_client(), event_data)
+
+    def upsert_events(self, events: list[CalendarEventData]) -> list[UpsertOutcome]:
+        """Create or update events concurrently.
+
+        Args:
+            events: Events to upsert
+
+        Returns:
+            Outcome for each event, in the same order as events
+        """
+        logger.info(f"Syncing {len(events)} events with {self.workers} workers")
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="calendar-sync"
+        ) as executor:
+            return list(executor.map(self._upsert, events))
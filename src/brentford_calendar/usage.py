@@ -0,0 +1,77 @@
+"""Accounting of Google Calendar API requests against a per-run budget."""
+
+import threading
+from collections import Counter
+
+# Method name under which batch HTTP requests are counted. The requests inside
+# a batch are counted under their own methods, as they are against the quota.
+BATCH_METHOD = "batch"
+
+
+class ApiUsage:
+    """Thread-safe count of API requests by method, with an optional budget.
+
+    A single instance is shared by every client in a run, so the counts and
+    budget cover the whole run, as the service account's quota does.
+    """
+
+    def __init__(self, max_calls: int | None = None):
+        """Initialize the usage counts.
+
+        Args:
+            max_calls: Number of requests after which the run should only make
+                essential requests, None for no budget
+        """
+        if max_calls is not None and max_calls < 0:
+            raise ValueError("max_calls must not be negative")
+        self.max_calls = max_calls
+        self.calls: Counter[str] = Counter()
+        self.payload_bytes: Counter[str] = Counter()
+        self.latency: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, payload_bytes: int = 0, seconds: float = 0.0) -> None:
+        """Record a request.
+
+        Args:
+            method: API method, such as "list", "insert" or "batch"
+            payload_bytes: Size of the request bodies sent
+            seconds: Time spent waiting for the response
+        """
+        with self._lock:
+            self.calls[method] += 1
+            self.payload_bytes[method] += payload_bytes
+            self.latency[method] = self.latency.get(method, 0.0) + seconds
+
+    @property
+    def total(self) -> int:
+        """Number of requests counted against the quota."""
+        with self._lock:
+            return sum(
+                count for method, count in self.calls.items() if method != BATCH_METHOD
+            )
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the budget has been used up."""
+        return self.max_calls is not None and self.total >= self.max_calls
+
+    def summary(self) -> str:
+        """Describe the requests made for display.
+
+        Returns:
+            Total and per-method request counts, bytes sent and time spent
+        """
+        total = self.total
+        with self._lock:
+            methods = ", ".join(
+                f"{count} {method}" for method, count in sorted(self.calls.items())
+            )
+            sent = sum(self.payload_bytes.values())
+            seconds = sum(self.latency.values())
+        msg = f"API requests: {total}"
+        if self.max_calls is not None:
+            msg += f" of {self.max_calls} budgeted"
+        if methods:
+            msg += f" ({methods})"
+        return msg + f", {sent / 1024:.1f} KiB sent in {seconds:.2f}s"
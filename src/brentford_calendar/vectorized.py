@@ -0,0 +1,117 @@
+"""Columnar eligibility computation for many profiles at once.
+
+Requires NumPy, installed with the ``fast`` extra
+(``pip install brentford-onsale-calendar[fast]``).
+"""
+
+import logging
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from brentford_calendar.models import (
+    MEMBERSHIP_RANKS,
+    MembershipType,
+    OnsaleFixtureData,
+    ProcessedFixtureData,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sort key of padding slots, beyond every real category
+_NO_CATEGORY = np.iinfo(np.int64).max
+
+
+class VectorizedEligibility:
+    """Earliest eligible on-sale window of every fixture for every profile.
+
+    Category windows are laid out as (fixture, slot) arrays of tier rank,
+    minimum TAPs and a sort key ordering the windows by on-sale date, then by
+    position in the fixture. For a chunk of profiles, the eligible windows are
+    masked and the earliest picked with a single argmin.
+    """
+
+    def __init__(
+        self, fixtures: Sequence[ProcessedFixtureData], chunk_size: int = 4096
+    ):
+        """Lay out the category windows of a scrape.
+
+        Args:
+            fixtures: Processed fixtures with all categories
+            chunk_size: Maximum number of profiles evaluated per array operation
+        """
+        self.fixtures = list(fixtures)
+        self.chunk_size = chunk_size
+        slots = max((len(p.categories) for p in self.fixtures), default=0)
+        shape = (len(self.fixtures), slots)
+        self._ranks = np.full(shape, np.iinfo(np.int64).max, dtype=np.int64)
+        self._minimum_taps = np.zeros(shape, dtype=np.int64)
+        self._keys = np.full(shape, _NO_CATEGORY, dtype=np.int64)
+
+        # Rank on-sale dates with Python comparisons, so ordering (and any
+        # error from mixing naive and aware datetimes) matches the models
+        dates = sorted(
+            {category.on_sale_date for p in self.fixtures for category in p.categories}
+        )
+        date_ranks = {date: rank for rank, date in enumerate(dates)}
+        for row, processed in enumerate(self.fixtures):
+            for slot, category in enumerate(processed.categories):
+                self._ranks[row, slot] = MEMBERSHIP_RANKS[category.membership_type]
+                self._minimum_taps[row, slot] = category.minimum_taps
+                self._keys[row, slot] = date_ranks[category.on_sale_date] * slots + slot
+        logger.debug(f"Laid out {len(dates)} on-sale dates across {shape} windows")
+
+    def earliest_slots(
+        self, profiles: Sequence[tuple[MembershipType, int]]
+    ) -> npt.NDArray[np.intp]:
+        """Find the earliest eligible category of each fixture for each profile.
+
+        Args:
+            profiles: (membership, taps) of each profile
+
+        Returns:
+            Array of shape (profiles, fixtures) holding the index of the
+            earliest eligible category in each fixture, or -1 if none
+        """
+        result = np.full((len(profiles), len(self.fixtures)), -1, dtype=np.intp)
+        if not self._keys.size:
+            return result
+
+        ranks = np.array([MEMBERSHIP_RANKS[m] for m, _ in profiles], dtype=np.int64)
+        taps = np.array([t for _, t in profiles], dtype=np.int64)
+        for start in range(0, len(profiles), self.chunk_size):
+            end = start + self.chunk_size
+            eligible = (self._ranks <= ranks[start:end, None, None]) & (
+                self._minimum_taps <= taps[start:end, None, None]
+            )
+            keys = np.where(eligible, self._keys, _NO_CATEGORY)
+            slots = keys.argmin(axis=2)
+            found = eligible.any(axis=2)
+            result[start:end] = np.where(found, slots, -1)
+        return result
+
+    def onsale_fixtures(
+        self, profiles: Sequence[tuple[MembershipType, int]]
+    ) -> list[list[OnsaleFixtureData]]:
+        """Get the fixtures each profile is eligible to buy.
+
+        Args:
+            profiles: (membership, taps) of each profile
+
+        Returns:
+            For each profile, OnsaleFixtureData for each eligible fixture in
+            fixture order, as from OnsaleFixtureData.from_processed_fixture_data
+        """
+        earliest = self.earliest_slots(profiles)
+        return [
+            [
+                OnsaleFixtureData(
+                    general_fixture_data=self.fixtures[column].general_fixture_data,
+                    onsale=self.fixtures[column].categories[slot],
+                )
+                for column, slot in enumerate(row.tolist())
+                if slot >= 0
+            ]
+            for row in earliest
+        ]
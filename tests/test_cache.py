@@ -0,0 +1,59 @@
+"""Tests for on-disk caches."""
+
+import stat
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from brentford_calendar.cache import (
+    CachedPage,
+    LastSyncCache,
+    PageCache,
+    TokenCache,
+)
+
+
+def test_token_cache_round_trip(tmp_path: Path) -> None:
+    """Test tokens are saved privately and loaded until close to expiry."""
+    cache = TokenCache(tmp_path / "tokens.json")
+    now = datetime.now(UTC).replace(tzinfo=None)
+    expiry = now + timedelta(hours=1)
+
+    cache.save("account:scope", "token-1", expiry)
+    cache.save("expiring:scope", "token-2", now + timedelta(minutes=1))
+
+    assert cache.load("account:scope") == ("token-1", expiry)
+    assert cache.load("expiring:scope") is None
+    assert cache.load("unknown") is None
+    assert stat.S_IMODE((tmp_path / "tokens.json").stat().st_mode) == 0o600
+
+
+def test_token_cache_ignores_corrupt_file(tmp_path: Path) -> None:
+    """Test a corrupt cache file is treated as empty and overwritten."""
+    path = tmp_path / "tokens.json"
+    path.write_text("not json")
+    cache = TokenCache(path)
+
+    assert cache.load("account:scope") is None
+    cache.save("account:scope", "token", datetime(2100, 1, 1))
+    assert cache.load("account:scope") == ("token", datetime(2100, 1, 1))
+
+
+def test_page_cache_round_trip(tmp_path: Path) -> None:
+    """Test pages are cached per URL."""
+    cache = PageCache(tmp_path / "pages")
+    page = CachedPage(content="<html></html>", content_hash="abc", etag='"v1"')
+
+    assert cache.load("https://example.com") is None
+    cache.save("https://example.com", page)
+    assert cache.load("https://example.com") == page
+    assert cache.load("https://example.com/other") is None
+
+
+def test_last_sync_cache_round_trip(tmp_path: Path) -> None:
+    """Test last-synced content hashes are recorded per key."""
+    cache = LastSyncCache(tmp_path / "last-sync.json")
+    assert cache.get("target") is None
+
+    cache.set("target", "abc")
+    cache.set("other", "def")
+    assert cache.get("target") == "abc"
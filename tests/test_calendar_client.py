@@ -1,12 +1,27 @@
 """Tests for Google Calendar client."""
 
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
-from unittest.mock import MagicMock
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
 
 import pytest
-
-from brentford_calendar.calendar_client import CalendarClient
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient.errors import HttpError
+
+from brentford_calendar.cache import TokenCache
+from brentford_calendar.calendar_client import (
+    CalendarClient,
+    UpsertOutcome,
+    build_service,
+    create_credentials,
+)
 from brentford_calendar.models import CalendarEventData
+from brentford_calendar.plan import PlanAction, SyncPlan
+from brentford_calendar.retry import RetryPolicy
+from brentford_calendar.state import EventState, SyncStateStore
+from brentford_calendar.usage import ApiUsage
 
 
 @pytest.fixture
@@ -51,9 +66,9 @@ def test_upsert_event_creates_new(calendar_client: CalendarClient) -> None:
     mock_created_event = {"id": "new-event-123", "summary": "Test Event"}
     calendar_client.service.events().insert().execute.return_value = mock_created_event
 
-    created = calendar_client.upsert_event(event_data)
+    outcome = calendar_client.upsert_event(event_data)
 
-    assert created is True
+    assert outcome is UpsertOutcome.CREATED
 
     # Verify insert was called
     call_args = calendar_client.service.events().insert.call_args
@@ -66,6 +81,28 @@ def test_upsert_event_creates_new(calendar_client: CalendarClient) -> None:
         "test-source-123"
     )
     assert event_body["source"]["url"] == "https://example.com/tickets"
+    # Client-generated IDs make resent inserts idempotent
+    assert len(event_body["id"]) == 32
+
+
+def test_upsert_event_treats_duplicate_insert_as_created(
+    calendar_client: CalendarClient,
+) -> None:
+    """Test an insert rejected as a duplicate ID counts as created."""
+    start_time = datetime(2025, 9, 10, 13, 0, 0, tzinfo=UTC)
+    event_data = CalendarEventData(
+        summary="Test Event",
+        description="",
+        start=start_time,
+        end=start_time + timedelta(hours=1),
+        source_id="test-source-123",
+    )
+    calendar_client.service.events().list().execute.return_value = {"items": []}
+    calendar_client.service.events().insert().execute.side_effect = HttpError(
+        MagicMock(status=409), b"The requested identifier already exists."
+    )
+
+    assert calendar_client.upsert_event(event_data) is UpsertOutcome.CREATED
 
 
 def test_upsert_event_updates_existing(calendar_client: CalendarClient) -> None:
@@ -93,9 +130,9 @@ def test_upsert_event_updates_existing(calendar_client: CalendarClient) -> None:
     mock_updated_event = {"id": "event123", "summary": "Updated Event"}
     calendar_client.service.events().update().execute.return_value = mock_updated_event
 
-    created = calendar_client.upsert_event(event_data)
+    outcome = calendar_client.upsert_event(event_data)
 
-    assert created is False
+    assert outcome is UpsertOutcome.UPDATED
 
     # Verify update was called
     call_args = calendar_client.service.events().update.call_args
@@ -123,11 +160,668 @@ def test_upsert_event_without_url(calendar_client: CalendarClient) -> None:
     mock_created_event = {"id": "new-event-123", "summary": "Test Event"}
     calendar_client.service.events().insert().execute.return_value = mock_created_event
 
-    created = calendar_client.upsert_event(event_data)
+    outcome = calendar_client.upsert_event(event_data)
 
-    assert created is True
+    assert outcome is UpsertOutcome.CREATED
 
     # Verify no source field in event body
     call_args = calendar_client.service.events().insert.call_args
     event_body = call_args.kwargs["body"]
     assert "source" not in event_body
+
+
+def test_prefetch_events_pages_through_managed_events(
+    calendar_client: CalendarClient,
+) -> None:
+    """Test prefetch follows page tokens and indexes events by source_id."""
+    calendar_client.service.events().list().execute.side_effect = [
+        {
+            "items": [
+                {
+                    "id": "event1",
+                    "extendedProperties": {"private": {"source_id": "source-1"}},
+                }
+            ],
+            "nextPageToken": "page-2",
+        },
+        {
+            "items": [
+                {
+                    "id": "event2",
+                    "extendedProperties": {"private": {"source_id": "source-2"}},
+                }
+            ]
+        },
+    ]
+
+    count = calendar_client.prefetch_events()
+
+    assert count == 2
+    list_call = calendar_client.service.events().list.call_args
+    assert list_call.kwargs["privateExtendedProperty"] == (
+        "managed_by=brentford-calendar"
+    )
+    assert list_call.kwargs["pageToken"] == "page-2"
+
+
+def test_upsert_event_uses_prefetched_index(calendar_client: CalendarClient) -> None:
+    """Test upserts resolve against the prefetched index, looking up misses."""
+    start_time = datetime(2025, 9, 10, 13, 0, 0, tzinfo=UTC)
+    calendar_client.service.events().list().execute.return_value = {
+        "items": [
+            {
+                "id": "event123",
+                "extendedProperties": {"private": {"source_id": "existing"}},
+            }
+        ]
+    }
+    calendar_client.prefetch_events()
+    calendar_client.service.events().list.reset_mock()
+    calendar_client.service.events().list().execute.return_value = {"items": []}
+    calendar_client.service.events().insert().execute.return_value = {"id": "new"}
+    calendar_client.service.events().update().execute.return_value = {"id": "event123"}
+
+    existing = CalendarEventData(
+        summary="Existing",
+        description="",
+        start=start_time,
+        end=start_time + timedelta(hours=1),
+        source_id="existing",
+    )
+    new = existing.model_copy(update={"source_id": "new"})
+
+    assert calendar_client.upsert_event(existing) is UpsertOutcome.UPDATED
+    calendar_client.service.events().list.assert_called_once_with()
+    # The new event is missing from the index, so it is looked up once in case
+    # it was written before the managed-by marker
+    assert calendar_client.upsert_event(new) is UpsertOutcome.CREATED
+    assert calendar_client.upsert_event(new) is UpsertOutcome.UPDATED
+    assert calendar_client.service.events().list.call_args.kwargs[
+        "privateExtendedProperty"
+    ] == ("source_id=new")
+    assert calendar_client.service.events().list.call_count == 2
+
+
+def _fake_batch(responses: dict[str, Any]) -> MagicMock:
+    """Create a batch mock that invokes the callback with canned responses.
+
+    A response that is an Exception is passed to the callback as the error.
+    """
+    batch = MagicMock()
+    added: list[str] = []
+    batch.add.side_effect = lambda request, request_id: added.append(request_id)
+
+    def execute() -> None:
+        callback = batch.callback
+        for request_id in added:
+            response = responses[request_id]
+            if isinstance(response, Exception):
+                callback(request_id, None, response)
+            else:
+                callback(request_id, response, None)
+        added.clear()
+
+    batch.execute.side_effect = execute
+    return batch
+
+
+def _use_batches(client: CalendarClient, *batches: MagicMock) -> list[MagicMock]:
+    """Make the client's service hand out the given batch mocks in turn.
+
+    Returns:
+        The batches not yet handed out
+    """
+    remaining = list(batches)
+
+    def new_batch(callback: Any) -> MagicMock:
+        batch = remaining.pop(0)
+        batch.callback = callback
+        return batch
+
+    client.service.new_batch_http_request.side_effect = new_batch
+    return remaining
+
+
+def test_upsert_events_batches_writes(calendar_client: CalendarClient) -> None:
+    """Test batched upserts report an outcome per event and chunk requests."""
+    start_time = datetime(2025, 9, 10, 13, 0, 0, tzinfo=UTC)
+    events = [
+        CalendarEventData(
+            summary=f"Event {i}",
+            description="",
+            start=start_time,
+            end=start_time + timedelta(hours=1),
+            source_id=f"source-{i}",
+        )
+        for i in range(3)
+    ]
+    calendar_client._event_index = {"source-1": {"id": "event1"}}
+    # Events missing from the index are looked up in a batch first
+    lookups = _fake_batch({"0": {"items": []}, "2": {"items": []}})
+    writes = _fake_batch(
+        {
+            "0": {"id": "new0"},
+            "1": {"id": "event1"},
+            "2": HttpError(MagicMock(status=500), b"error"),
+        }
+    )
+    remaining = _use_batches(calendar_client, lookups, writes, writes)
+
+    outcomes = calendar_client.upsert_events(events, batch_size=2)
+
+    assert outcomes == [
+        UpsertOutcome.CREATED,
+        UpsertOutcome.UPDATED,
+        UpsertOutcome.FAILED,
+    ]
+    assert lookups.execute.call_count == 1
+    assert writes.execute.call_count == 2
+    assert remaining == []
+    assert calendar_client._event_index["source-0"] == {"id": "new0"}
+
+
+def test_upsert_events_rejects_oversized_batches(
+    calendar_client: CalendarClient,
+) -> None:
+    """Test batch sizes above the API limit are rejected."""
+    with pytest.raises(ValueError, match="batch_size"):
+        calendar_client.upsert_events([], batch_size=51)
+
+
+def test_upsert_event_skips_unchanged(calendar_client: CalendarClient) -> None:
+    """Test upsert skips the write when the content fingerprint matches."""
+    start_time = datetime(2025, 9, 10, 13, 0, 0, tzinfo=UTC)
+    event_data = CalendarEventData(
+        summary="Test Event",
+        description="Test Description",
+        start=start_time,
+        end=start_time + timedelta(hours=1),
+        source_id="test-source-123",
+    )
+    remote_event = {"id": "event123", **calendar_client._build_event_body(event_data)}
+    calendar_client.service.events().list().execute.return_value = {
+        "items": [remote_event]
+    }
+
+    assert calendar_client.upsert_event(event_data) is UpsertOutcome.UNCHANGED
+    calendar_client.service.events().update.assert_not_called()
+
+    changed = event_data.model_copy(update={"description": "New Description"})
+    calendar_client.service.events().update().execute.return_value = remote_event
+    assert calendar_client.upsert_event(changed) is UpsertOutcome.UPDATED
+
+
+@pytest.fixture
+def state_client(mock_service: MagicMock) -> Iterator[CalendarClient]:
+    """Create a CalendarClient with mocked service and in-memory state store."""
+    store = SyncStateStore(":memory:")
+    yield CalendarClient(
+        calendar_id="test-calendar@example.com",
+        service=mock_service,
+        state_store=store,
+    )
+    store.close()
+
+
+def _event_data(source_id: str = "test-source-123", **kwargs: Any) -> CalendarEventData:
+    start_time = datetime(2025, 9, 10, 13, 0, 0, tzinfo=UTC)
+    fields = {
+        "summary": "Test Event",
+        "description": "Test Description",
+        "start": start_time,
+        "end": start_time + timedelta(hours=1),
+        "source_id": source_id,
+    }
+    return CalendarEventData(**(fields | kwargs))
+
+
+def test_upsert_event_with_state_store_makes_no_reads(
+    state_client: CalendarClient,
+) -> None:
+    """Test a known, unchanged event is skipped and a changed one updated directly."""
+    event_data = _event_data()
+    created_event = {
+        "id": "event123",
+        "etag": '"1"',
+        **state_client._build_event_body(event_data),
+    }
+    state_client.service.events().list().execute.return_value = {"items": []}
+    state_client.service.events().insert().execute.return_value = created_event
+    assert state_client.upsert_event(event_data) is UpsertOutcome.CREATED
+    state_client.service.events().list.reset_mock()
+
+    assert state_client.upsert_event(event_data) is UpsertOutcome.UNCHANGED
+
+    changed = _event_data(description="Changed")
+    state_client.service.events().update().execute.return_value = {
+        "id": "event123",
+        **state_client._build_event_body(changed),
+    }
+    assert state_client.upsert_event(changed) is UpsertOutcome.UPDATED
+    assert state_client.service.events().update.call_args.kwargs["eventId"] == (
+        "event123"
+    )
+    state_client.service.events().list.assert_not_called()
+
+
+def test_for_calendar_shares_service_but_not_state(
+    state_client: CalendarClient,
+) -> None:
+    """Test a client for another calendar reuses the service and store."""
+    state_client._state_reconciled = True
+    other = state_client.for_calendar("other@example.com")
+
+    assert other.calendar_id == "other@example.com"
+    assert other.service is state_client.service
+    assert other.state_store is state_client.state_store
+    assert other._state_reconciled is False
+
+
+def test_upsert_event_recreates_deleted_event(state_client: CalendarClient) -> None:
+    """Test an event deleted since it was recorded is recreated."""
+    assert state_client.state_store is not None
+    state_client.state_store.put(
+        "test-calendar@example.com",
+        "test-source-123",
+        EventState(event_id="deleted", content_hash="stale"),
+    )
+    state_client.service.events().update().execute.side_effect = HttpError(
+        MagicMock(status=404), b"not found"
+    )
+    state_client.service.events().insert().execute.return_value = {"id": "new"}
+
+    assert state_client.upsert_event(_event_data()) is UpsertOutcome.CREATED
+    state = state_client.state_store.get("test-calendar@example.com", "test-source-123")
+    assert state is not None
+    assert state.event_id == "new"
+
+
+def _remote_event(source_id: str, event_id: str, etag: str) -> dict[str, Any]:
+    return {
+        "id": event_id,
+        "etag": etag,
+        "extendedProperties": {
+            "private": {"source_id": source_id, "managed_by": "brentford-calendar"}
+        },
+    }
+
+
+def test_reconcile_state_repairs_drift(state_client: CalendarClient) -> None:
+    """Test a full reconcile drops deleted events and refreshes modified ones."""
+    store = state_client.state_store
+    assert store is not None
+    calendar_id = "test-calendar@example.com"
+    store.put(calendar_id, "deleted", EventState(event_id="e1", etag='"1"'))
+    store.put(calendar_id, "edited", EventState(event_id="e2", etag='"1"'))
+    store.put(calendar_id, "same", EventState(event_id="e3", etag='"1"'))
+
+    state_client.service.events().list().execute.return_value = {
+        "items": [
+            _remote_event("edited", "e2", '"2"'),
+            _remote_event("same", "e3", '"1"'),
+            _remote_event("unknown", "e4", '"1"'),
+            {"id": "unmanaged", "summary": "Someone else's event"},
+        ],
+        "nextSyncToken": "token-1",
+    }
+
+    assert state_client.reconcile_state() == 3
+    assert set(store.get_all(calendar_id)) == {"edited", "same", "unknown"}
+    assert store.get(calendar_id, "edited") == EventState(
+        event_id="e2", etag='"2"', managed=True
+    )
+    assert store.get_sync_token(calendar_id) == "token-1"
+
+
+def test_reconcile_state_uses_sync_token(state_client: CalendarClient) -> None:
+    """Test reconcile fetches only changed events once a sync token is stored."""
+    store = state_client.state_store
+    assert store is not None
+    calendar_id = "test-calendar@example.com"
+    store.put(calendar_id, "deleted", EventState(event_id="e1", etag='"1"'))
+    store.put(calendar_id, "edited", EventState(event_id="e2", etag='"1"'))
+    store.put_sync_token(calendar_id, "token-1")
+
+    state_client.service.events().list().execute.return_value = {
+        "items": [
+            {"id": "e1", "status": "cancelled"},
+            _remote_event("edited", "e2", '"2"'),
+        ],
+        "nextSyncToken": "token-2",
+    }
+
+    assert state_client.reconcile_state() == 2
+    list_call = state_client.service.events().list.call_args
+    assert list_call.kwargs["syncToken"] == "token-1"
+    assert store.get_all(calendar_id) == {
+        "edited": EventState(event_id="e2", etag='"2"', managed=True)
+    }
+    assert store.get_sync_token(calendar_id) == "token-2"
+
+    # Events unknown to a reconciled store are created without a lookup
+    state_client.service.events().list.reset_mock()
+    state_client.service.events().insert().execute.return_value = {"id": "new"}
+    assert state_client.upsert_event(_event_data("new")) is UpsertOutcome.CREATED
+    state_client.service.events().list.assert_not_called()
+
+
+def test_reconcile_state_falls_back_to_full_resync(
+    state_client: CalendarClient,
+) -> None:
+    """Test an expired sync token triggers a full listing."""
+    store = state_client.state_store
+    assert store is not None
+    calendar_id = "test-calendar@example.com"
+    store.put_sync_token(calendar_id, "expired")
+
+    state_client.service.events().list().execute.side_effect = [
+        HttpError(MagicMock(status=410), b"gone"),
+        {"items": [_remote_event("same", "e3", '"1"')], "nextSyncToken": "fresh"},
+    ]
+
+    assert state_client.reconcile_state() == 1
+    list_call = state_client.service.events().list.call_args
+    assert "syncToken" not in list_call.kwargs
+    assert store.get_sync_token(calendar_id) == "fresh"
+
+
+def test_upsert_events_retries_throttled_items(
+    calendar_client: CalendarClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test throttled requests inside a batch are resent in a later batch."""
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    calendar_client.retry_policy = RetryPolicy()
+    calendar_client._event_index = {}
+    throttled = HttpError(MagicMock(status=429), b"slow down")
+    batches = _use_batches(
+        calendar_client,
+        _fake_batch({"0": {"items": []}, "1": {"items": []}}),
+        _fake_batch({"0": {"id": "new0"}, "1": throttled}),
+        _fake_batch({"1": {"id": "new1"}}),
+    )
+
+    outcomes = calendar_client.upsert_events([_event_data("a"), _event_data("b")])
+
+    assert outcomes == [UpsertOutcome.CREATED, UpsertOutcome.CREATED]
+    assert calendar_client.retry_policy.throttles == 1
+    assert batches == []
+
+
+def test_upsert_events_continues_past_failed_lookups(
+    calendar_client: CalendarClient,
+) -> None:
+    """Test an event whose lookup fails is reported failed, not the whole run."""
+    throttled = HttpError(MagicMock(status=403), b"rateLimitExceeded")
+    _use_batches(
+        calendar_client,
+        _fake_batch({"0": {"items": []}, "1": throttled, "2": {"items": []}}),
+        _fake_batch({"0": {"id": "new0"}, "2": {"id": "new2"}}),
+    )
+
+    outcomes = calendar_client.upsert_events(
+        [_event_data("a"), _event_data("b"), _event_data("c")]
+    )
+
+    assert outcomes == [
+        UpsertOutcome.CREATED,
+        UpsertOutcome.FAILED,
+        UpsertOutcome.CREATED,
+    ]
+
+
+def test_build_service_uses_static_discovery() -> None:
+    """Test services are built from the bundled discovery document."""
+    with patch("httplib2.Http.request") as mock_request:
+        service = build_service(AnonymousCredentials())
+        assert hasattr(service, "events")
+        mock_request.assert_not_called()
+
+
+def test_create_credentials_uses_token_cache(tmp_path: Path) -> None:
+    """Test a cached token is reused and a missing one fetched and cached."""
+    token_cache = TokenCache(tmp_path / "tokens.json")
+    config = MagicMock(service_account_info={}, api_endpoint=None)
+    credentials = MagicMock(service_account_email="sa@example.com")
+
+    def refresh(request: Any) -> None:
+        credentials.token = "fresh-token"
+        credentials.expiry = datetime(2100, 1, 1)
+
+    credentials.refresh.side_effect = refresh
+
+    with patch(
+        "google.oauth2.service_account.Credentials.from_service_account_info",
+        return_value=credentials,
+    ):
+        create_credentials(config, token_cache)
+        assert credentials.refresh.call_count == 1
+
+        credentials.token = None
+        create_credentials(config, token_cache)
+
+    assert credentials.refresh.call_count == 1
+    assert credentials.token == "fresh-token"
+
+
+def _content_hash(event_data: CalendarEventData) -> str:
+    body = CalendarClient._build_event_body(event_data)
+    return str(body["extendedProperties"]["private"]["content_hash"])
+
+
+def test_plan_sync_from_state_store_makes_no_requests(
+    state_client: CalendarClient,
+) -> None:
+    """Test a plan is computed from the state store alone."""
+    store = state_client.state_store
+    assert store is not None
+    calendar_id = "test-calendar@example.com"
+    same, changed, new = _event_data("same"), _event_data("changed"), _event_data("new")
+    store.put(
+        calendar_id, "same", EventState(event_id="e1", content_hash=_content_hash(same))
+    )
+    store.put(calendar_id, "changed", EventState(event_id="e2", content_hash="old"))
+    store.put(
+        calendar_id,
+        "stale",
+        EventState(event_id="e3", content_hash="old", managed=True),
+    )
+    # Events without the managed-by marker are never planned for deletion
+    store.put(calendar_id, "unmarked", EventState(event_id="e4"))
+    state_client.service.reset_mock()
+
+    plan = state_client.plan_sync([same, changed, new], profile="me", prune=True)
+
+    assert [(c.action, c.source_id, c.event_id) for c in plan.changes] == [
+        (PlanAction.UNCHANGED, "same", "e1"),
+        (PlanAction.UPDATE, "changed", "e2"),
+        (PlanAction.CREATE, "new", None),
+        (PlanAction.DELETE, "stale", "e3"),
+    ]
+    assert plan.changes[0].event is None
+    assert plan.changes[1].event == changed
+    state_client.service.events.assert_not_called()
+
+
+def test_plan_sync_lists_managed_events_once(calendar_client: CalendarClient) -> None:
+    """Test without a state store the managed events are listed in one pass."""
+    same = _event_data("same")
+    remote_same = {"id": "e1", **calendar_client._build_event_body(same)}
+    remote_stale = _remote_event("stale", "e2", '"1"') | {"summary": "Old event"}
+    calendar_client.service.events().list().execute.return_value = {
+        "items": [remote_same, remote_stale]
+    }
+    calendar_client.service.events().list.reset_mock()
+
+    plan = calendar_client.plan_sync([same], profile="me", prune=True)
+
+    assert plan.counts() == {PlanAction.UNCHANGED: 1, PlanAction.DELETE: 1}
+    assert plan.describe() == [
+        "  delete  Old event",
+        "Plan: 0 to create, 0 to update, 1 unchanged, 1 to delete",
+    ]
+    calendar_client.service.events().list.assert_called_once()
+    calendar_client.service.events().insert.assert_not_called()
+
+    # Deletions are only planned when pruning
+    plan = calendar_client.plan_sync([same], profile="me")
+    assert plan.counts() == {PlanAction.UNCHANGED: 1}
+
+
+def test_apply_plan_batches_planned_writes(state_client: CalendarClient) -> None:
+    """Test a saved plan's creates and updates are written in one batched pass."""
+    store = state_client.state_store
+    assert store is not None
+    calendar_id = "test-calendar@example.com"
+    same, changed, new = _event_data("same"), _event_data("changed"), _event_data("new")
+    store.put(
+        calendar_id, "same", EventState(event_id="e1", content_hash=_content_hash(same))
+    )
+    store.put(calendar_id, "changed", EventState(event_id="e2", content_hash="old"))
+    store.put(calendar_id, "stale", EventState(event_id="e3", content_hash="old"))
+    plan = SyncPlan.model_validate_json(
+        state_client.plan_sync([same, changed, new], profile="me").model_dump_json()
+    )
+
+    batch = _fake_batch({"0": {"id": "e2"}, "1": {"id": "e4"}})
+
+    def new_batch(callback: Any) -> MagicMock:
+        batch.callback = callback
+        return batch
+
+    state_client.service.new_batch_http_request.side_effect = new_batch
+
+    outcomes = state_client.apply_plan(plan)
+
+    assert outcomes == [
+        UpsertOutcome.UNCHANGED,
+        UpsertOutcome.UPDATED,
+        UpsertOutcome.CREATED,
+    ]
+    batch.execute.assert_called_once()
+    assert state_client.service.events().update.call_args.kwargs["eventId"] == "e2"
+    state_client.service.events().delete.assert_not_called()
+    new_state = store.get(calendar_id, "new")
+    assert new_state is not None
+    assert new_state.event_id == "e4"
+
+
+def test_apply_plan_rejects_other_calendar(calendar_client: CalendarClient) -> None:
+    """Test a plan computed for another calendar is not applied."""
+    plan = SyncPlan(profile="me", calendar_id="other@example.com", changes=[])
+    with pytest.raises(ValueError, match="other@example.com"):
+        calendar_client.apply_plan(plan)
+
+
+def test_find_stale_events(state_client: CalendarClient) -> None:
+    """Test managed events missing from the current events are found."""
+    store = state_client.state_store
+    assert store is not None
+    calendar_id = "test-calendar@example.com"
+    store.put(calendar_id, "current", EventState(event_id="e1", managed=True))
+    store.put(calendar_id, "gone", EventState(event_id="e2", managed=True))
+    # Events with a source_id but no managed-by marker are never deleted
+    store.put(calendar_id, "unmarked", EventState(event_id="e3"))
+
+    stale = state_client.find_stale_events([_event_data("current")])
+
+    assert stale == {"gone": "e2"}
+    state_client.service.events().list.assert_not_called()
+
+
+def test_delete_events_batches_deletes(state_client: CalendarClient) -> None:
+    """Test stale events are deleted in batches and forgotten."""
+    store = state_client.state_store
+    assert store is not None
+    calendar_id = "test-calendar@example.com"
+    for i in range(3):
+        store.put(calendar_id, f"s{i}", EventState(event_id=f"e{i}"))
+
+    batch = _fake_batch(
+        {
+            "0": "",
+            "1": HttpError(MagicMock(status=410), b"gone"),
+            "2": HttpError(MagicMock(status=403), b"forbidden"),
+        }
+    )
+
+    def new_batch(callback: Any) -> MagicMock:
+        batch.callback = callback
+        return batch
+
+    state_client.service.new_batch_http_request.side_effect = new_batch
+
+    deleted = state_client.delete_events(
+        {"s0": "e0", "s1": "e1", "s2": "e2"}, batch_size=2
+    )
+
+    # Already gone counts as deleted, the forbidden delete is kept for next run
+    assert deleted == 2
+    assert batch.execute.call_count == 2
+    assert set(store.get_all(calendar_id)) == {"s2"}
+    delete_ids = [
+        call.kwargs["eventId"]
+        for call in state_client.service.events().delete.call_args_list
+        if call.kwargs
+    ]
+    assert delete_ids == ["e0", "e1", "e2"]
+
+
+def test_delete_events_refuses_more_than_max(
+    calendar_client: CalendarClient,
+) -> None:
+    """Test nothing is deleted when more events are stale than allowed."""
+    with pytest.raises(ValueError, match="Refusing to delete 2 events"):
+        calendar_client.delete_events({"s0": "e0", "s1": "e1"}, max_deletes=1)
+
+    calendar_client.service.new_batch_http_request.assert_not_called()
+
+
+def test_api_usage_counts_requests_by_method(calendar_client: CalendarClient) -> None:
+    """Test every request, including those inside a batch, is counted."""
+    usage = ApiUsage()
+    calendar_client.api_usage = usage
+    calendar_client.service.events().list().execute.return_value = {"items": []}
+    calendar_client.service.events().insert().execute.return_value = {"id": "e1"}
+    calendar_client.service.events().insert().body = '{"summary": "Event"}'
+
+    calendar_client.upsert_event(_event_data("one"))
+
+    _use_batches(
+        calendar_client,
+        _fake_batch({"0": {"items": []}, "1": {"items": []}}),
+        _fake_batch({"0": {"id": "e2"}, "1": {"id": "e3"}}),
+    )
+    calendar_client.upsert_events([_event_data("two"), _event_data("three")])
+
+    assert usage.calls == {"list": 3, "insert": 3, "batch": 2}
+    assert usage.total == 6
+    assert usage.payload_bytes["insert"] == 3 * len('{"summary": "Event"}')
+
+
+def test_upsert_defers_lookups_once_over_budget(
+    state_client: CalendarClient,
+) -> None:
+    """Test events needing a lookup are deferred once the budget is used up."""
+    store = state_client.state_store
+    assert store is not None
+    store.put("test-calendar@example.com", "changed", EventState(event_id="e1"))
+    state_client.api_usage = ApiUsage(max_calls=1)
+    state_client.api_usage.record("list")
+    state_client.service.events().update().execute.return_value = {"id": "e1"}
+
+    assert state_client.upsert_event(_event_data("unknown")) is (UpsertOutcome.DEFERRED)
+    # Changed events the state store knows about are still written
+    assert state_client.upsert_event(_event_data("changed")) is (UpsertOutcome.UPDATED)
+    state_client.service.events().list().execute.assert_not_called()
+
+
+def test_upsert_events_defers_lookups_once_over_budget(
+    calendar_client: CalendarClient,
+) -> None:
+    """Test batched upserts defer events that would need a lookup."""
+    calendar_client.api_usage = ApiUsage(max_calls=0)
+
+    outcomes = calendar_client.upsert_events([_event_data("a"), _event_data("b")])
+
+    assert outcomes == [UpsertOutcome.DEFERRED, UpsertOutcome.DEFERRED]
+    calendar_client.service.new_batch_http_request.assert_not_called()
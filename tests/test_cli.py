@@ -1,11 +1,34 @@
 """Tests for CLI."""
 
+import json
+import subprocess
+import sys
+import textwrap
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from click.testing import CliRunner
 
-from brentford_calendar.cli import main
+from brentford_calendar.cache import CachedPage
+from brentford_calendar.calendar_client import UpsertOutcome
+from brentford_calendar.cli import _sync_profile, main
+from brentford_calendar.plan import PlanAction, PlannedChange, SyncPlan
+from brentford_calendar.scraper import extract_fixtures
+from brentford_calendar.usage import ApiUsage
+
+FIXTURE_HTML_PATH = Path(__file__).parent / "data" / "ticket-information.html"
+
+# Maximum cumulative time to import the CLI module, in seconds
+IMPORT_TIME_BUDGET = 0.5
+
+# Slow-to-import dependencies that runs ending early should never load
+LAZY_MODULES = (
+    "bs4",
+    "html5lib",
+    "google.auth",
+    "google.oauth2",
+    "googleapiclient.discovery",
+)
 
 
 def test_cli_verbose_flag() -> None:
@@ -14,7 +37,7 @@ def test_cli_verbose_flag() -> None:
 
     # Create mock calendar client
     mock_client = MagicMock()
-    mock_client.upsert_event.return_value = True
+    mock_client.upsert_event.return_value = UpsertOutcome.CREATED
 
     with runner.isolated_filesystem():
         # Create dummy credentials file
@@ -66,7 +89,7 @@ def test_cli_calendar_sync() -> None:
 
     # Create mock calendar client
     mock_client = MagicMock()
-    mock_client.upsert_event.return_value = True  # All created for simplicity
+    mock_client.upsert_event.return_value = UpsertOutcome.CREATED
 
     with runner.isolated_filesystem():
         # Create dummy credentials file
@@ -104,3 +127,396 @@ def test_cli_calendar_sync() -> None:
             # Check output message contains expected format
             assert "Synced" in result.output
             assert "events" in result.output
+
+
+def test_cli_skips_sync_when_page_unchanged(tmp_path: Path) -> None:
+    """Test an unchanged page short-circuits the sync once it has been synced."""
+    runner = CliRunner()
+    html = (Path(__file__).parent / "data" / "ticket-information.html").read_text()
+    page = CachedPage(content=html, content_hash="abc")
+
+    mock_client = MagicMock()
+    mock_client.upsert_event.return_value = UpsertOutcome.CREATED
+
+    creds_path = tmp_path / "service-account.json"
+    creds_path.write_text('{"type": "service_account"}')
+    args = [
+        "--membership",
+        "MY_BEES_MEMBERS",
+        "--credentials",
+        str(creds_path),
+        "--calendar-id",
+        "test-calendar@group.calendar.google.com",
+        "--cache-dir",
+        str(tmp_path / "cache"),
+    ]
+
+    with (
+        patch("brentford_calendar.cli.fetch_page_conditional", return_value=page),
+        patch("brentford_calendar.cli.load_config_from_file"),
+        patch(
+            "brentford_calendar.cli.CalendarClient.from_config",
+            return_value=mock_client,
+        ),
+    ):
+        result = runner.invoke(main, args)
+        assert result.exit_code == 0
+        assert "Synced" in result.output
+        synced_count = mock_client.upsert_event.call_count
+        assert synced_count >= 1
+
+        result = runner.invoke(main, args)
+        assert result.exit_code == 0
+        assert "No changes since last sync" in result.output
+        assert mock_client.upsert_event.call_count == synced_count
+
+        result = runner.invoke(main, [*args, "--force"])
+        assert result.exit_code == 0
+        assert mock_client.upsert_event.call_count == 2 * synced_count
+
+
+def test_cli_requires_profile_options() -> None:
+    """Test the single-profile options are required without --profiles."""
+    result = CliRunner().invoke(main, ["--membership", "MY_BEES_MEMBERS"])
+
+    assert result.exit_code == 2
+    assert "--credentials, --calendar-id" in result.output
+
+
+def test_cli_rejects_single_profile_options_with_profiles(tmp_path: Path) -> None:
+    """Test --taps is rejected with --profiles rather than silently ignored."""
+    profiles_path = tmp_path / "profiles.json"
+    profiles_path.write_text("[]")
+
+    result = CliRunner().invoke(
+        main, ["--profiles", str(profiles_path), "--taps", "400"]
+    )
+
+    assert result.exit_code == 2
+    assert "cannot be combined with --membership, --taps" in result.output
+
+
+def test_cli_profile_memory_requires_profile_dir(tmp_path: Path) -> None:
+    """Test --profile-memory names the cProfile option it depends on."""
+    creds_path = tmp_path / "creds.json"
+    creds_path.write_text('{"type": "service_account"}')
+
+    result = CliRunner().invoke(
+        main,
+        [
+            "--membership",
+            "MY_BEES_MEMBERS",
+            "--credentials",
+            str(creds_path),
+            "--calendar-id",
+            "cal",
+            "--profile-memory",
+        ],
+    )
+
+    assert result.exit_code == 2
+    assert "--profile-memory requires --profile-dir" in result.output
+
+
+def test_cli_syncs_each_profile_from_one_scrape(tmp_path: Path) -> None:
+    """Test profiles share one scrape and a client per service account."""
+    runner = CliRunner()
+    fixtures = extract_fixtures(FIXTURE_HTML_PATH.read_text())
+
+    shared_creds = tmp_path / "shared.json"
+    other_creds = tmp_path / "other.json"
+    for path in (shared_creds, other_creds):
+        path.write_text('{"type": "service_account"}')
+    profiles_path = tmp_path / "profiles.json"
+    profiles_path.write_text(
+        json.dumps(
+            [
+                {"name": "alice", "membership": "MEMBERS", "calendar_id": "a"},
+                {"name": "bob", "membership": "SEASON_TICKET", "calendar_id": "b"},
+                {
+                    "name": "carol",
+                    "membership": "MY_BEES_MEMBERS",
+                    "taps": 400,
+                    "calendar_id": "c",
+                    "credentials": "other.json",
+                },
+            ]
+        )
+    )
+
+    shared_client = MagicMock()
+    shared_client.upsert_event.return_value = UpsertOutcome.CREATED
+    shared_client.for_calendar.return_value.upsert_event.return_value = (
+        UpsertOutcome.UNCHANGED
+    )
+    other_client = MagicMock()
+    other_client.upsert_event.return_value = UpsertOutcome.UPDATED
+
+    with (
+        patch(
+            "brentford_calendar.cli.scrape_fixtures", return_value=fixtures
+        ) as mock_scrape,
+        patch("brentford_calendar.cli.load_config_from_file") as mock_load_config,
+        patch(
+            "brentford_calendar.cli.CalendarClient.from_config",
+            side_effect=[shared_client, other_client],
+        ),
+    ):
+        result = runner.invoke(
+            main,
+            ["--profiles", str(profiles_path), "--credentials", str(shared_creds)],
+        )
+
+    assert result.exit_code == 0, result.output
+    mock_scrape.assert_called_once()
+    assert [c.args for c in mock_load_config.call_args_list] == [
+        (shared_creds, "a"),
+        (other_creds, "c"),
+    ]
+    shared_client.for_calendar.assert_called_once_with("b")
+    lines = result.output.splitlines()
+    assert lines[0].startswith("alice: Synced")
+    assert "created" in lines[0]
+    assert lines[1].startswith("bob: Synced")
+    assert lines[2].startswith("carol: Synced")
+
+
+def _import_times(script: str) -> dict[str, float]:
+    """Run a script with -X importtime and get each module's cumulative time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", textwrap.dedent(script)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_cli_help_imports_lazily() -> None:
+    """Test --help loads no heavy dependencies and stays within budget."""
+    times = _import_times(
+        """
+        from brentford_calendar.cli import _sync_profile, main
+        try:
+            main(["--help"])
+        except SystemExit as e:
+            assert e.code == 0
+        """
+    )
+
+    assert times["brentford_calendar.cli"] < IMPORT_TIME_BUDGET
+    assert not [m for m in LAZY_MODULES + ("requests",) if m in times]
+
+
+def test_cli_unchanged_run_imports_lazily(tmp_path: Path) -> None:
+    """Test a run ending on an unchanged page never loads the Google client."""
+    creds_path = tmp_path / "service-account.json"
+    creds_path.write_text('{"type": "service_account"}')
+    times = _import_times(
+        f"""
+        from pathlib import Path
+        from unittest.mock import patch
+
+        from brentford_calendar import cli
+        from brentford_calendar.cache import CachedPage, LastSyncCache
+        from brentford_calendar.config import SyncProfile
+
+        cache_dir = Path({str(tmp_path / "cache")!r})
+        profile = SyncProfile(name="c", membership="MEMBERS", calendar_id="c")
+        LastSyncCache(cache_dir / "last-sync.json").set(cli._sync_key(profile), "h")
+        page = CachedPage(content="", content_hash="h")
+        args = ["--membership", "MEMBERS", "--calendar-id", "c",
+                "--credentials", {str(creds_path)!r}, "--cache-dir", str(cache_dir)]
+        with patch.object(cli, "fetch_page_conditional", return_value=page):
+            try:
+                cli.main(args)
+            except SystemExit as e:
+                assert e.code == 0
+        """
+    )
+
+    assert times["brentford_calendar.cli"] < IMPORT_TIME_BUDGET
+    assert not [m for m in LAZY_MODULES if m in times]
+
+
+def test_cli_plans_then_applies_without_rescraping(tmp_path: Path) -> None:
+    """Test --plan writes a plan without writing events, and --apply-plan uses it."""
+    runner = CliRunner()
+    fixtures = extract_fixtures(FIXTURE_HTML_PATH.read_text())
+    creds_path = tmp_path / "service-account.json"
+    creds_path.write_text('{"type": "service_account"}')
+    plan_path = tmp_path / "plan.json"
+    args = [
+        "--membership",
+        "MY_BEES_MEMBERS",
+        "--credentials",
+        str(creds_path),
+        "--calendar-id",
+        "cal",
+    ]
+
+    mock_client = MagicMock()
+    mock_client.plan_sync.side_effect = lambda events, profile, prune: SyncPlan(
+        profile=profile,
+        calendar_id="cal",
+        changes=[
+            PlannedChange(
+                action=PlanAction.CREATE,
+                source_id=event.source_id,
+                summary=event.summary,
+                event=event,
+            )
+            for event in events
+        ],
+    )
+    mock_client.apply_plan.return_value = [UpsertOutcome.CREATED]
+
+    with (
+        patch(
+            "brentford_calendar.cli.scrape_fixtures", return_value=fixtures
+        ) as mock_scrape,
+        patch("brentford_calendar.cli.load_config_from_file"),
+        patch(
+            "brentford_calendar.cli.CalendarClient.from_config",
+            return_value=mock_client,
+        ),
+    ):
+        result = runner.invoke(main, [*args, "--plan", str(plan_path)])
+        assert result.exit_code == 0, result.output
+        assert "to create" in result.output
+        mock_client.upsert_event.assert_not_called()
+
+        result = runner.invoke(main, [*args, "--apply-plan", str(plan_path)])
+        assert result.exit_code == 0, result.output
+        assert "Synced 1 events (1 created" in result.output
+
+    mock_scrape.assert_called_once()
+    (applied,) = mock_client.apply_plan.call_args.args
+    assert applied.calendar_id == "cal"
+    assert applied.changes
+    assert all(change.action is PlanAction.CREATE for change in applied.changes)
+
+
+def test_cli_prune_respects_max_deletes(tmp_path: Path) -> None:
+    """Test --prune deletes stale events unless there are more than allowed."""
+    runner = CliRunner()
+    fixtures = extract_fixtures(FIXTURE_HTML_PATH.read_text())
+    creds_path = tmp_path / "service-account.json"
+    creds_path.write_text('{"type": "service_account"}')
+    args = [
+        "--membership",
+        "MY_BEES_MEMBERS",
+        "--credentials",
+        str(creds_path),
+        "--calendar-id",
+        "cal",
+        "--batch",
+        "--prune",
+    ]
+
+    mock_client = MagicMock()
+    mock_client.upsert_events.side_effect = lambda events: (
+        [UpsertOutcome.UNCHANGED] * len(events)
+    )
+    mock_client.find_stale_events.return_value = {"old-1": "e1", "old-2": "e2"}
+    mock_client.delete_events.return_value = 2
+
+    with (
+        patch("brentford_calendar.cli.scrape_fixtures", return_value=fixtures),
+        patch("brentford_calendar.cli.load_config_from_file"),
+        patch(
+            "brentford_calendar.cli.CalendarClient.from_config",
+            return_value=mock_client,
+        ),
+    ):
+        result = runner.invoke(main, args)
+        assert result.exit_code == 0, result.output
+        assert ", 2 deleted)" in result.output
+        mock_client.delete_events.assert_called_once_with(
+            {"old-1": "e1", "old-2": "e2"}, max_deletes=10
+        )
+
+        mock_client.delete_events.side_effect = ValueError("Refusing to delete")
+        result = runner.invoke(main, [*args, "--max-deletes", "1"])
+        assert result.exit_code == 1
+        assert "Refusing to delete" in result.output
+        assert ", 0 deleted)" in result.output
+
+
+def test_sync_profile_workers_reuse_client_credentials() -> None:
+    """Test worker services are built from the client's own credentials."""
+    client = MagicMock()
+    client.find_stale_events.return_value = {}
+
+    with (
+        patch("brentford_calendar.cli.ConcurrentSyncEngine") as mock_engine,
+        patch("brentford_calendar.calendar_client.create_credentials") as mock_creds,
+    ):
+        mock_engine.return_value.upsert_events.return_value = [
+            UpsertOutcome.CREATED,
+            UpsertOutcome.FAILED,
+        ]
+        result = _sync_profile(
+            client,
+            [],
+            ApiUsage(),
+            batch=False,
+            workers=4,
+            api_endpoint="http://localhost:8080",
+            prune=True,
+            max_deletes=10,
+            prefix="",
+        )
+
+    _, service_factory, workers = mock_engine.call_args.args
+    assert service_factory.args == (client.credentials, "http://localhost:8080")
+    assert workers == 4
+    mock_creds.assert_not_called()
+    assert result.failed == 1
+    assert result.summary(prune=True) == (
+        "Synced 2 events (1 created, 0 updated, 0 unchanged, 0 deleted, 1 failed)"
+    )
+
+
+def test_cli_syncs_to_fake_calendar_server(tmp_path: Path) -> None:
+    """Test a full run against the fake server creates, then leaves, events."""
+    from brentford_calendar.fake_calendar import FakeCalendarServer
+
+    runner = CliRunner()
+    fixtures = extract_fixtures(FIXTURE_HTML_PATH.read_text())
+    creds_path = tmp_path / "service-account.json"
+    creds_path.write_text("{}")
+
+    with (
+        FakeCalendarServer() as server,
+        patch("brentford_calendar.cli.scrape_fixtures", return_value=fixtures),
+    ):
+        args = [
+            "--membership",
+            "MY_BEES_MEMBERS",
+            "--credentials",
+            str(creds_path),
+            "--calendar-id",
+            "cal",
+            "--batch",
+            "--state-file",
+            str(tmp_path / "state.db"),
+            "--api-endpoint",
+            server.url,
+        ]
+        result = runner.invoke(main, args)
+        assert result.exit_code == 0, result.output
+        created = len(server.events("cal"))
+        assert created > 0
+        assert f"{created} created" in result.output
+
+        result = runner.invoke(main, args)
+        assert result.exit_code == 0, result.output
+        assert f"{created} unchanged" in result.output
+        assert len(server.events("cal")) == created
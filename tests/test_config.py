@@ -6,7 +6,12 @@ from pathlib import Path
 import pytest
 from pydantic import ValidationError
 
-from brentford_calendar.config import GoogleCalendarConfig, load_config_from_file
+from brentford_calendar.config import (
+    GoogleCalendarConfig,
+    load_config_from_file,
+    load_profiles_from_file,
+)
+from brentford_calendar.models import MembershipType
 
 
 def test_google_calendar_config_from_dict() -> None:
@@ -73,3 +78,55 @@ def test_config_validation_error() -> None:
             service_account_info="not a dict",  # type: ignore[arg-type]
             calendar_id="test-calendar@example.com",
         )
+
+
+def test_load_profiles_from_file(tmp_path: Path) -> None:
+    """Test profiles accept membership names and resolve credentials paths."""
+    profiles_path = tmp_path / "profiles.json"
+    profiles_path.write_text(
+        json.dumps(
+            [
+                {
+                    "name": "alice",
+                    "membership": "my_bees_members",
+                    "taps": 400,
+                    "calendar_id": "alice@example.com",
+                    "credentials": "alice.json",
+                },
+                {
+                    "name": "bob",
+                    "membership": "Season Ticket and Premium Seat Holders",
+                    "calendar_id": "bob@example.com",
+                },
+            ]
+        )
+    )
+
+    alice, bob = load_profiles_from_file(profiles_path)
+
+    assert alice.membership is MembershipType.MY_BEES_MEMBERS
+    assert alice.taps == 400
+    assert alice.credentials == tmp_path / "alice.json"
+    assert bob.membership is MembershipType.SEASON_TICKET
+    assert bob.taps == 0
+    assert bob.credentials is None
+
+
+def test_load_profiles_from_file_rejects_duplicate_names(tmp_path: Path) -> None:
+    """Test profile names must be unique."""
+    profile = {"name": "alice", "membership": "MEMBERS", "calendar_id": "a@b.com"}
+    profiles_path = tmp_path / "profiles.json"
+    profiles_path.write_text(json.dumps([profile, profile]))
+
+    with pytest.raises(ValueError, match="Duplicate profile names: alice"):
+        load_profiles_from_file(profiles_path)
+
+
+def test_load_profiles_from_file_rejects_unknown_membership(tmp_path: Path) -> None:
+    """Test invalid profiles raise a ValidationError."""
+    profile = {"name": "alice", "membership": "GOLD", "calendar_id": "a@b.com"}
+    profiles_path = tmp_path / "profiles.json"
+    profiles_path.write_text(json.dumps([profile]))
+
+    with pytest.raises(ValidationError):
+        load_profiles_from_file(profiles_path)
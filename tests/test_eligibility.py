@@ -0,0 +1,83 @@
+"""Tests for the eligibility index."""
+
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from brentford_calendar.eligibility import EligibilityIndex, FixtureEligibility
+from brentford_calendar.models import (
+    CategoryWindow,
+    MembershipType,
+    OnsaleFixtureData,
+    ProcessedFixtureData,
+)
+
+CATEGORISED_PATH = Path(__file__).parent / "data" / "expected-fixtures-categorised.json"
+
+
+@pytest.fixture
+def processed_fixtures() -> list[ProcessedFixtureData]:
+    """Load the processed fixtures from the test data."""
+    with CATEGORISED_PATH.open() as f:
+        return [ProcessedFixtureData.model_validate(item) for item in json.load(f)]
+
+
+def test_index_matches_per_user_filtering(
+    processed_fixtures: list[ProcessedFixtureData],
+) -> None:
+    """Test lookups match OnsaleFixtureData for every membership and threshold."""
+    index = EligibilityIndex(processed_fixtures)
+    thresholds = {
+        category.minimum_taps
+        for processed in processed_fixtures
+        for category in processed.categories
+    }
+    taps_values = {0} | thresholds | {t - 1 for t in thresholds} | {10**6}
+
+    for membership in MembershipType:
+        for taps in sorted(taps_values):
+            expected = [
+                onsale
+                for processed in processed_fixtures
+                if (
+                    onsale := OnsaleFixtureData.from_processed_fixture_data(
+                        processed, membership, taps
+                    )
+                )
+                is not None
+            ]
+            assert index.onsale_fixtures(membership, taps) == expected
+
+
+def test_earliest_window_breaks_date_ties_by_category_order(
+    processed_fixtures: list[ProcessedFixtureData],
+) -> None:
+    """Test equal on-sale dates resolve to the first listed category."""
+    on_sale_date = datetime(2025, 10, 1, 10, 0, tzinfo=UTC)
+    higher = CategoryWindow(
+        membership_type=MembershipType.MEMBERS,
+        minimum_taps=100,
+        on_sale_date=on_sale_date,
+        event_id="first",
+    )
+    lower = higher.model_copy(update={"minimum_taps": 0, "event_id": "second"})
+    processed = processed_fixtures[0].model_copy(update={"categories": [higher, lower]})
+
+    eligibility = FixtureEligibility(processed)
+
+    assert eligibility.earliest_window(MembershipType.MEMBERS, 0) == lower
+    assert eligibility.earliest_window(MembershipType.MEMBERS, 100) == higher
+
+
+def test_earliest_window_none_when_ineligible(
+    processed_fixtures: list[ProcessedFixtureData],
+) -> None:
+    """Test a fixture with no purchasable categories has no window."""
+    processed = processed_fixtures[0].model_copy(update={"categories": []})
+
+    eligibility = FixtureEligibility(processed)
+
+    assert eligibility.earliest_window(MembershipType.SEASON_TICKET, 10**6) is None
+    assert eligibility.onsale(MembershipType.SEASON_TICKET, 10**6) is None
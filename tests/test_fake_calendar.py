@@ -0,0 +1,257 @@
+"""End-to-end tests of CalendarClient against the fake Calendar server."""
+
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from brentford_calendar.calendar_client import CalendarClient, UpsertOutcome
+from brentford_calendar.config import GoogleCalendarConfig
+from brentford_calendar.fake_calendar import FakeCalendarServer
+from brentford_calendar.models import CalendarEventData
+from brentford_calendar.retry import RetryPolicy
+from brentford_calendar.state import SyncStateStore
+
+CALENDAR_ID = "test-calendar@example.com"
+
+
+@pytest.fixture
+def server() -> Iterator[FakeCalendarServer]:
+    """Serve a fake calendar that pages listings two events at a time."""
+    with FakeCalendarServer(page_size=2) as server:
+        yield server
+
+
+def _client(server: FakeCalendarServer, **kwargs: object) -> CalendarClient:
+    """Create a client pointed at the fake server."""
+    config = GoogleCalendarConfig(
+        service_account_info={}, calendar_id=CALENDAR_ID, api_endpoint=server.url
+    )
+    return CalendarClient.from_config(config, **kwargs)  # type: ignore[arg-type]
+
+
+def _events(count: int, summary: str = "Event") -> list[CalendarEventData]:
+    """Create events with distinct source IDs."""
+    start = datetime(2025, 9, 10, 13, 0, tzinfo=UTC)
+    return [
+        CalendarEventData(
+            summary=f"{summary} {i}",
+            description="",
+            start=start + timedelta(days=i),
+            end=start + timedelta(days=i, hours=1),
+            source_id=f"source-{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def _insert_legacy_event(client: CalendarClient, event: CalendarEventData) -> None:
+    """Insert an event as versions without the managed-by marker wrote it."""
+    body = client._build_event_body(event)
+    body["extendedProperties"] = {"private": {"source_id": event.source_id}}
+    client.service.events().insert(calendarId=CALENDAR_ID, body=body).execute()
+
+
+def test_batched_sync_round_trip(server: FakeCalendarServer) -> None:
+    """Test batched upserts are stored, listed across pages and then unchanged."""
+    client = _client(server)
+    client.prefetch_events()
+
+    assert client.upsert_events(_events(5)) == [UpsertOutcome.CREATED] * 5
+    # New events are missing from the index, so are looked up in one batch
+    # before being written in another
+    assert server.requests["batch"] == 2
+
+    client = _client(server)
+    client.prefetch_events()
+    assert len(client.list_managed_events()) == 5
+    assert client.upsert_events(_events(5)) == [UpsertOutcome.UNCHANGED] * 5
+    # Listing five events two at a time takes three pages each time, besides
+    # the first run's five lookups
+    assert server.requests["list"] == 1 + 5 + 3 + 3
+
+    renamed = _events(5, summary="Renamed")
+    assert client.upsert_events(renamed) == [UpsertOutcome.UPDATED] * 5
+    assert {event["summary"] for event in server.events(CALENDAR_ID)} == {
+        event.summary for event in renamed
+    }
+
+
+def test_single_upserts_look_up_by_source_id(server: FakeCalendarServer) -> None:
+    """Test lookups filter on the source_id extended property."""
+    client = _client(server)
+    events = _events(3)
+    for event in events:
+        assert client.upsert_event(event) is UpsertOutcome.CREATED
+
+    assert client.upsert_event(events[1]) is UpsertOutcome.UNCHANGED
+    assert len(server.events(CALENDAR_ID)) == 3
+
+
+def test_prefetch_finds_unmarked_events(server: FakeCalendarServer) -> None:
+    """Test events written before the marker are updated, not duplicated."""
+    client = _client(server)
+    legacy, other = _events(2)
+    _insert_legacy_event(client, legacy)
+    _insert_legacy_event(client, other)
+
+    client.prefetch_events()
+    assert client.upsert_event(legacy) is UpsertOutcome.UPDATED
+    assert client.upsert_events([other]) == [UpsertOutcome.UPDATED]
+    assert len(server.events(CALENDAR_ID)) == 2
+
+    # Both now carry the marker, so are listed with the managed events
+    assert client.prefetch_events() == 2
+
+
+def test_reconcile_follows_sync_tokens(server: FakeCalendarServer) -> None:
+    """Test incremental listings report remote deletions and token expiry."""
+    store = SyncStateStore(":memory:")
+    client = _client(server, state_store=store)
+    client.upsert_events(_events(3))
+    assert client.reconcile_state() == 0
+
+    # Delete an event behind the client's back
+    deleted = store.get(CALENDAR_ID, "source-0")
+    assert deleted is not None
+    client.service.events().delete(
+        calendarId=CALENDAR_ID, eventId=deleted.event_id
+    ).execute()
+    assert client.reconcile_state() == 1
+    assert store.get(CALENDAR_ID, "source-0") is None
+
+    server.expire_sync_tokens()
+    assert client.reconcile_state() == 0
+    assert set(store.get_all(CALENDAR_ID)) == {"source-1", "source-2"}
+
+
+def test_reconcile_finds_unmarked_events(server: FakeCalendarServer) -> None:
+    """Test a full reconcile stores events written before the marker."""
+    store = SyncStateStore(":memory:")
+    client = _client(server, state_store=store)
+    (legacy,) = _events(1)
+    _insert_legacy_event(client, legacy)
+
+    assert client.reconcile_state() == 1
+    assert client.upsert_event(legacy) is UpsertOutcome.UPDATED
+    assert len(server.events(CALENDAR_ID)) == 1
+
+
+@pytest.mark.parametrize("reconcile", [False, True])
+def test_prune_spares_events_without_marker(
+    server: FakeCalendarServer, reconcile: bool
+) -> None:
+    """Test events another tool gave a source_id survive a prune."""
+    store = SyncStateStore(":memory:") if reconcile else None
+    client = _client(server, state_store=store)
+    start = datetime(2025, 9, 12, 9, 0, tzinfo=UTC)
+    dentist = CalendarEventData(
+        summary="Dentist",
+        description="",
+        start=start,
+        end=start + timedelta(hours=1),
+        source_id="crm-42",
+    )
+    _insert_legacy_event(client, dentist)
+    client.upsert_events(_events(2))
+
+    if reconcile:
+        assert client.reconcile_state() == 1
+    else:
+        client.prefetch_events()
+    stale = client.find_stale_events(_events(1))
+
+    assert set(stale) == {"source-1"}
+    assert client.delete_events(stale) == 1
+    assert {event["summary"] for event in server.events(CALENDAR_ID)} == {
+        "Dentist",
+        "Event 0",
+    }
+
+
+def test_delete_events_and_tombstones(server: FakeCalendarServer) -> None:
+    """Test batched deletes, and that deleted events answer 410."""
+    client = _client(server)
+    client.prefetch_events()
+    client.upsert_events(_events(3))
+    stale = {
+        event["extendedProperties"]["private"]["source_id"]: event["id"]
+        for event in server.events(CALENDAR_ID)
+    }
+
+    assert client.delete_events(stale) == 3
+    assert server.events(CALENDAR_ID) == []
+    with pytest.raises(HttpError) as excinfo:
+        client.service.events().get(
+            calendarId=CALENDAR_ID, eventId=stale["source-0"]
+        ).execute()
+    assert excinfo.value.resp.status == 410
+
+
+def test_patch_merges_fields(server: FakeCalendarServer) -> None:
+    """Test patch only changes the fields sent."""
+    client = _client(server)
+    client.upsert_event(_events(1)[0])
+    (event,) = server.events(CALENDAR_ID)
+
+    client.service.events().patch(
+        calendarId=CALENDAR_ID, eventId=event["id"], body={"summary": "Patched"}
+    ).execute()
+
+    (patched,) = server.events(CALENDAR_ID)
+    assert patched["summary"] == "Patched"
+    assert patched["extendedProperties"] == event["extendedProperties"]
+    assert patched["etag"] != event["etag"]
+
+
+def test_injected_errors_are_retried(server: FakeCalendarServer) -> None:
+    """Test throttled and failing requests are retried, including in batches."""
+    policy = RetryPolicy(base_delay=0.001)
+    client = _client(server, retry_policy=policy)
+    client.prefetch_events()
+    server.inject_errors(429)
+    server.inject_errors(503)
+
+    assert client.upsert_events(_events(4)) == [UpsertOutcome.CREATED] * 4
+    assert policy.retries == 2
+    assert policy.throttles == 1
+    assert len(server.events(CALENDAR_ID)) == 4
+
+
+def test_resent_inserts_do_not_duplicate_events(server: FakeCalendarServer) -> None:
+    """Test retrying an insert whose response was lost creates one event."""
+    policy = RetryPolicy(base_delay=0.001)
+    client = _client(server, retry_policy=policy)
+    server.lose_responses()
+
+    assert client.upsert_event(_events(1)[0]) == UpsertOutcome.CREATED
+    assert policy.retries == 1
+    assert len(server.events(CALENDAR_ID)) == 1
+
+
+def test_resent_batched_inserts_do_not_duplicate_events(
+    server: FakeCalendarServer,
+) -> None:
+    """Test resending batched inserts whose responses were lost creates no copies."""
+    client = _client(server, retry_policy=RetryPolicy(base_delay=0.001))
+    client.prefetch_events()
+    server.lose_responses(2)
+
+    assert client.upsert_events(_events(4)) == [UpsertOutcome.CREATED] * 4
+    assert len(server.events(CALENDAR_ID)) == 4
+
+    client = _client(server)
+    client.prefetch_events()
+    assert client.upsert_events(_events(4)) == [UpsertOutcome.UNCHANGED] * 4
+
+
+def test_quota_throttling() -> None:
+    """Test requests beyond the allowed rate are refused as rate limited."""
+    with FakeCalendarServer(max_qps=2) as server:
+        client = _client(server)
+        client.prefetch_events()
+        outcomes = client.upsert_events(_events(6))
+
+    assert outcomes.count(UpsertOutcome.CREATED) < 6
+    assert UpsertOutcome.FAILED in outcomes
@@ -0,0 +1,115 @@
+"""Tests for run metrics."""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from brentford_calendar import metrics
+from brentford_calendar.metrics import RunMetrics
+from brentford_calendar.models import ProcessedFixtureData
+from brentford_calendar.scraper import extract_fixtures, stream_fixtures
+
+FIXTURE_HTML_PATH = Path(__file__).parent / "data" / "ticket-information.html"
+
+
+@pytest.fixture
+def run_metrics() -> RunMetrics:
+    """Start collecting metrics for a fresh run."""
+    return metrics.reset()
+
+
+def test_spans_accumulate_per_stage(run_metrics: RunMetrics) -> None:
+    """Test repeated spans of a stage add up, including timed functions."""
+
+    @metrics.timed("work")
+    def work() -> int:
+        return 42
+
+    assert work() == 42
+    with metrics.span("work"):
+        pass
+    with pytest.raises(RuntimeError), metrics.span("failing"):
+        raise RuntimeError
+
+    assert set(run_metrics.durations) == {"work", "failing"}
+    assert run_metrics.durations["work"] >= 0
+
+
+def test_record_reports_latency_percentiles(run_metrics: RunMetrics) -> None:
+    """Test API calls are counted by method with nearest-rank percentiles."""
+    for i in range(1, 101):
+        metrics.observe_api_call("list", i / 1000)
+    metrics.observe_api_call("batch", 0.5)
+    metrics.increment("bytes_fetched", 10)
+    metrics.increment("bytes_fetched", 5)
+
+    record = run_metrics.to_record()
+
+    assert record["api_calls"]["list"] == {
+        "count": 100,
+        "p50": 0.05,
+        "p90": 0.09,
+        "p99": 0.099,
+        "max": 0.1,
+    }
+    assert record["api_calls"]["batch"]["p99"] == 0.5
+    assert record["counters"] == {"bytes_fetched": 15}
+
+
+def test_pipeline_records_stages_and_counts(run_metrics: RunMetrics) -> None:
+    """Test parsing and processing fixtures record their stages and counts."""
+    fixtures = extract_fixtures(FIXTURE_HTML_PATH.read_text())
+    for fixture in fixtures:
+        ProcessedFixtureData.from_fixture_data(fixture)
+
+    assert {"parse", "validate", "process"} <= set(run_metrics.durations)
+    assert run_metrics.counters["fixtures_parsed"] == len(fixtures)
+    assert run_metrics.counters["fixtures_processed"] == len(fixtures)
+
+
+def test_streamed_run_records_fetch_stage(run_metrics: RunMetrics) -> None:
+    """Test streaming records the time spent fetching, apart from parsing."""
+    session = MagicMock()
+    response = session.get.return_value.__enter__.return_value
+    response.iter_content.return_value = iter([FIXTURE_HTML_PATH.read_bytes()])
+
+    fixtures = list(stream_fixtures(url="https://example.com", session=session))
+
+    assert fixtures
+    assert {"fetch", "parse"} <= set(run_metrics.durations)
+    assert run_metrics.counters["bytes_fetched"] == FIXTURE_HTML_PATH.stat().st_size
+
+
+def test_write_json_appends_a_record_per_run(tmp_path: Path) -> None:
+    """Test each run appends one JSON line."""
+    path = tmp_path / "metrics" / "runs.jsonl"
+    for _ in range(2):
+        run_metrics = metrics.reset()
+        metrics.increment("fixtures_parsed", 3)
+        run_metrics.write_json(path)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 2
+    assert all(record["counters"] == {"fixtures_parsed": 3} for record in records)
+
+
+def test_write_prometheus(run_metrics: RunMetrics, tmp_path: Path) -> None:
+    """Test the textfile exposes stages, counters and latency summaries."""
+    run_metrics.add_duration("fetch", 1.5)
+    metrics.increment("bytes_fetched", 2048)
+    metrics.observe_api_call("insert", 0.25)
+    path = tmp_path / "brentford.prom"
+
+    run_metrics.write_prometheus(path)
+
+    lines = path.read_text().splitlines()
+    assert 'brentford_calendar_stage_duration_seconds{stage="fetch"} 1.5' in lines
+    assert "brentford_calendar_bytes_fetched 2048" in lines
+    assert (
+        'brentford_calendar_api_latency_seconds{method="insert",quantile="0.5"} 0.25'
+        in lines
+    )
+    assert 'brentford_calendar_api_latency_seconds_count{method="insert"} 1' in lines
+    assert not (tmp_path / "brentford.prom.tmp").exists()
@@ -0,0 +1,77 @@
+"""Tests for sync plans."""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from brentford_calendar.models import CalendarEventData
+from brentford_calendar.plan import (
+    PlanAction,
+    PlannedChange,
+    SyncPlan,
+    load_plans,
+    save_plans,
+)
+
+
+def test_save_and_load_plans_round_trip(tmp_path: Path) -> None:
+    """Test plans survive being written to and read from a plan file."""
+    start = datetime(2025, 9, 10, 13, 0, tzinfo=UTC)
+    event = CalendarEventData(
+        summary="Event",
+        description="Details",
+        start=start,
+        end=start + timedelta(hours=1),
+        source_id="source-1",
+        url="https://example.com",
+    )
+    plan = SyncPlan(
+        profile="me",
+        calendar_id="cal@example.com",
+        changes=[
+            PlannedChange(
+                action=PlanAction.CREATE,
+                source_id="source-1",
+                summary="Event",
+                event=event,
+            ),
+            PlannedChange(action=PlanAction.DELETE, source_id="old", event_id="e1"),
+        ],
+    )
+    path = tmp_path / "plan.json"
+
+    save_plans(path, [plan])
+
+    assert load_plans(path) == [plan]
+
+
+def test_describe_lists_changes_and_counts() -> None:
+    """Test the description skips unchanged events and counts every action."""
+    plan = SyncPlan(
+        profile="me",
+        calendar_id="cal@example.com",
+        changes=[
+            PlannedChange(action=PlanAction.UPDATE, source_id="a", summary="A"),
+            PlannedChange(action=PlanAction.UNCHANGED, source_id="b", summary="B"),
+            PlannedChange(action=PlanAction.DELETE, source_id="c"),
+        ],
+    )
+
+    assert plan.describe() == [
+        "  update  A",
+        "  delete  c",
+        "Plan: 0 to create, 1 to update, 1 unchanged, 1 to delete",
+    ]
+
+
+def test_deletions() -> None:
+    """Test a plan's deletions map source IDs to event IDs."""
+    plan = SyncPlan(
+        profile="me",
+        calendar_id="c",
+        changes=[
+            PlannedChange(action=PlanAction.CREATE, source_id="new"),
+            PlannedChange(action=PlanAction.DELETE, source_id="old", event_id="e1"),
+        ],
+    )
+
+    assert plan.deletions() == {"old": "e1"}
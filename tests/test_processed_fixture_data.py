@@ -2,6 +2,7 @@
 
 import json
 import logging
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
@@ -10,9 +11,18 @@ from brentford_calendar.models import (
     FixtureData,
     MembershipType,
     ProcessedFixtureData,
+    parse_category_label,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_label_cache() -> Iterator[None]:
+    """Start each test with an empty category label cache."""
+    parse_category_label.cache_clear()
+    yield
+    parse_category_label.cache_clear()
+
+
 def test_from_fixture_data_matches_expected() -> None:
     """Test that FixtureData converts to ProcessedFixtureData as expected."""
     # Load raw fixtures
@@ -66,3 +76,28 @@ class TestParseCategoryLabel:
         membership, taps = ProcessedFixtureData._parse_category_label(label)
         assert membership == MembershipType.MY_BEES_MEMBERS
         assert taps == 500
+
+    def test_thousands_separator_in_taps(self) -> None:
+        label = "My Bees members with 1,760+ TAPs"
+        membership, taps = ProcessedFixtureData._parse_category_label(label)
+        assert membership == MembershipType.MY_BEES_MEMBERS
+        assert taps == 1760
+
+    def test_empty_label_raises(self) -> None:
+        with pytest.raises(ValueError):
+            ProcessedFixtureData._parse_category_label("")
+
+    def test_repeated_labels_are_cached(self) -> None:
+        label = "My Bees members with 500+ TAPs"
+        for _ in range(3):
+            ProcessedFixtureData._parse_category_label(label)
+        info = parse_category_label.cache_info()
+        assert (info.hits, info.misses) == (2, 1)
+
+    def test_unrecognised_label_logged_once(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        with caplog.at_level(logging.WARNING):
+            for _ in range(3):
+                ProcessedFixtureData._parse_category_label("Unknown label")
+        assert caplog.text.count("Unrecognised category label") == 1
@@ -0,0 +1,57 @@
+"""Tests for per-stage profiling."""
+
+import pstats
+from pathlib import Path
+
+from brentford_calendar import metrics
+from brentford_calendar.profiling import StageProfiler
+
+
+def _busy() -> int:
+    """Do some work worth profiling."""
+    return sum(i * i for i in range(1000))
+
+
+def test_profiles_each_stage_separately(tmp_path: Path) -> None:
+    """Test spans are profiled under their stage and written per stage."""
+    profiler = StageProfiler(tmp_path)
+    profiler.start()
+    with metrics.span("fetch"):
+        _busy()
+    with metrics.span("parse"), metrics.span("validate"):
+        _busy()
+    with metrics.span("sync"), metrics.span("process"):
+        _busy()
+    with metrics.span("unprofiled"):
+        _busy()
+    profiler.stop()
+
+    assert {path.name for path in tmp_path.iterdir()} == {
+        f"{stage}.{suffix}"
+        for stage in ("scrape", "extract", "process", "sync")
+        for suffix in ("pstats", "txt")
+    }
+    process_functions = {
+        func[2] for func in pstats.Stats(str(tmp_path / "process.pstats")).stats
+    }
+    sync_functions = {
+        func[2] for func in pstats.Stats(str(tmp_path / "sync.pstats")).stats
+    }
+    assert "_busy" in process_functions
+    # Time spent in the nested stage is not counted in the enclosing one
+    assert "_busy" not in sync_functions
+
+
+def test_traces_memory_per_stage(tmp_path: Path) -> None:
+    """Test memory tracing reports stage peaks and allocation sites."""
+    profiler = StageProfiler(tmp_path, trace_memory=True, top_allocations=3)
+    profiler.start()
+    with metrics.span("process"):
+        data = [bytes(1024) for _ in range(100)]
+    profiler.stop()
+
+    assert profiler.peaks["process"] >= 100 * 1024
+    report = (tmp_path / "memory.txt").read_text()
+    assert "process" in report
+    assert "test_profiling.py" in report
+    assert data
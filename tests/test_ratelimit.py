@@ -0,0 +1,31 @@
+"""Tests for the token bucket rate limiter."""
+
+import pytest
+
+from brentford_calendar.ratelimit import TokenBucket
+
+
+def test_token_bucket_allows_burst_then_waits(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the bucket serves its capacity immediately, then paces requests."""
+    now = [100.0]
+    sleeps: list[float] = []
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    monkeypatch.setattr("time.sleep", sleeps.append)
+
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.5)
+    # A large reservation waits for the whole deficit
+    assert bucket.acquire(3) == pytest.approx(2.0)
+    assert sleeps == [pytest.approx(0.5), pytest.approx(2.0)]
+
+    # Tokens refill over time up to capacity
+    now[0] += 10
+    assert bucket.acquire(2) == 0
+
+
+def test_token_bucket_rejects_non_positive_rate() -> None:
+    """Test that a zero rate is rejected."""
+    with pytest.raises(ValueError, match="rate"):
+        TokenBucket(rate=0)
@@ -0,0 +1,90 @@
+"""Tests for the retry and backoff layer."""
+
+import json
+from unittest.mock import MagicMock
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from brentford_calendar.retry import (
+    RetryPolicy,
+    is_retryable,
+    is_throttle,
+    retry_after,
+)
+
+
+def _http_error(
+    status: int, reason: str | None = None, headers: dict[str, str] | None = None
+) -> HttpError:
+    resp = httplib2.Response({"status": status, **(headers or {})})
+    errors = [{"reason": reason}] if reason else []
+    error = {"code": status, "message": "Error", "errors": errors}
+    content = json.dumps({"error": error}).encode()
+    return HttpError(resp, content)
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Record sleeps instead of waiting."""
+    recorded: list[float] = []
+    monkeypatch.setattr("time.sleep", recorded.append)
+    return recorded
+
+
+def test_error_classification() -> None:
+    """Test throttles and transient errors are retryable, others are not."""
+    assert is_throttle(_http_error(429))
+    assert is_throttle(_http_error(403, "rateLimitExceeded"))
+    assert not is_throttle(_http_error(403, "forbidden"))
+    assert is_retryable(_http_error(503))
+    assert is_retryable(ConnectionResetError())
+    assert not is_retryable(_http_error(403, "forbidden"))
+    assert not is_retryable(_http_error(404))
+
+
+def test_retry_after_header() -> None:
+    """Test Retry-After is read in seconds and ignored when absent."""
+    assert retry_after(_http_error(429, headers={"retry-after": "7"})) == 7
+    assert retry_after(_http_error(429)) is None
+
+
+def test_call_retries_with_backoff(sleeps: list[float]) -> None:
+    """Test transient failures are retried and throttles counted."""
+    func = MagicMock(
+        side_effect=[
+            _http_error(429, headers={"retry-after": "3"}),
+            _http_error(500),
+            "ok",
+        ]
+    )
+    policy = RetryPolicy(base_delay=1.0)
+
+    assert policy.call(func) == "ok"
+    assert policy.retries == 2
+    assert policy.throttles == 1
+    assert sleeps[0] == 3
+    assert 0 <= sleeps[1] <= 2
+
+
+def test_call_gives_up_on_non_retryable_errors(sleeps: list[float]) -> None:
+    """Test non-retryable errors are raised immediately."""
+    policy = RetryPolicy()
+    with pytest.raises(HttpError):
+        policy.call(MagicMock(side_effect=_http_error(400)))
+    assert policy.retries == 0
+    assert sleeps == []
+
+
+def test_call_respects_attempts_and_budget(sleeps: list[float]) -> None:
+    """Test retries stop at max_attempts and once the run budget is spent."""
+    policy = RetryPolicy(max_attempts=3, budget=3)
+    with pytest.raises(HttpError):
+        policy.call(MagicMock(side_effect=_http_error(503)))
+    assert policy.retries == 2
+
+    with pytest.raises(HttpError):
+        policy.call(MagicMock(side_effect=_http_error(503)))
+    assert policy.retries == 3
+    assert len(sleeps) == 3
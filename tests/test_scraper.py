@@ -1,11 +1,26 @@
 """Tests for the web scraper."""
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 import pytest
+from pydantic import ValidationError
 
-from brentford_calendar.scraper import extract_fixtures
+from brentford_calendar.cache import PageCache
+from brentford_calendar.scraper import (
+    _parse_all_fixture_props,
+    _parse_fixture_props,
+    _scan_fixture_props,
+    _soup_fixture_props,
+    create_session,
+    extract_fixtures,
+    fetch_page_chunks,
+    fetch_page_conditional,
+    get_session,
+    iter_fixtures,
+)
 
 # Path to test fixtures
 FIXTURE_HTML_PATH = Path(__file__).parent / "data" / "ticket-information.html"
@@ -115,3 +130,129 @@ def test_extract_fixtures_skips_divs_without_data_props() -> None:
     fixtures = extract_fixtures(html)
     assert len(fixtures) == 1
     assert fixtures[0].title == "Test"
+
+
+def test_fetch_page_conditional_revalidates_cached_page(tmp_path: Path) -> None:
+    """Test validators are sent and the cached page returned on 304."""
+    cache = PageCache(tmp_path)
+    fresh = MagicMock(
+        status_code=200,
+        text="<html>v1</html>",
+        content=b"<html>v1</html>",
+        headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Oct 2025 10:00:00 GMT"},
+    )
+    not_modified = MagicMock(status_code=304)
+
+    session = MagicMock()
+    session.get.side_effect = [fresh, not_modified]
+    first = fetch_page_conditional(cache, url="https://example.com", session=session)
+    second = fetch_page_conditional(cache, url="https://example.com", session=session)
+    mock_get = session.get
+
+    assert first.content == "<html>v1</html>"
+    assert second == first
+    assert mock_get.call_args_list[0].kwargs["headers"] == {}
+    assert mock_get.call_args_list[1].kwargs["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 01 Oct 2025 10:00:00 GMT",
+    }
+
+
+def test_create_session_pools_retries_and_compresses() -> None:
+    """Test sessions mount a pooled, retrying adapter and accept compression."""
+    session = create_session(pool_size=4, retries=2)
+    adapter = session.get_adapter("https://www.brentfordfc.com")
+
+    assert adapter._pool_maxsize == 4  # type: ignore[attr-defined]
+    assert adapter.max_retries.total == 2  # type: ignore[attr-defined]
+    assert 429 in adapter.max_retries.status_forcelist  # type: ignore[attr-defined]
+    assert "gzip" in session.headers["Accept-Encoding"]
+
+
+def test_get_session_is_shared() -> None:
+    """Test the default session is created once and reused."""
+    assert get_session() is get_session()
+
+
+def test_streaming_scan_matches_soup_parse() -> None:
+    """Test the streaming scanner finds exactly the props html5lib finds."""
+    html_content = FIXTURE_HTML_PATH.read_text()
+    assert _scan_fixture_props(html_content) == _soup_fixture_props(html_content)
+
+
+def test_extract_fixtures_falls_back_to_soup_parse() -> None:
+    """Test the full DOM parse is used when the scanner finds no modules."""
+    html_content = FIXTURE_HTML_PATH.read_text()
+    with patch(
+        "brentford_calendar.scraper._scan_fixture_props", return_value=[]
+    ) as mock_scan:
+        fixtures = extract_fixtures(html_content)
+
+    mock_scan.assert_called_once()
+    assert len(fixtures) >= 5
+
+
+def _chunked(content: bytes, size: int) -> list[bytes]:
+    """Split content into chunks of at most size bytes."""
+    return [content[i : i + size] for i in range(0, len(content), size)]
+
+
+def test_iter_fixtures_matches_extract_fixtures() -> None:
+    """Test incremental extraction over small chunks matches a full parse."""
+    content = FIXTURE_HTML_PATH.read_bytes()
+    fixtures = list(iter_fixtures(_chunked(content, 517)))
+    assert fixtures == extract_fixtures(content.decode("utf-8"))
+
+
+def test_iter_fixtures_yields_before_download_completes() -> None:
+    """Test fixtures are yielded before the remaining chunks are read."""
+    chunks = _chunked(FIXTURE_HTML_PATH.read_bytes(), 4096)
+    consumed = 0
+
+    def source() -> Iterator[bytes]:
+        nonlocal consumed
+        for chunk in chunks:
+            consumed += 1
+            yield chunk
+
+    next(iter_fixtures(source()))
+    assert consumed < len(chunks)
+
+
+def test_fetch_page_chunks_streams_response() -> None:
+    """Test the page body is requested as a stream and yielded in chunks."""
+    session = MagicMock()
+    response = session.get.return_value.__enter__.return_value
+    response.iter_content.return_value = iter([b"<html>", b"</html>"])
+
+    chunks = list(fetch_page_chunks(url="https://example.com", session=session))
+
+    assert chunks == [b"<html>", b"</html>"]
+    assert session.get.call_args.kwargs["stream"] is True
+    response.raise_for_status.assert_called_once()
+
+
+def test_batched_validation_matches_per_fixture_parse() -> None:
+    """Test validating all props at once matches parsing them one by one."""
+    fixture_props = _scan_fixture_props(FIXTURE_HTML_PATH.read_text())
+    assert _parse_all_fixture_props(fixture_props) == [
+        _parse_fixture_props(raw_props) for raw_props in fixture_props
+    ]
+
+
+def test_batched_validation_reports_invalid_fixture() -> None:
+    """Test schema errors still surface as a ValidationError."""
+    fixture_props = _scan_fixture_props(FIXTURE_HTML_PATH.read_text())
+    fixture_props[1] = json.dumps({"title": "Missing fields"})
+
+    with pytest.raises(ValidationError):
+        _parse_all_fixture_props(fixture_props)
+
+
+def test_batched_validation_rejects_props_with_several_values() -> None:
+    """Test props that only parse once joined into the array are rejected."""
+    fixture_props = _scan_fixture_props(FIXTURE_HTML_PATH.read_text())
+    fixture_props[0] = f"{fixture_props[0]},{fixture_props[1]}"
+
+    with pytest.raises(json.JSONDecodeError):
+        _parse_all_fixture_props(fixture_props)
@@ -0,0 +1,77 @@
+"""Tests for the local sync state store."""
+
+import sqlite3
+from pathlib import Path
+
+from brentford_calendar.state import EventState, SyncStateStore
+
+
+def test_state_store_round_trip(tmp_path: Path) -> None:
+    """Test states persist across store instances and are keyed by calendar."""
+    path = tmp_path / "state.db"
+    store = SyncStateStore(path)
+    store.put("cal-1", "source-1", EventState(event_id="e1", etag='"1"'))
+    store.put(
+        "cal-2",
+        "source-1",
+        EventState(event_id="e2", content_hash="abc", managed=True),
+    )
+    store.close()
+
+    store = SyncStateStore(path)
+    assert store.get("cal-1", "source-1") == EventState(event_id="e1", etag='"1"')
+    assert store.get("cal-1", "missing") is None
+    assert store.get_all("cal-2") == {
+        "source-1": EventState(event_id="e2", content_hash="abc", managed=True)
+    }
+    store.close()
+
+
+def test_state_store_put_replaces_and_delete_removes() -> None:
+    """Test put overwrites existing entries and delete removes them."""
+    store = SyncStateStore(":memory:")
+    store.put("cal", "source", EventState(event_id="old"))
+    store.put("cal", "source", EventState(event_id="new"))
+    assert store.get("cal", "source") == EventState(event_id="new")
+
+    store.delete("cal", "source")
+    assert store.get_all("cal") == {}
+    store.close()
+
+
+def test_state_store_sync_tokens() -> None:
+    """Test sync tokens are stored per calendar and can be cleared."""
+    store = SyncStateStore(":memory:")
+    assert store.get_sync_token("cal") is None
+
+    store.put_sync_token("cal", "token-1")
+    store.put_sync_token("cal", "token-2")
+    assert store.get_sync_token("cal") == "token-2"
+
+    store.delete_sync_token("cal")
+    assert store.get_sync_token("cal") is None
+    store.close()
+
+
+def test_state_store_adds_managed_column(tmp_path: Path) -> None:
+    """Test stores from before the managed column mark rows with a hash managed."""
+    path = tmp_path / "state.db"
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE event_state (calendar_id TEXT NOT NULL, "
+        "source_id TEXT NOT NULL, event_id TEXT NOT NULL, etag TEXT, "
+        "content_hash TEXT, PRIMARY KEY (calendar_id, source_id))"
+    )
+    connection.execute(
+        "INSERT INTO event_state VALUES "
+        "('cal', 'written', 'e1', NULL, 'abc'), ('cal', 'listed', 'e2', NULL, NULL)"
+    )
+    connection.commit()
+    connection.close()
+
+    store = SyncStateStore(path)
+    assert store.get_all("cal") == {
+        "written": EventState(event_id="e1", content_hash="abc", managed=True),
+        "listed": EventState(event_id="e2"),
+    }
+    store.close()
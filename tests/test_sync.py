@@ -0,0 +1,70 @@
+"""Tests for the concurrent sync engine."""
+
+import threading
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+from brentford_calendar.calendar_client import CalendarClient, UpsertOutcome
+from brentford_calendar.models import CalendarEventData
+from brentford_calendar.sync import ConcurrentSyncEngine
+
+
+def _events(count: int) -> list[CalendarEventData]:
+    start_time = datetime(2025, 9, 10, 13, 0, 0, tzinfo=UTC)
+    return [
+        CalendarEventData(
+            summary=f"Event {i}",
+            description="",
+            start=start_time,
+            end=start_time + timedelta(hours=1),
+            source_id=f"source-{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def test_engine_uses_one_service_per_worker() -> None:
+    """Test each worker thread builds and reuses its own service."""
+    client = CalendarClient(calendar_id="cal", service=MagicMock())
+    client._event_index = {}
+    services: dict[int, MagicMock] = {}
+    lock = threading.Lock()
+
+    def service_factory() -> MagicMock:
+        service = MagicMock()
+        service.events().list().execute.return_value = {"items": []}
+        service.events().insert().execute.return_value = {"id": "new"}
+        with lock:
+            services[threading.get_ident()] = service
+        return service
+
+    engine = ConcurrentSyncEngine(client, service_factory, workers=3)
+    outcomes = engine.upsert_events(_events(12))
+
+    assert outcomes == [UpsertOutcome.CREATED] * 12
+    assert 1 <= len(services) <= 3
+    inserts = sum(s.events().insert().execute.call_count for s in services.values())
+    assert inserts == 12
+    client.service.events().insert.assert_not_called()
+    # Writes from all workers land in the shared index
+    assert len(client._event_index) == 12
+
+
+def test_engine_reports_failures_per_event() -> None:
+    """Test a failing upsert is reported without aborting the others."""
+    client = CalendarClient(calendar_id="cal", service=MagicMock())
+    client._event_index = {}
+
+    def service_factory() -> MagicMock:
+        service = MagicMock()
+        service.events().list().execute.return_value = {"items": []}
+        service.events().insert().execute.side_effect = [
+            RuntimeError("boom"),
+            {"id": "new"},
+        ]
+        return service
+
+    engine = ConcurrentSyncEngine(client, service_factory, workers=1)
+    outcomes = engine.upsert_events(_events(2))
+
+    assert outcomes == [UpsertOutcome.FAILED, UpsertOutcome.CREATED]
@@ -0,0 +1,47 @@
+"""Tests for API usage accounting."""
+
+import pytest
+
+from brentford_calendar.usage import ApiUsage
+
+
+def test_total_excludes_batch_requests() -> None:
+    """Test batches are counted, but only their contents count against quota."""
+    usage = ApiUsage()
+    usage.record("batch", seconds=0.5)
+    usage.record("insert", payload_bytes=100)
+    usage.record("insert", payload_bytes=200)
+    usage.record("list", seconds=0.25)
+
+    assert usage.total == 3
+    assert usage.calls == {"batch": 1, "insert": 2, "list": 1}
+    assert usage.payload_bytes["insert"] == 300
+    assert not usage.exhausted
+
+
+def test_exhausted_once_budget_used() -> None:
+    """Test the budget is exhausted once that many requests have been made."""
+    usage = ApiUsage(max_calls=2)
+    usage.record("list")
+    assert not usage.exhausted
+    usage.record("batch")
+    assert not usage.exhausted
+    usage.record("insert")
+    assert usage.exhausted
+
+
+def test_negative_budget_rejected() -> None:
+    """Test a negative budget is rejected."""
+    with pytest.raises(ValueError, match="max_calls"):
+        ApiUsage(max_calls=-1)
+
+
+def test_summary() -> None:
+    """Test the summary lists requests by method with bytes and time."""
+    usage = ApiUsage(max_calls=10)
+    usage.record("list", seconds=0.5)
+    usage.record("insert", payload_bytes=2048, seconds=0.25)
+
+    assert usage.summary() == (
+        "API requests: 2 of 10 budgeted (1 insert, 1 list), 2.0 KiB sent in 0.75s"
+    )
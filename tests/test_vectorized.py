@@ -0,0 +1,69 @@
+"""Tests for the vectorized eligibility engine."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from brentford_calendar.models import (  # noqa: E402
+    MembershipType,
+    OnsaleFixtureData,
+    ProcessedFixtureData,
+)
+from brentford_calendar.vectorized import VectorizedEligibility  # noqa: E402
+
+CATEGORISED_PATH = Path(__file__).parent / "data" / "expected-fixtures-categorised.json"
+
+
+@pytest.fixture
+def processed_fixtures() -> list[ProcessedFixtureData]:
+    """Load the processed fixtures from the test data."""
+    with CATEGORISED_PATH.open() as f:
+        return [ProcessedFixtureData.model_validate(item) for item in json.load(f)]
+
+
+def test_vectorized_matches_per_user_filtering(
+    processed_fixtures: list[ProcessedFixtureData],
+) -> None:
+    """Test every profile gets the same fixtures as the per-user path."""
+    thresholds = {
+        category.minimum_taps
+        for processed in processed_fixtures
+        for category in processed.categories
+    }
+    taps_values = {0} | thresholds | {t - 1 for t in thresholds} | {10**6}
+    profiles = [
+        (membership, taps)
+        for membership in MembershipType
+        for taps in sorted(taps_values)
+    ]
+
+    # A small chunk size exercises evaluating profiles in several chunks
+    engine = VectorizedEligibility(processed_fixtures, chunk_size=7)
+
+    assert engine.onsale_fixtures(profiles) == [
+        [
+            onsale
+            for processed in processed_fixtures
+            if (
+                onsale := OnsaleFixtureData.from_processed_fixture_data(
+                    processed, membership, taps
+                )
+            )
+            is not None
+        ]
+        for membership, taps in profiles
+    ]
+
+
+def test_vectorized_handles_fixtures_without_categories(
+    processed_fixtures: list[ProcessedFixtureData],
+) -> None:
+    """Test fixtures with no categories are never eligible."""
+    empty = processed_fixtures[0].model_copy(update={"categories": []})
+    profiles = [(MembershipType.SEASON_TICKET, 10**6)]
+
+    assert VectorizedEligibility([empty]).earliest_slots(profiles).tolist() == [[-1]]
+    assert VectorizedEligibility([]).onsale_fixtures(profiles) == [[]]